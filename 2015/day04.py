@@ -10,7 +10,7 @@ Answer: 3938038
 """
 
 from typing import List
-import hashlib
+from utils import mine
 from utils import profiler
 
 
@@ -33,6 +33,7 @@ def find_lowest_number(secret_key: str, leading_zeros: int) -> int:
     """
     Finds the lowest positive integer such that the MD5 hash of the secret key
     and the integer starts with the specified number of leading zeroes.
+    The candidates are mined in parallel chunks, the first match in index order is the answer.
 
     Args:
         secret_key (str): The secret key to hash.
@@ -41,13 +42,8 @@ def find_lowest_number(secret_key: str, leading_zeros: int) -> int:
     Returns:
         int: The lowest positive integer that meets the criteria.
     """
-    prefix = "0" * leading_zeros
-    number = 0
-    while True:
-        hash_result = hashlib.md5(f"{secret_key}{number}".encode()).hexdigest()
-        if hash_result.startswith(prefix):
-            return number
-        number += 1
+    number, _ = next(mine(secret_key, leading_zeros))
+    return number
 
 
 if __name__ == "__main__":
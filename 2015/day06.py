@@ -9,11 +9,14 @@ Part 2: What is the total brightness of all lights combined after following Sant
 Answer: 14687245
 """
 
-from typing import List, Tuple
+from typing import Callable, Dict, List, MutableSequence, NamedTuple, Tuple
 import re
+from utils import cached_input
 from utils import profiler
+from utils import read_lines
 
 
+@cached_input(version=1)
 def get_input(file_path: str) -> List[Tuple[str, int, int, int, int]]:
     """
     Reads the input file and parses each line into a tuple of action and coordinates.
@@ -31,23 +34,82 @@ def get_input(file_path: str) -> List[Tuple[str, int, int, int, int]]:
     pattern = r"(turn on|turn off|toggle) (\d+),(\d+) through (\d+),(\d+)"
     instructions = []
 
-    with open(file_path, "r", encoding="utf-8") as file:
-        for line in file:
-            line = line.strip()
-            match = re.match(pattern, line)
-            if not match:
-                raise ValueError(f"Invalid instruction line: {line}")
-            action = match.group(1).replace("turn ", "")
-            x1, y1, x2, y2 = map(int, match.groups()[1:])
-            instructions.append((action, x1, y1, x2, y2))
+    for line in read_lines(file_path):
+        match = re.match(pattern, line)
+        if not match:
+            raise ValueError(f"Invalid instruction line: {line}")
+        action = match.group(1).replace("turn ", "")
+        x1, y1, x2, y2 = map(int, match.groups()[1:])
+        instructions.append((action, x1, y1, x2, y2))
 
     return instructions
 
 
+TOGGLE = bytes.maketrans(b"\x00\x01", b"\x01\x00")
+
+
+class Rules(NamedTuple):
+    """
+    How the instructions change a row of lights.
+
+    Attributes:
+        new_row (Callable[[int], MutableSequence[int]]): Creates a row of dark lights.
+        kernels (Dict[str, Callable]): Per action, the new values of a slice of a row.
+    """
+    new_row: Callable[[int], MutableSequence[int]]
+    kernels: Dict[str, Callable[[MutableSequence[int]], MutableSequence[int]]]
+
+
+# Lights are on (1) or off (0), rows are bytearrays so whole slices are set and toggled at once
+ON_OFF = Rules(bytearray, {
+    "on": lambda cells: b"\x01" * len(cells),
+    "off": lambda cells: bytes(len(cells)),
+    "toggle": lambda cells: cells.translate(TOGGLE),
+})
+
+BRIGHTNESS = Rules(lambda size: [0] * size, {
+    "on": lambda cells: [value + 1 for value in cells],
+    "off": lambda cells: [value - 1 if value else 0 for value in cells],
+    "toggle": lambda cells: [value + 2 for value in cells],
+})
+
+
+def follow_compressed(instructions: List[Tuple[str, int, int, int, int]], rules: Rules) -> int:
+    """
+    Follows the instructions on a coordinate-compressed grid.
+    Only the edges of the rectangles split the plane, every compressed cell is a block of lights that always
+    change together. Every instruction updates a slice of the rows it covers, and the blocks are weighted by their
+    area at the end, so the work and memory depend on the number of instructions only, not on the size of the grid.
+
+    Args:
+        instructions (List[Tuple[str, int, int, int, int]]): The parsed instructions.
+        rules (Rules): How the lights change.
+
+    Returns:
+        int: The sum of all lights.
+    """
+    xs = sorted({x for _, x1, _, x2, _ in instructions for x in (x1, x2 + 1)})
+    ys = sorted({y for _, _, y1, _, y2 in instructions for y in (y1, y2 + 1)})
+    x_index = {x: index for index, x in enumerate(xs)}
+    y_index = {y: index for index, y in enumerate(ys)}
+    heights = [end - start for start, end in zip(xs, xs[1:])]
+    widths = [end - start for start, end in zip(ys, ys[1:])]
+
+    grid = [rules.new_row(len(widths)) for _ in heights]
+    for action, x1, y1, x2, y2 in instructions:
+        kernel = rules.kernels[action]
+        start, end = y_index[y1], y_index[y2 + 1]
+        for x in range(x_index[x1], x_index[x2 + 1]):
+            row = grid[x]
+            row[start:end] = kernel(row[start:end])
+
+    return sum(height * sum(value * width for value, width in zip(row, widths)) for row, height in zip(grid, heights))
+
+
 @profiler
 def part_one(data_input: List[str]) -> int:
     """
-    The grid is a 1000x1000 array of boolean values, where each light is either ON (True) or OFF (False).
+    The grid is a 1000x1000 array of lights, where each light is either ON or OFF.
     Instructions modify the grid as follows:
         - "turn on" sets lights in the region to ON,
         - "turn off" sets lights in the region to OFF,
@@ -59,25 +121,13 @@ def part_one(data_input: List[str]) -> int:
     Returns:
         int: The total number of lights that are ON after executing all instructions.
     """
-    grid = [[False] * 1000 for _ in range(1000)]
-
-    for action, x1, y1, x2, y2 in data_input:
-        for x in range(x1, x2 + 1):
-            for y in range(y1, y2 + 1):
-                if action == "on":
-                    grid[x][y] = True
-                elif action == "off":
-                    grid[x][y] = False
-                elif action == "toggle":
-                    grid[x][y] = not grid[x][y]
-
-    return sum(sum(row) for row in grid)
+    return follow_compressed(data_input, ON_OFF)
 
 
 @profiler
 def part_two(data_input: List[str]) -> int:
     """
-    The grid is a 1000x1000 array of integers representing brightness levels of lights.
+    The grid is a 1000x1000 array of brightness levels of lights.
     Instructions modify the brightness as follows:
         - "turn on" increases brightness by 1,
         - "turn off" decreases brightness by 1, to a minimum of 0,
@@ -89,19 +139,7 @@ def part_two(data_input: List[str]) -> int:
     Returns:
         int: The total brightness of all lights after executing all instructions.
     """
-    grid = [[0] * 1000 for _ in range(1000)]
-
-    for action, x1, y1, x2, y2 in data_input:
-        for x in range(x1, x2 + 1):
-            for y in range(y1, y2 + 1):
-                if action == "on":
-                    grid[x][y] += 1
-                elif action == "off":
-                    grid[x][y] = max(0, grid[x][y] - 1)
-                elif action == "toggle":
-                    grid[x][y] += 2
-
-    return sum(sum(row) for row in grid)
+    return follow_compressed(data_input, BRIGHTNESS)
 
 
 if __name__ == "__main__":
@@ -9,7 +9,10 @@ Part 2: Now, take the signal you got on wire a, override wire b to that signal,
 Answer: 2797
 """
 
-from typing import Dict
+from typing import Dict, List
+from utils import Op
+from utils import Program
+from utils import execute
 from utils import profiler
 
 
@@ -34,55 +37,150 @@ def get_input(file_path: str) -> Dict[str, str]:
     return instructions
 
 
-def get_value(wire: str, instructions: Dict[str, str], cache: Dict[str, int]) -> int:
-    """
-    Recursively evaluates the 16-bit signal provided to a wire, using memoization.
+MASK = 0xFFFF
 
-    Args:
-        wire (str): The wire to evaluate.
-        instructions (Dict[str, str]): Mapping of wires to logic expressions.
-        cache (Dict[str, int]): A memoization cache to store evaluated wire values.
 
-    Returns:
-        int: The computed signal value for the given wire.
+class Circuit:
     """
-    if wire.isdigit():
-        return int(wire)
-
-    if wire in cache:
-        return cache[wire]
-
-    expr = instructions[wire]
-    tokens = expr.split()
-
-    if len(tokens) == 1:
-        val = get_value(tokens[0], instructions, cache)
-    elif len(tokens) == 2:  # NOT x
-        val = ~get_value(tokens[1], instructions, cache) & 0xFFFF
-    elif len(tokens) == 3:
-        a, op, b = tokens
-        if op == "AND":
-            val = get_value(a, instructions, cache) & get_value(b, instructions, cache)
-        elif op == "OR":
-            val = get_value(a, instructions, cache) | get_value(b, instructions, cache)
-        elif op == "LSHIFT":
-            val = get_value(a, instructions, cache) << int(b)
-        elif op == "RSHIFT":
-            val = get_value(a, instructions, cache) >> int(b)
+    A circuit compiled into register machine code, one source instruction per wire in topological order.
+    Since every wire comes after its inputs, a single pass over the code evaluates the whole circuit,
+    and overriding a wire only has to rerun the wires downstream of it.
+    """
+    def __init__(self, instructions: Dict[str, str]):
+        """
+        Args:
+            instructions (Dict[str, str]): Mapping of wires to logic expressions.
+
+        Raises:
+            ValueError: If a wire has no expression, or the wires depend on each other in a cycle.
+        """
+        sources = {wire: self.inputs(expr) for wire, expr in instructions.items()}
+        self.order = self.topological_order(sources)
+        self.position = {wire: index for index, wire in enumerate(self.order)}
+        self.dependents: Dict[str, List[str]] = {wire: [] for wire in self.order}
+        for wire in self.order:
+            for source in sources[wire]:
+                self.dependents[source].append(wire)
+
+        self.program = Program(self.order)
+        for wire in self.order:
+            self.program.begin()
+            self.compile_gate(wire, instructions[wire])
+        self.program.finish()
+        self.registers = self.program.initial.copy()
+        execute(self.program.code, self.registers)
+
+    @staticmethod
+    def inputs(expr: str) -> List[str]:
+        """
+        Returns the wires an expression reads, shift amounts and signals are numbers.
+        """
+        tokens = expr.split()
+        if len(tokens) == 3 and tokens[1] in ("LSHIFT", "RSHIFT"):
+            tokens = tokens[:1]
+        return [token for token in tokens if token.islower()]
+
+    @staticmethod
+    def topological_order(sources: Dict[str, List[str]]) -> List[str]:
+        """
+        Orders the wires so that every wire comes after the wires it reads (Kahn's algorithm).
+        """
+        waiting = {}
+        dependents: Dict[str, List[str]] = {}
+        for wire, inputs in sources.items():
+            for source in inputs:
+                if source not in sources:
+                    raise ValueError(f"Wire {source} has no signal")
+                dependents.setdefault(source, []).append(wire)
+            waiting[wire] = len(inputs)
+
+        order = [wire for wire, count in waiting.items() if count == 0]
+        for wire in order: # the list grows while it is walked
+            for dependent in dependents.get(wire, []):
+                waiting[dependent] -= 1
+                if waiting[dependent] == 0:
+                    order.append(dependent)
+        if len(order) != len(sources):
+            raise ValueError("The circuit has a cycle")
+        return order
+
+    def operand(self, token: str) -> int:
+        """
+        Returns the slot of a wire or of a 16-bit signal.
+        """
+        return self.program.operand(str(int(token) & MASK) if token.isdigit() else token)
+
+    def compile_gate(self, wire: str, expr: str) -> None:
+        """
+        Emits the operations computing a wire, every result is a 16-bit signal.
+        """
+        program = self.program
+        target = program.register(wire)
+        tokens = expr.split()
+        if len(tokens) == 1:
+            program.emit(Op.SET, target, self.operand(tokens[0]))
+        elif len(tokens) == 2: # NOT x
+            program.emit(Op.XOR, target, self.operand(tokens[1]), program.constant(MASK))
+        elif len(tokens) == 3:
+            a, op, b = tokens
+            if op == "AND":
+                program.emit(Op.AND, target, self.operand(a), self.operand(b))
+            elif op == "OR":
+                program.emit(Op.OR, target, self.operand(a), self.operand(b))
+            elif op == "LSHIFT":
+                program.emit(Op.MUL, target, self.operand(a), program.constant(1 << int(b)))
+                program.emit(Op.AND, target, target, program.constant(MASK))
+            elif op == "RSHIFT" and a.isdigit(): # the high bits of a signal shift down, so fold it unmasked
+                program.emit(Op.SET, target, program.constant((int(a) >> int(b)) & MASK))
+            elif op == "RSHIFT":
+                program.emit(Op.SHR, target, self.operand(a), program.constant(int(b)))
+            else:
+                raise ValueError(f"Unknown operation: {op}")
         else:
-            raise ValueError(f"Unknown operation: {op}")
-    else:
-        raise ValueError(f"Unrecognized expression: {expr}")
-
-    cache[wire] = val & 0xFFFF
-    return cache[wire]
+            raise ValueError(f"Unrecognized expression: {expr}")
+
+    def code_range(self, wire: str) -> range:
+        """
+        Returns the code indices of the operations computing a wire.
+        """
+        index = self.position[wire]
+        return range(self.program.starts[index], self.program.code_index(index + 1))
+
+    def __getitem__(self, wire: str) -> int:
+        return self.registers[self.program.slots[wire]]
+
+    def override(self, wire: str, value: int) -> None:
+        """
+        Replaces the gate of a wire by a fixed signal, and recomputes the wires downstream of it.
+
+        Args:
+            wire (str): The wire to override.
+            value (int): Its new signal.
+        """
+        code = self.program.code
+        first, *rest = self.code_range(wire)
+        code[first] = (int(Op.SET), self.program.slots[wire], self.program.constant(value & MASK), 0)
+        self.registers.extend(self.program.initial[len(self.registers):]) # the signal may be a new constant
+        for index in rest:
+            code[index] = (int(Op.NOP), 0, 0, 0)
+
+        # The downstream cone, run in topological order. The code has no jumps, so any slice of it runs on its own.
+        cone = {wire}
+        stack = [wire]
+        while stack:
+            for dependent in self.dependents[stack.pop()]:
+                if dependent not in cone:
+                    cone.add(dependent)
+                    stack.append(dependent)
+        wires = sorted(cone, key=self.position.__getitem__)
+        execute([code[index] for cone_wire in wires for index in self.code_range(cone_wire)], self.registers)
 
 
 @profiler
 def part_one(instructions: Dict[str, str]) -> int:
     """
-    Evaluates the final signal provided to wire 'a' by recursively computing
-    the logic circuit defined by the input instructions.
+    Evaluates the final signal provided to wire 'a' by compiling the logic circuit
+    defined by the input instructions and running it once.
 
     Args:
         instructions (Dict[str, str]): Mapping of wire names to logic expressions.
@@ -90,15 +188,15 @@ def part_one(instructions: Dict[str, str]) -> int:
     Returns:
         int: The signal ultimately provided to wire 'a'.
     """
-    return get_value("a", instructions, {})
+    return Circuit(instructions)["a"]
 
 
 @profiler
 def part_two(instructions: Dict[str, str]) -> int:
     """
     First, computes the value of wire 'a' from the original instructions.
-    Then, overrides the value of wire 'b' with that result, resets the cache,
-    and re-evaluates wire 'a'.
+    Then, overrides the value of wire 'b' with that result,
+    which only re-evaluates the wires downstream of 'b'.
 
     Args:
         instructions (Dict[str, str]): Mapping of wire names to logic expressions.
@@ -106,9 +204,9 @@ def part_two(instructions: Dict[str, str]) -> int:
     Returns:
         int: The new signal provided to wire 'a' after overriding wire 'b'.
     """
-    override = get_value("a", instructions, {})
-    cache = {"b": override}
-    return get_value("a", instructions, cache)
+    circuit = Circuit(instructions)
+    circuit.override("b", circuit["a"])
+    return circuit["a"]
 
 
 if __name__ == "__main__":
@@ -10,7 +10,7 @@ Answer: 898
 """
 
 from typing import List, Dict, Tuple
-import itertools
+from utils import optimal_tour
 from utils import profiler
 
 
@@ -54,25 +54,25 @@ def get_locations(distances: Dict[Tuple[str, str], int]) -> List[str]:
     return list(locations)
 
 
-def route_distance(route: List[str], distances: Dict[Tuple[str, str], int]) -> int:
+def distance_matrix(distances: Dict[Tuple[str, str], int]) -> List[List[int]]:
     """
-    Computes the total distance for a given travel route.
+    Converts the distance mapping into a matrix over the locations.
 
     Args:
-        route (List[str]): Ordered list of locations in the route.
         distances (Dict[Tuple[str, str], int]): Mapping of location pairs to distances.
 
     Returns:
-        int: The total travel distance of the route.
+        List[List[int]]: matrix[i][j] is the distance between location i and location j.
     """
-    return sum(distances[(route[i], route[i + 1])] for i in range(len(route) - 1))
+    locations = get_locations(distances)
+    return [[distances[(a, b)] if a != b else 0 for b in locations] for a in locations]
 
 
 @profiler
 def part_one(distances: Dict[Tuple[str, str], int]) -> int:
     """
-    Finds the shortest route that visits every location exactly once using brute-force
-    permutation of all possible paths.
+    Finds the shortest route that visits every location exactly once,
+    with a bitmask dynamic program over the routes ending in every location.
 
     Args:
         distances (Dict[Tuple[str, str], int]): Distance mapping between all location pairs.
@@ -80,15 +80,14 @@ def part_one(distances: Dict[Tuple[str, str], int]) -> int:
     Returns:
         int: The shortest possible route distance.
     """
-    locations = get_locations(distances)
-    return min(route_distance(p, distances) for p in itertools.permutations(locations))
+    return optimal_tour(distance_matrix(distances))
 
 
 @profiler
 def part_two(distances: Dict[Tuple[str, str], int]) -> int:
     """
-    Finds the longest route that visits every location exactly once using brute-force
-    permutation of all possible paths.
+    Finds the longest route that visits every location exactly once,
+    with a bitmask dynamic program over the routes ending in every location.
 
     Args:
         distances (Dict[Tuple[str, str], int]): Distance mapping between all location pairs.
@@ -96,8 +95,7 @@ def part_two(distances: Dict[Tuple[str, str], int]) -> int:
     Returns:
         int: The longest possible route distance.
     """
-    locations = get_locations(distances)
-    return max(route_distance(p, distances) for p in itertools.permutations(locations))
+    return optimal_tour(distance_matrix(distances), maximize=True)
 
 
 if __name__ == "__main__":
@@ -9,7 +9,9 @@ Part 2: Now, starting again with the digits in your puzzle input, apply this pro
 Answer: 6989950
 """
 
-from typing import List
+from collections import Counter
+import re
+from typing import Dict, List, Optional
 from utils import profiler
 
 
@@ -27,26 +29,152 @@ def get_input(file_path: str) -> List[str]:
         return [line.strip() for line in file]
 
 
-def look_and_say(sequence: str) -> str:
+# Runs of equal digits
+RUN = re.compile(rb"(.)\1*")
+# Length of the start of a sequence that is followed to see whether it can be split off
+HEAD_SIZE = 64
+# Inputs decomposing into more elements than this are followed step by step instead
+MAX_ELEMENTS = 256
+
+Matrix = List[Dict[int, int]]
+
+
+def look_and_say(sequence: bytes) -> bytes:
     """
     Applies the look-and-say transformation to a sequence.
 
     Args:
-        sequence (str): The input number sequence.
+        sequence (bytes): The input number sequence.
+
+    Returns:
+        bytes: The next sequence in the look-and-say series.
+    """
+    return b"".join(b"%d%c" % (len(run), run[0]) for run in (match.group() for match in RUN.finditer(sequence)))
+
+
+def splits(left_digit: int, right: bytes, steps: int) -> bool:
+    """
+    Checks whether a sequence ending in left_digit followed by right evolves as the two parts separately.
+    The last digit of a sequence never changes, so the parts only interact when the first digit of the right part
+    becomes left_digit. The first digit depends on the start of the right part only, which is followed on its own:
+    after every step the last run is dropped unless the whole part is known, since it might continue further on.
+
+    Args:
+        left_digit (int): Last digit of the left part.
+        right (bytes): The right part.
+        steps (int): Number of steps the parts have to stay apart.
+
+    Returns:
+        bool: True if the parts don't interact within the given number of steps.
+    """
+    head, exact = right[:HEAD_SIZE], len(right) <= HEAD_SIZE
+    for _ in range(steps + 1):
+        if not head or head[0] == left_digit:
+            return False
+        runs = [match.group() for match in RUN.finditer(head)]
+        if not exact:
+            runs.pop()
+        head = b"".join(b"%d%c" % (len(run), run[0]) for run in runs)
+        if len(head) > HEAD_SIZE:
+            head, exact = head[:HEAD_SIZE], False
+    return True
+
+
+def decompose(sequence: bytes, steps: int) -> List[bytes]:
+    """
+    Splits a sequence into elements that evolve independently for the given number of steps.
+    For the usual puzzle inputs these are exactly Conway's 92 atomic elements.
+
+    Args:
+        sequence (bytes): The sequence.
+        steps (int): Number of steps the elements have to stay apart.
+
+    Returns:
+        List[bytes]: The elements, in order.
+    """
+    elements = []
+    start = 0
+    for i in range(1, len(sequence)):
+        if sequence[i] != sequence[i - 1] and splits(sequence[i - 1], sequence[i:], steps):
+            elements.append(sequence[start:i])
+            start = i
+    elements.append(sequence[start:])
+    return elements
+
+
+def decay_table(elements: List[bytes], steps: int) -> Optional[Dict[bytes, List[bytes]]]:
+    """
+    Finds every element the given elements decay into, and what each of them decays into after one step.
+
+    Args:
+        elements (List[bytes]): The starting elements.
+        steps (int): Number of steps the elements have to stay apart.
+
+    Returns:
+        Optional[Dict[bytes, List[bytes]]]: The decay products per element, None if there are more than MAX_ELEMENTS.
+    """
+    table: Dict[bytes, List[bytes]] = {}
+    todo = list(elements)
+    while todo:
+        element = todo.pop()
+        if element in table:
+            continue
+        if len(table) == MAX_ELEMENTS:
+            return None
+        table[element] = decompose(look_and_say(element), steps)
+        todo.extend(table[element])
+    return table
+
+
+def multiply(left: Matrix, right: Matrix) -> Matrix:
+    """
+    Multiplies two sparse square matrices, stored as a dict of non-zero entries per row.
+    """
+    product = []
+    for row in left:
+        result: Dict[int, int] = {}
+        for k, factor in row.items():
+            for j, value in right[k].items():
+                result[j] = result.get(j, 0) + factor * value
+        product.append(result)
+    return product
+
+
+def sequence_length(sequence: str, steps: int) -> int:
+    """
+    Computes the length of a sequence after a number of look-and-say steps, without building it.
+
+    The sequence is held as counts per element, and a step multiplies them by the decay matrix, which says how many
+    of every element each element turns into. So the counts after n steps are the starting counts times the matrix
+    to the power n, computed by repeated squaring. Inputs that don't decompose into a small set of elements are
+    transformed step by step instead.
+
+    Args:
+        sequence (str): The starting sequence.
+        steps (int): Number of look-and-say steps.
 
     Returns:
-        str: The next sequence in the look-and-say series.
+        int: The length of the sequence after the steps.
     """
-    result = []
-    i = 0
-    while i < len(sequence):
-        count = 1
-        while i + 1 < len(sequence) and sequence[i] == sequence[i + 1]:
-            count += 1
-            i += 1
-        result.append(f"{count}{sequence[i]}")
-        i += 1
-    return "".join(result)
+    start = sequence.encode()
+    table = decay_table(decompose(start, steps), steps)
+    if table is None:
+        for _ in range(steps):
+            start = look_and_say(start)
+        return len(start)
+
+    index = {element: i for i, element in enumerate(table)}
+    power: Matrix = [dict(Counter(index[product] for product in products)) for products in table.values()]
+    counts: Matrix = [dict(Counter(index[element] for element in decompose(start, steps)))]
+    while steps:
+        if steps & 1:
+            counts = multiply(counts, power)
+        steps >>= 1
+        if steps:
+            power = multiply(power, power)
+
+    lengths = [len(element) for element in table]
+    return sum(count * lengths[i] for i, count in counts[0].items())
 
 
 @profiler
@@ -60,10 +188,7 @@ def part_one(data_input: List[str]) -> int:
     Returns:
         int: The length of the sequence after 40 iterations.
     """
-    sequence = data_input[0]
-    for _ in range(40):
-        sequence = look_and_say(sequence)
-    return len(sequence)
+    return sequence_length(data_input[0], 40)
 
 
 @profiler
@@ -77,10 +202,7 @@ def part_two(data_input: List[str]) -> int:
     Returns:
         int: The length of the sequence after 50 iterations.
     """
-    sequence = data_input[0]
-    for _ in range(50):
-        sequence = look_and_say(sequence)
-    return len(sequence)
+    return sequence_length(data_input[0], 50)
 
 
 if __name__ == "__main__":
@@ -9,7 +9,9 @@ Part 2: Santa's password expired again. What's the next one?
 Answer: vzcaabcc
 """
 
-from typing import List
+from functools import lru_cache
+from itertools import islice, takewhile
+from typing import Iterator, List, Tuple
 from utils import profiler
 
 
@@ -27,61 +29,122 @@ def get_input(file_path: str) -> List[str]:
         return [line.strip() for line in file]
 
 
-def increment_password(pw: str) -> str:
+# Passwords are base-23 digit arrays over the allowed letters, so no candidate ever holds 'i', 'o' or 'l'
+ALPHABET = "abcdefghjkmnpqrstuvwxyz"
+DIGITS = {letter: digit for digit, letter in enumerate(ALPHABET)}
+# Digit of the letter after every letter, -1 when that letter isn't allowed (or after 'z'), for straights
+SUCCESSOR = [DIGITS.get(chr(ord(letter) + 1), -1) for letter in ALPHABET]
+
+
+def to_digits(password: str) -> Tuple[List[int], bool]:
     """
-    Increments the password string like a base-26 number.
+    Converts a password into digits, moving past passwords with a forbidden letter.
+    All passwords from the first forbidden letter on to the next allowed letter are invalid,
+    so that letter is replaced by the next allowed one and every letter after it by 'a'.
 
     Args:
-        pw (str): Current password.
+        password (str): The password.
 
     Returns:
-        str: The next password.
+        Tuple[List[int], bool]: The digits, and whether they are the password itself (False when moved past it).
     """
-    pw = list(pw)
-    i = len(pw) - 1
+    digits = []
+    for position, letter in enumerate(password):
+        if letter not in DIGITS:
+            digits.append(DIGITS[chr(ord(letter) + 1)])
+            digits.extend([0] * (len(password) - position - 1))
+            return digits, False
+        digits.append(DIGITS[letter])
+    return digits, True
 
-    while i >= 0:
-        if pw[i] == 'z':
-            pw[i] = 'a'
-            i -= 1
-        else:
-            pw[i] = chr(ord(pw[i]) + 1)
-            break
 
-    return ''.join(pw)
+def advance(previous: int, digit: int, straight: int, found: bool, first_pair: int, pairs: int) -> Tuple[int, bool, int, int]:
+    """
+    Updates the rule state of a password prefix for its next letter.
 
+    Args:
+        previous (int): The last digit of the prefix, -1 for an empty prefix.
+        digit (int): The next digit.
+        straight (int): Length of the straight ending at the previous letter, at most 2.
+        found (bool): Whether the prefix contains a straight of three letters.
+        first_pair (int): The letter of the first pair while there is exactly one pair, -1 otherwise.
+        pairs (int): Number of different pairs in the prefix, at most 2.
 
-def is_valid(pw: str) -> bool:
+    Returns:
+        Tuple[int, bool, int, int]: The straight, found, first_pair and pairs of the longer prefix.
     """
-    Validates the password according to the corporate policy rules.
+    run = straight + 1 if previous >= 0 and SUCCESSOR[previous] == digit else 1
+    if digit == previous and pairs < 2 and digit != first_pair:
+        pairs += 1
+        first_pair = digit if pairs == 1 else -1
+    return min(run, 2), found or run >= 3, first_pair, pairs
+
+
+@lru_cache(maxsize=None)
+def completable(remaining: int, previous: int, straight: int, found: bool, first_pair: int, pairs: int) -> bool:
+    """
+    Checks whether a prefix with the given rule state can be completed into a valid password.
+    """
+    if remaining == 0:
+        return found and pairs == 2
+    return any(completable(remaining - 1, digit, *advance(previous, digit, straight, found, first_pair, pairs)) for digit in range(len(ALPHABET)))
+
+
+def valid_passwords(current: str) -> Iterator[str]:
+    """
+    Generates the valid passwords after the current one, in order, by a depth-first search over the letters.
+    The search only enters a subtree when `completable` says the prefix can still meet the straight and pair rules,
+    so no time is spent on letters that can't lead to a valid password.
+
+    Like incrementing the password, the letters wrap around from 'zz...z' to 'aa...a', and the passwords
+    up to the current one follow. The stream ends after one full cycle.
 
     Args:
-        pw (str): Password string.
+        current (str): Starting password.
 
-    Returns:
-        bool: True if password is valid, else False.
+    Yields:
+        str: The next valid passwords of the same length.
+    """
+    start, exact = to_digits(current)
+    length = len(start)
+    password = [0] * length
+
+    def search(lower: List[int], exclusive: bool, position: int, tight: bool, state: Tuple[int, bool, int, int]) -> Iterator[str]:
+        if position == length:
+            if not (tight and exclusive):
+                yield ''.join(ALPHABET[digit] for digit in password)
+            return
+
+        previous = password[position - 1] if position else -1
+        for digit in range(lower[position] if tight else 0, len(ALPHABET)):
+            next_state = advance(previous, digit, *state)
+            if completable(length - position - 1, digit, *next_state):
+                password[position] = digit
+                yield from search(lower, exclusive, position + 1, tight and digit == lower[position], next_state)
+
+    yield from search(start, exact, 0, True, (0, False, -1, 0))
+    # Wrapped around: every password from 'aa...a' up to and including the current one
+    yield from takewhile(current.__ge__, search([0] * length, False, 0, True, (0, False, -1, 0)))
+
+
+def next_passwords(current: str, count: int) -> List[str]:
     """
-    # Rule 1: must include one increasing straight of three letters
-    has_straight = any(
-        ord(pw[i]) + 1 == ord(pw[i + 1]) and ord(pw[i + 1]) + 1 == ord(pw[i + 2])
-        for i in range(len(pw) - 2)
-    )
+    Returns the next count valid passwords after the current one.
 
-    # Rule 2: must not contain 'i', 'o', or 'l'
-    if any(c in pw for c in 'iol'):
-        return False
+    Args:
+        current (str): Starting password.
+        count (int): Number of passwords.
 
-    # Rule 3: must contain at least two different, non-overlapping pairs of letters
-    pairs = set()
-    i = 0
-    while i < len(pw) - 1:
-        if pw[i] == pw[i + 1]:
-            pairs.add(pw[i])
-            i += 2  # skip next to avoid overlapping
-        else:
-            i += 1
+    Returns:
+        List[str]: The valid passwords, in order.
 
-    return has_straight and len(pairs) >= 2
+    Raises:
+        ValueError: If there are fewer than count valid passwords of that length.
+    """
+    passwords = list(islice(valid_passwords(current), count))
+    if len(passwords) < count:
+        raise ValueError(f"There are only {len(passwords)} valid passwords of length {len(current)}")
+    return passwords
 
 
 def next_valid_password(current: str) -> str:
@@ -94,10 +157,7 @@ def next_valid_password(current: str) -> str:
     Returns:
         str: The next valid password.
     """
-    while True:
-        current = increment_password(current)
-        if is_valid(current):
-            return current
+    return next_passwords(current, 1)[0]
 
 
 @profiler
@@ -125,8 +185,7 @@ def part_two(data_input: List[str]) -> str:
     Returns:
         str: The valid password after the next one.
     """
-    first = next_valid_password(data_input[0])
-    return next_valid_password(first)
+    return next_passwords(data_input[0], 2)[1]
 
 
 if __name__ == "__main__":
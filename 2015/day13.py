@@ -11,7 +11,7 @@ Answer: 640
 
 from typing import List, Dict
 import re
-import itertools
+from utils import optimal_tour
 from utils import profiler
 
 
@@ -47,26 +47,20 @@ def get_input(file_path: str) -> Dict[str, Dict[str, int]]:
     return preferences
 
 
-def calculate_happiness(arrangement: List[str], preferences: Dict[str, Dict[str, int]]) -> int:
+def happiness_matrix(preferences: Dict[str, Dict[str, int]]) -> List[List[int]]:
     """
-    Calculates the total happiness for a circular seating arrangement.
+    Converts the preferences into a matrix of the happiness change of seating two people next to each other.
 
-    Each person contributes happiness based on both neighbors.
+    Each person contributes happiness based on both neighbors, so an entry holds both of their changes.
 
     Args:
-        arrangement (List[str]): Ordered list of seated people.
         preferences (Dict[str, Dict[str, int]]): Mapping of happiness values.
 
     Returns:
-        int: Total happiness for the seating.
+        List[List[int]]: matrix[i][j] is the total change of seating person i next to person j.
     """
-    total = 0
-    n = len(arrangement)
-    for i in range(n):
-        left = arrangement[i]
-        right = arrangement[(i + 1) % n]
-        total += preferences[left][right] + preferences[right][left]
-    return total
+    people = list(preferences.keys())
+    return [[preferences[a][b] + preferences[b][a] if a != b else 0 for b in people] for a in people]
 
 
 @profiler
@@ -74,8 +68,8 @@ def part_one(preferences: Dict[str, Dict[str, int]]) -> int:
     """
     Finds the optimal circular seating arrangement (excluding yourself)
     that maximizes the total happiness change, accounting for mutual effects
-    between adjacent guests. Uses symmetry optimization by fixing one person
-    and permuting the rest.
+    between adjacent guests. Every rotation of a seating is the same, so the
+    bitmask dynamic program fixes the first person and finds the best cycle.
 
     Args:
         preferences (Dict[str, Dict[str, int]]): Happiness values for each neighbor pair.
@@ -83,14 +77,7 @@ def part_one(preferences: Dict[str, Dict[str, int]]) -> int:
     Returns:
         int: Maximum total happiness for any valid arrangement.
     """
-    people = list(preferences.keys())
-    first = people[0]
-    others = people[1:]
-
-    return max(
-        calculate_happiness([first] + list(p), preferences)
-        for p in itertools.permutations(others)
-    )
+    return optimal_tour(happiness_matrix(preferences), cycle=True, maximize=True)
 
 
 @profiler
@@ -113,15 +100,8 @@ def part_two(preferences: Dict[str, Dict[str, int]]) -> int:
     for person in people:
         preferences[person][you] = 0
         preferences[you][person] = 0
-    people.append(you)
-
-    first = people[0]
-    others = people[1:]
 
-    return max(
-        calculate_happiness([first] + list(p), preferences)
-        for p in itertools.permutations(others)
-    )
+    return optimal_tour(happiness_matrix(preferences), cycle=True, maximize=True)
 
 
 if __name__ == "__main__":
@@ -9,8 +9,9 @@ Part 2: Given the actual Door ID and this new method, what is the password?
 Answer: 437e60fc
 """
 
+from itertools import islice
 from typing import List
-import hashlib
+from utils import mine
 from utils import profiler
 
 
@@ -28,19 +29,6 @@ def get_input(file_path: str) -> List[str]:
         return [line.strip() for line in file]
 
 
-def md5_hash(s: str) -> str:
-    """
-    Returns the hexadecimal MD5 hash of a string.
-
-    Args:
-        s (str): Input string.
-
-    Returns:
-        str: MD5 hash as hex string.
-    """
-    return hashlib.md5(s.encode("utf-8")).hexdigest()
-
-
 @profiler
 def part_one(data_input: List[str]) -> str:
     """
@@ -53,14 +41,7 @@ def part_one(data_input: List[str]) -> str:
         str: The password for part one.
     """
     salt = data_input[0]
-    password = []
-    index = 0
-    while len(password) < 8:
-        h = md5_hash(salt + str(index))
-        if h.startswith("00000"):
-            password.append(h[5])
-        index += 1
-    return "".join(password)
+    return "".join(h[5] for _, h in islice(mine(salt, 5), 8))
 
 
 @profiler
@@ -76,19 +57,17 @@ def part_two(data_input: List[str]) -> str:
     """
     salt = data_input[0]
     password = [None] * 8
-    index = 0
     filled_positions = 0
 
-    while filled_positions < 8:
-        h = md5_hash(salt + str(index))
-        if h.startswith("00000"):
-            pos_char = h[5]
-            if pos_char.isdigit():
-                pos = int(pos_char)
-                if 0 <= pos < 8 and password[pos] is None:
-                    password[pos] = h[6]
-                    filled_positions += 1
-        index += 1
+    for _, h in mine(salt, 5):
+        pos_char = h[5]
+        if pos_char.isdigit():
+            pos = int(pos_char)
+            if 0 <= pos < 8 and password[pos] is None:
+                password[pos] = h[6]
+                filled_positions += 1
+                if filled_positions == 8:
+                    break
 
     return "".join(password)
 
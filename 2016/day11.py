@@ -9,133 +9,158 @@ Part 2: What is the minimum number of steps required to bring all of the objects
 Answer: 71
 """
 
-from itertools import chain, combinations
-from typing import List, Set, Tuple
-from collections import Counter, deque
+from itertools import combinations
+from typing import Iterator, List, Set, Tuple
+from utils import bfs
+from utils import bidirectional_bfs
+from utils import cached_input
 from utils import profiler
+from utils import read_lines
 
 Floor = Set[Tuple[str, str]]  # Each floor is a set of (element, type) tuples.
-State = Tuple[int, int, List[Floor]]  # (moves, elevator position, floor configuration)
 
+# A search state is packed into one int. Only the floors of every generator/microchip pair matter,
+# not which element they belong to, so the pairs are stored sorted (which merges all symmetric states):
+#   elevator << 4 * pairs | pair codes in ascending order, 4 bits each
+# where a pair code is generator floor << 2 | microchip floor.
+FLOOR_COUNT = 4
+PAIR_BITS = 4
+PAIR_MASK = (1 << PAIR_BITS) - 1
 
+# Moving an item one floor up adds this to its pair code
+GENERATOR_STEP = 1 << 2
+MICROCHIP_STEP = 1
+
+# Per pair code: the floor with its generator, and the floor with its microchip when that one is unprotected.
+# A state is safe when no floor holds both a generator and an unprotected microchip.
+GENERATOR_FLOORS = [1 << (code >> 2) for code in range(1 << PAIR_BITS)]
+UNPROTECTED_FLOORS = [0 if code >> 2 == code & 3 else 1 << (code & 3) for code in range(1 << PAIR_BITS)]
+
+
+@cached_input(version=1)
 def get_input(file_path: str) -> List[Floor]:
     """
-    Reads the input file and returns a list of stripped lines.
+    Reads the input file and returns the set of objects on every floor.
 
     Args:
         file_path (str): Path to the input text file.
 
     Returns:
-        list[str]: List of input lines.
+        List[Floor]: The (element, type) objects per floor, bottom floor first.
     """
     initial_floors  = []
-    with open(file_path, "r", encoding="utf-8") as file:
-        for line in file:
-            floor = set()
-            words = line.lower().replace(',', '').replace('.', '').split()
-            for idx, word in enumerate(words):
-                if word.endswith('generator'):
-                    floor.add((words[idx - 1], "generator"))
-                elif word.endswith('microchip'):
-                    floor.add((words[idx - 1].split("-")[0], "microchip"))
-            initial_floors.append(floor)
+    for line in read_lines(file_path):
+        floor = set()
+        words = line.lower().replace(',', '').replace('.', '').split()
+        for idx, word in enumerate(words):
+            if word.endswith('generator'):
+                floor.add((words[idx - 1], "generator"))
+            elif word.endswith('microchip'):
+                floor.add((words[idx - 1].split("-")[0], "microchip"))
+        initial_floors.append(floor)
 
     return initial_floors
 
 
-def is_valid_transition(floor: Floor) -> bool:
+def encode_state(pairs: List[Tuple[int, int]], elevator: int) -> int:
     """
-    Checks whether a given floor configuration is safe.
+    Packs the (generator floor, microchip floor) pairs and the elevator position into a state.
 
     Args:
-        floor (Floor): Set of items on the floor.
+        pairs (List[Tuple[int, int]]): The floors of the generator and microchip of every element.
+        elevator (int): The floor of the elevator.
 
     Returns:
-        bool: True if the configuration is safe, False otherwise.
+        int: The packed state, equal for all states that only differ in element names.
     """
-    return (
-        len(set(type for _, type in floor)) < 2 or
-        all((obj, 'generator') in floor for (obj, type) in floor if type == 'microchip')
-    )
+    state = elevator
+    for code in sorted((generator << 2 | microchip for generator, microchip in pairs), reverse=True):
+        state = state << PAIR_BITS | code
+    return state
 
 
-def next_states(state: State):
+def next_states(state: int, pair_count: int, prune: bool = True) -> Iterator[int]:
     """
     Generates all valid next states from the current state.
+    The elevator carries one or two items from its floor one floor up or down.
 
     Args:
-        state (State): Current (moves, elevator_position, floors)
+        state (int): The packed current state.
+        pair_count (int): Number of generator/microchip pairs.
+        prune (bool): Skip moves down to floors that are empty below, which never shorten a solution.
+            Searching backwards from the final state needs all moves.
 
     Yields:
-        State: Next valid state after a legal move.
+        int: Next valid state after a legal move.
     """
-    moves, elevator, floors = state
-
-    possible_moves = chain(combinations(floors[elevator], 2), combinations(floors[elevator], 1))
-
-    for move in possible_moves:
-        for direction in [-1, 1]:
-            next_elevator = elevator + direction
-            if not 0 <= next_elevator < len(floors):
+    shift = PAIR_BITS * pair_count
+    elevator = state >> shift
+    codes = [(state >> (PAIR_BITS * idx)) & PAIR_MASK for idx in range(pair_count)]
+
+    # The items on the elevator floor, as (pair index, code step)
+    items = [(idx, GENERATOR_STEP) for idx, code in enumerate(codes) if code >> 2 == elevator]
+    items += [(idx, MICROCHIP_STEP) for idx, code in enumerate(codes) if code & 3 == elevator]
+    loads = [(item,) for item in items] + list(combinations(items, 2))
+
+    directions = []
+    if elevator < FLOOR_COUNT - 1:
+        directions.append(1)
+    # Carrying items down to floors that are empty below is never useful
+    if elevator > 0 and (not prune or min(min(code >> 2, code & 3) for code in codes) < elevator):
+        directions.append(-1)
+
+    for direction in directions:
+        for load in loads:
+            new_codes = codes.copy()
+            for idx, step in load:
+                new_codes[idx] += step * direction
+
+            generators = unprotected = 0
+            for code in new_codes:
+                generators |= GENERATOR_FLOORS[code]
+                unprotected |= UNPROTECTED_FLOORS[code]
+            if generators & unprotected:
                 continue
 
-            next_floors = floors.copy()
-            next_floors[elevator] = next_floors[elevator].difference(move)
-            next_floors[next_elevator] = next_floors[next_elevator].union(move)
-
-            if (is_valid_transition(next_floors[elevator]) and is_valid_transition(next_floors[next_elevator])):
-                yield (moves + 1, next_elevator, next_floors)
-
-
-def count_floor_objects(state: State):
-    """
-    Normalizes a state to reduce equivalent states by counting item types on each floor.
-
-    Args:
-        state (State): The current state (moves, elevator_position, floors)
-
-    Returns:
-        tuple: A tuple used as a hashable key for visited state deduplication.
-    """
-    _, elevator, floors = state
-    return elevator, tuple(
-        tuple(Counter(type for _, type in floor).most_common())
-        for floor in floors
-    )
+            next_state = elevator + direction
+            for code in sorted(new_codes, reverse=True):
+                next_state = next_state << PAIR_BITS | code
+            yield next_state
 
 
 @profiler
-def compute(floors: List[Floor], is_part2: bool) -> int:
+def compute(floors: List[Floor], is_part2: bool, bidirectional: bool = True) -> int:
     """
     Computes the minimum number of steps required to move all items to the top floor.
 
     Args:
         floors (List[Floor]): Initial configuration of items on each floor.
         is_part2 (bool): Whether to use the extended input for Part 2.
+        bidirectional (bool): Search from both the start and the final state, every move can be undone.
 
     Returns:
         int: Minimum number of steps to bring all items to the top floor.
     """
-    queue = deque([(0, 0, floors)]) # moves, elevator, floors
-    visited = set()
-
+    locations = {item: number for number, floor in enumerate(floors) for item in floor}
+    pairs = [(number, locations[(element, "microchip")]) for (element, kind), number in locations.items() if kind == "generator"]
     if is_part2:
-        floors[0] = floors[0].union([('elerium', 'generator'), ('elerium', 'microchip'), ('dilithium', 'generator'), ('dilithium', 'microchip')])
+        pairs += [(0, 0), (0, 0)] # Elerium and dilithium generators and microchips on the first floor
 
-    while queue:
-        state = queue.popleft()
-        moves, _, floors = state
+    pair_count = len(pairs)
+    start = encode_state(pairs, 0)
+    goal = encode_state([(FLOOR_COUNT - 1, FLOOR_COUNT - 1)] * pair_count, FLOOR_COUNT - 1)
 
-        # Check if all items on top floor
-        if all(not floor for number, floor in enumerate(floors) if number < len(floors) - 1):
-            return moves
+    def neighbors(state: int) -> Iterator[int]:
+        return next_states(state, pair_count)
 
-        for next_state in next_states(state):
-            if (key := count_floor_objects(next_state)) not in visited:
-                visited.add(key)
-                queue.append(next_state)
+    def predecessors(state: int) -> Iterator[int]:
+        return next_states(state, pair_count, prune=False)
 
-    return -1 # Not found
+    if bidirectional:
+        steps = bidirectional_bfs(start, goal, neighbors, predecessors)
+    else:
+        steps = bfs([start], neighbors, goal.__eq__).cost
+    return steps if steps is not None else -1 # -1 when not found
 
 
 if __name__ == "__main__":
@@ -9,7 +9,10 @@ Part 2: If you instead initialize register c to be 1, what value is now left in
 Answer: 9227647
 """
 
-from typing import List, Dict
+import os
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from utils import Op
+from utils import Program
 from utils import profiler
 
 
@@ -27,53 +30,191 @@ def get_input(file_path: str) -> List[str]:
         return [line.strip() for line in file]
 
 
-def run_program(instructions: List[str], initial_registers: Dict[str, int]) -> Dict[str, int]:
+REGISTERS = ("a", "b", "c", "d")
+
+# With AOC_VERIFY=1 (`python test.py --verify`) every run also checks the fused loops against the plain program
+VERIFY = os.environ.get("AOC_VERIFY") == "1"
+
+
+class Fused(NamedTuple):
     """
-    Runs the assembly-like program with the given initial registers.
+    A pseudo-op replacing a run of source instructions: target += sign * product of the factors.
+    Every factor is an operand times a scale and has to be positive, the cleared registers end at 0.
+    """
+    target: str
+    sign: int
+    factors: Tuple[Tuple[str, int], ...]
+    clears: Tuple[str, ...]
+    length: int
+
+
+def match_add(parsed: List[List[str]], pc: int) -> Optional[Fused]:
+    """
+    Matches `inc x / dec y / jnz y -2` at pc, in either order and with either direction of inc and dec.
+    The loop runs until y reaches 0, which adds y (times the direction of x) to x.
+
+    Args:
+        parsed (List[List[str]]): Split instructions.
+        pc (int): Index of the first instruction.
+
+    Returns:
+        Optional[Fused]: The fused addition, or None if the instructions don't match.
+    """
+    if pc + 3 > len(parsed):
+        return None
+    first, second, jump = parsed[pc:pc + 3]
+    if jump != ['jnz', jump[1], '-2'] or first[0] not in ('inc', 'dec') or second[0] not in ('inc', 'dec'):
+        return None
+    counter = jump[1]
+    if second[1] == counter:
+        target, step = first, second
+    elif first[1] == counter:
+        target, step = second, first
+    else:
+        return None
+    if target[1] == counter or not {target[1], counter} <= set(REGISTERS):
+        return None
+    # The counter takes counter (dec) or -counter (inc) iterations to reach 0
+    scale = -1 if step[0] == 'inc' else 1
+    return Fused(target[1], 1 if target[0] == 'inc' else -1, ((counter, scale),), (counter,), 3)
+
+
+def match_mul(parsed: List[List[str]], pc: int) -> Optional[Fused]:
+    """
+    Matches `cpy b c / <add loop on c> / dec d / jnz d -5` at pc, an addition repeated d times.
+
+    Args:
+        parsed (List[List[str]]): Split instructions.
+        pc (int): Index of the first instruction.
+
+    Returns:
+        Optional[Fused]: The fused multiplication, or None if the instructions don't match.
+    """
+    if pc + 6 > len(parsed) or parsed[pc][0] != 'cpy':
+        return None
+    inner = match_add(parsed, pc + 1)
+    step, jump = parsed[pc + 4:pc + 6]
+    if inner is None or step[0] not in ('inc', 'dec') or jump != ['jnz', step[1], '-5']:
+        return None
+    source, copy = parsed[pc][1:]
+    counter = inner.clears[0]
+    outer = step[1]
+    if copy != counter or outer not in REGISTERS or len({inner.target, counter, outer, source}) != 4:
+        return None
+    factors = ((source, inner.factors[0][1]), (outer, -1 if step[0] == 'inc' else 1))
+    return Fused(inner.target, inner.sign, factors, (counter, outer), 6)
+
+
+def find_idioms(parsed: List[List[str]]) -> Dict[int, Fused]:
+    """
+    Peephole pass finding the multiplication and addition loops of a program.
+
+    Args:
+        parsed (List[List[str]]): Split instructions.
+
+    Returns:
+        Dict[int, Fused]: The pseudo-op to run at the start of every loop found.
+    """
+    fused = {}
+    for pc in range(len(parsed)):
+        idiom = match_mul(parsed, pc) or match_add(parsed, pc)
+        if idiom is not None:
+            fused[pc] = idiom
+    return fused
+
+
+def emit_fused(program: Program, fused: Fused, pc: int) -> None:
+    """
+    Emits a pseudo-op in front of the original instruction at pc.
+    When a factor isn't positive the loop wouldn't end the usual way, so the pseudo-op falls through
+    to the original instructions. Otherwise it applies the result of the loop and jumps past it.
+
+    Args:
+        program (Program): The program being compiled.
+        fused (Fused): The pseudo-op.
+        pc (int): Index of the first instruction it replaces.
+    """
+    guard = program.scratch()
+    product = program.scratch()
+    guards = []
+    for index, (operand, scale) in enumerate(fused.factors):
+        factor = program.scratch() if index else product
+        program.emit(Op.MUL, factor, program.operand(operand), program.constant(scale))
+        program.emit(Op.LE, guard, factor, program.constant(0))
+        guards.append(len(program.code))
+        program.emit(Op.JNZ, 0, guard) # patched below, jumps are resolved by source index
+        if index:
+            program.emit(Op.MUL, product, product, factor)
+
+    target = program.register(fused.target)
+    program.emit(Op.MUL, product, product, program.constant(fused.sign))
+    program.emit(Op.ADD, target, target, product)
+    for register in fused.clears:
+        program.emit(Op.SET, program.register(register), program.constant(0))
+    program.jump(Op.JMP, pc + fused.length)
+
+    for index in guards:
+        program.code[index] = (int(Op.JNZ), len(program.code), guard, 0)
+
+
+def compile_program(instructions: List[str], optimize: bool = True) -> Program:
+    """
+    Compiles assembunny into register machine code.
+    Instructions that can't do anything (copying or incrementing a number) become no-ops,
+    and with optimize the loops found by `find_idioms` are fused into additions and multiplications.
 
     Args:
         instructions (List[str]): List of instructions.
-        initial_registers (Dict[str, int]): Initial register values.
+        optimize (bool): Fuse loops into pseudo-ops.
 
     Returns:
-        Dict[str, int]: Final register values after program execution.
+        Program: The compiled program.
     """
-    registers = initial_registers.copy()
-    pc = 0  # program counter
-
-    def val(x: str) -> int:
-        if x.lstrip('-').isdigit():
-            return int(x)
-        return registers.get(x, 0)
-
-    while 0 <= pc < len(instructions):
-        parts = instructions[pc].split()
-        cmd = parts[0]
-
-        if cmd == 'cpy':
-            x, y = parts[1], parts[2]
-            if y in registers:
-                registers[y] = val(x)
-            pc += 1
-        elif cmd == 'inc':
-            x = parts[1]
-            if x in registers:
-                registers[x] += 1
-            pc += 1
-        elif cmd == 'dec':
-            x = parts[1]
-            if x in registers:
-                registers[x] -= 1
-            pc += 1
+    parsed = [instruction.split() for instruction in instructions]
+    fused = find_idioms(parsed) if optimize else {}
+
+    program = Program(REGISTERS)
+    for pc, (cmd, *args) in enumerate(parsed):
+        program.begin()
+        if pc in fused:
+            emit_fused(program, fused[pc], pc)
+
+        if cmd == 'cpy' and args[1] in REGISTERS:
+            program.emit(Op.SET, program.register(args[1]), program.operand(args[0]))
+        elif cmd in ('inc', 'dec') and args[0] in REGISTERS:
+            register = program.register(args[0])
+            program.emit(Op.ADD, register, register, program.constant(1 if cmd == 'inc' else -1))
         elif cmd == 'jnz':
-            x, y = parts[1], parts[2]
-            if val(x) != 0:
-                pc += val(y)
+            condition = program.operand(args[0])
+            if args[1] in REGISTERS:
+                program.emit(Op.JNZ_REL, pc, condition, program.register(args[1]))
             else:
-                pc += 1
+                program.jump(Op.JNZ, pc + int(args[1]), condition)
         else:
-            pc += 1
+            program.emit(Op.NOP)
+
+    return program.finish()
+
+
+def run_program(instructions: List[str], initial_registers: Dict[str, int], verify: bool = False) -> Dict[str, int]:
+    """
+    Runs the assembly-like program with the given initial registers.
 
+    Args:
+        instructions (List[str]): List of instructions.
+        initial_registers (Dict[str, int]): Initial register values.
+        verify (bool): Also run the program without fused loops, and raise if the registers differ.
+
+    Returns:
+        Dict[str, int]: Final register values after program execution.
+    """
+    program = compile_program(instructions)
+    registers = program.named(program.run(initial_registers).registers)
+    if verify:
+        plain = compile_program(instructions, optimize=False)
+        expected = plain.named(plain.run(initial_registers).registers)
+        if registers != expected:
+            raise ValueError(f"Fused loops gave {registers}, the plain program gave {expected}")
     return registers
 
 
@@ -89,7 +230,7 @@ def part_one(data_input: List[str]) -> int:
         int: Value in register 'a' after execution.
     """
     registers = {'a': 0, 'b': 0, 'c': 0, 'd': 0}
-    final_regs = run_program(data_input, registers)
+    final_regs = run_program(data_input, registers, verify=VERIFY)
     return final_regs['a']
 
 
@@ -105,7 +246,7 @@ def part_two(data_input: List[str]) -> int:
         int: Value in register 'a' after execution.
     """
     registers = {'a': 0, 'b': 0, 'c': 1, 'd': 0}
-    final_regs = run_program(data_input, registers)
+    final_regs = run_program(data_input, registers, verify=VERIFY)
     return final_regs['a']
 
 
@@ -9,11 +9,17 @@ Part 2: How many locations (distinct x,y coordinates, including your starting lo
 Answer: 124
 """
 
-from typing import List, Tuple, Set
-from collections import deque
+from typing import Callable, List
+from utils import bfs
 from utils import profiler
 
 
+# Positions are packed into a single int as y * STRIDE + x
+STRIDE = 1 << 16
+START = 1 * STRIDE + 1
+TARGET = 39 * STRIDE + 31
+
+
 def get_input(file_path: str) -> List[str]:
     """
     Reads the input file and returns a list with the favorite number as a single integer string.
@@ -47,6 +53,23 @@ def is_open(x: int, y: int, favorite_number: int) -> bool:
     return bits % 2 == 0
 
 
+def open_neighbors(favorite_number: int) -> Callable[[int], List[int]]:
+    """
+    Returns the neighbor function of a BFS through the maze, over packed positions.
+
+    Args:
+        favorite_number (int): The office designer's favorite number.
+
+    Returns:
+        Callable[[int], List[int]]: The open positions next to a position.
+    """
+    def neighbors(pos: int) -> List[int]:
+        y, x = divmod(pos, STRIDE)
+        moves = [(x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)]
+        return [ny * STRIDE + nx for nx, ny in moves if is_open(nx, ny, favorite_number)]
+    return neighbors
+
+
 @profiler
 def part_one(data_input: List[str]) -> int:
     """
@@ -67,30 +90,8 @@ def part_one(data_input: List[str]) -> int:
              Returns -1 if the target is unreachable.
     """
     favorite_number = int(data_input[0])
-    target = (31, 39)
-    queue = deque()
-    queue.append((1, 1, 0)) # Start at coordinate (1,1) with 0 steps taken
-    visited: Set[Tuple[int, int]] = set()
-    visited.add((1, 1))
-
-    while queue:
-        x, y, steps = queue.popleft()
-
-        # Check if we have reached the target coordinate
-        if (x, y) == target:
-            return steps
-
-        # Explore neighboring positions (up, down, left, right)
-        for dx, dy in [(1,0), (-1,0), (0,1), (0,-1)]:
-            nx, ny = x + dx, y + dy
-
-            # Only consider positions not yet visited and that are "open" spaces
-            if (nx, ny) not in visited and is_open(nx, ny, favorite_number):
-                visited.add((nx, ny))
-                queue.append((nx, ny, steps + 1))
-
-    # Target is unreachable if the queue is exhausted without finding it
-    return -1
+    result = bfs([START], open_neighbors(favorite_number), TARGET.__eq__)
+    return result.cost if result.cost is not None else -1
 
 
 @profiler
@@ -109,29 +110,7 @@ def part_two(data_input: List[str]) -> int:
         int: The total number of unique locations reachable in at most 50 steps.
     """
     favorite_number = int(data_input[0])
-    queue = deque()
-    queue.append((1, 1, 0))  # Starting position and step count
-    visited: Set[Tuple[int, int]] = set()
-    visited.add((1, 1))
-
-    while queue:
-        x, y, steps = queue.popleft()
-
-        # If we've reached the step limit, don't explore further from this position
-        if steps == 50:
-            continue
-
-        # Explore adjacent positions
-        for dx, dy in [(1,0), (-1,0), (0,1), (0,-1)]:
-            nx, ny = x + dx, y + dy
-
-            # Only enqueue positions that are open and not visited yet
-            if (nx, ny) not in visited and is_open(nx, ny, favorite_number):
-                visited.add((nx, ny))
-                queue.append((nx, ny, steps + 1))
-
-    # The visited set contains all unique reachable positions within 50 steps
-    return len(visited)
+    return len(bfs([START], open_neighbors(favorite_number), max_depth=50).distances)
 
 
 if __name__ == "__main__":
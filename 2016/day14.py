@@ -9,12 +9,21 @@ Part 2: Given the actual salt in your puzzle input and using 2016 extra MD5 call
 Answer: 20606
 """
 
-import hashlib
+from collections import deque
+from contextlib import closing
+from itertools import islice
+import os
 import re
 from typing import List
+from utils import digest_stream
 from utils import profiler
 
 
+STRETCH_ROUNDS = 2016
+# Stretched hashes are persisted per salt next to the inputs, a re-run only reads them back
+HASH_STORE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "inputs", ".cache")
+
+
 def get_input(file_path: str) -> List[str]:
     """
     Reads the input file and returns a list containing the salt string.
@@ -29,38 +38,6 @@ def get_input(file_path: str) -> List[str]:
         return [line.strip() for line in file]
 
 
-def md5_hash(s: str) -> str:
-    """
-    Returns the hexadecimal MD5 hash of a string.
-
-    Args:
-        s (str): Input string.
-
-    Returns:
-        str: MD5 hash as hex string.
-    """
-    return hashlib.md5(s.encode('utf-8')).hexdigest()
-
-
-def stretched_hash(s: str) -> str:
-    """
-    Returns a stretched MD5 hash of the input string by applying MD5 hashing 2017 times.
-
-    The first hash is computed from the original string, and then the result is re-hashed
-    2016 additional times.
-
-    Args:
-        s (str): The input string to hash.
-
-    Returns:
-        str: The final MD5 hash after 2017 iterations.
-    """
-    h = md5_hash(s)
-    for _ in range(2016):
-        h = md5_hash(h)
-    return h
-
-
 def find_triplet(s: str) -> str:
     """
     Find the first character that appears three times in a row in the string.
@@ -78,10 +55,11 @@ def find_triplet(s: str) -> str:
 @profiler
 def compute(data_input: List[str], is_part2: bool) -> int:
     """
-    Finds the index of the 64th key using stretched MD5 hashes.
+    Finds the index of the 64th key using (stretched) MD5 hashes.
 
     Args:
         data_input (List[str]): List containing the salt string.
+        is_part2 (bool): Use hashes stretched with 2016 extra rounds.
 
     Returns:
         int: Index of the 64th key.
@@ -89,24 +67,28 @@ def compute(data_input: List[str], is_part2: bool) -> int:
     salt = data_input[0]
     keys_found = 0
     index = 0
-    hash_cache = {}
-
-    while True:
-        if index not in hash_cache:
-            hash_cache[index] = stretched_hash(f"{salt}{index}") if is_part2 else md5_hash(f"{salt}{index}")
-        h = hash_cache[index]
-        c = find_triplet(h)
-        if c:
-            for i in range(index + 1, index + 1001):
-                if i not in hash_cache:
-                    hash_cache[i] = stretched_hash(f"{salt}{i}") if is_part2 else md5_hash(f"{salt}{i}")
-                # Checks if the string contains five consecutive characters c
-                if c * 5 in hash_cache[i]:
+
+    # Stretched hashes are computed on a process pool ahead of this loop and stored on disk,
+    # plain hashes are cheap enough to compute here
+    if is_part2:
+        stream = digest_stream(salt, STRETCH_ROUNDS, store_dir=HASH_STORE)
+    else:
+        stream = digest_stream(salt, workers=1)
+
+    with closing(stream):
+        # Sliding window with the hash of index and the 1000 hashes after it
+        window = deque(islice(stream, 1001), maxlen=1001)
+        while True:
+            c = find_triplet(window[0])
+            if c:
+                # Checks if one of the next 1000 hashes contains five consecutive characters c
+                quintuple = c * 5
+                if any(quintuple in h for h in islice(window, 1, None)):
                     keys_found += 1
                     if keys_found == 64:
                         return index
-                    break
-        index += 1
+            window.append(next(stream)) # Evicts the hash of index
+            index += 1
 
 
 if __name__ == "__main__":
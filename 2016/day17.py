@@ -12,6 +12,7 @@ Answer: 596
 from typing import List
 from collections import deque
 import hashlib
+from utils import md5_prefix
 from utils import profiler
 
 
@@ -29,19 +30,22 @@ def get_input(file_path: str) -> List[str]:
         return [line.strip() for line in file]
 
 
-def get_doors(passcode: str, path: str) -> List[bool]:
+def get_doors(passcode_md5: "hashlib._Hash", path: str) -> List[bool]:
     """
     Determines which doors are open based on MD5 hash.
+    A door is open when its hexadecimal digit is b-f, i.e. when the nibble is above 10.
 
     Args:
-        passcode (str): The puzzle input passcode.
+        passcode_md5 (hashlib._Hash): An md5 object that already consumed the passcode.
         path (str): The path taken so far.
 
     Returns:
         List[bool]: List of booleans indicating if doors [up, down, left, right] are open.
     """
-    hash_str = hashlib.md5((passcode + path).encode()).hexdigest()
-    return [c in 'bcdef' for c in hash_str[:4]]
+    md5 = passcode_md5.copy()
+    md5.update(path.encode())
+    first, second = md5.digest()[:2]
+    return [first >> 4 > 10, first & 15 > 10, second >> 4 > 10, second & 15 > 10]
 
 
 @profiler
@@ -55,7 +59,7 @@ def part_one(data_input: List[str]) -> str:
     Returns:
         str: The shortest path as a string of moves (U,D,L,R).
     """
-    passcode = data_input[0]
+    passcode_md5 = md5_prefix(data_input[0])
     queue = deque()
     queue.append((0, 0, "")) # x, y, path
 
@@ -64,7 +68,7 @@ def part_one(data_input: List[str]) -> str:
         if (x, y) == (3, 3):
             return path
 
-        doors = get_doors(passcode, path)
+        doors = get_doors(passcode_md5, path)
         directions = ['U', 'D', 'L', 'R']
         moves = [(x, y - 1), (x, y + 1), (x - 1, y), (x + 1, y)]
 
@@ -86,7 +90,7 @@ def part_two(data_input: List[str]) -> int:
     Returns:
         int: Length of longest path.
     """
-    passcode = data_input[0]
+    passcode_md5 = md5_prefix(data_input[0])
     queue = deque()
     queue.append((0, 0, "")) # x, y, path
     max_length = 0
@@ -97,7 +101,7 @@ def part_two(data_input: List[str]) -> int:
             max_length = max(max_length, len(path))
             continue
 
-        doors = get_doors(passcode, path)
+        doors = get_doors(passcode_md5, path)
         directions = ['U', 'D', 'L', 'R']
         moves = [(x, y - 1), (x, y + 1), (x - 1, y), (x + 1, y)]
 
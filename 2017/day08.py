@@ -9,8 +9,9 @@ Part 2: What is the highest value held in any register during the process?
 Answer: 4644
 """
 
-import operator
-from typing import List, Tuple, Dict
+from typing import List, Tuple
+from utils import Op
+from utils import Program
 from utils import profiler
 
 
@@ -28,6 +29,51 @@ def get_input(file_path: str) -> List[str]:
         return [line.strip() for line in file]
 
 
+# Comparison operators of the conditions
+COMPARISONS = {
+    '>': Op.GT,
+    '<': Op.LT,
+    '>=': Op.GE,
+    '<=': Op.LE,
+    '==': Op.EQ,
+    '!=': Op.NE,
+}
+
+# Register holding the highest value written so far, not a valid register name in the input
+HIGHEST = "#highest"
+
+
+def compile_instructions(data_input: List[str]) -> Program:
+    """
+    Compiles the instructions into register machine code.
+    Every instruction tests its condition into a scratch register and skips the update when it's false,
+    after an update the highest value so far is raised to the new register value.
+
+    Args:
+        data_input (List[str]): List of instruction strings.
+
+    Returns:
+        Program: The compiled program.
+    """
+    program = Program([HIGHEST])
+    condition = program.scratch()
+    for index, line in enumerate(data_input):
+        reg, op, val, _, cond_reg, cond_op, cond_val = line.split()
+        program.begin()
+
+        # Registers are created in the order they are seen, the condition register first
+        cond_slot = program.register(cond_reg)
+        target = program.register(reg)
+        amount = int(val) if op == 'inc' else -int(val)
+
+        program.emit(COMPARISONS[cond_op], condition, cond_slot, program.constant(int(cond_val)))
+        program.jump(Op.JZ, index + 1, condition)
+        program.emit(Op.ADD, target, target, program.constant(amount))
+        program.emit(Op.MAX, program.slots[HIGHEST], program.slots[HIGHEST], target)
+
+    return program.finish()
+
+
 @profiler
 def run_instructions(data_input: List[str]) -> Tuple[int, int]:
     """
@@ -41,36 +87,11 @@ def run_instructions(data_input: List[str]) -> Tuple[int, int]:
     Returns:
         Tuple[int, int]: (largest final register value, highest value during execution)
     """
-    registers: Dict[str, int] = {}
-    ops = {
-        '>': operator.gt,
-        '<': operator.lt,
-        '>=': operator.ge,
-        '<=': operator.le,
-        '==': operator.eq,
-        '!=': operator.ne,
-    }
-
-    max_value_ever = float('-inf')
-
-    for line in data_input:
-        reg, op, val, _, cond_reg, cond_op, cond_val = line.split()
-        val = int(val)
-        cond_val = int(cond_val)
-
-        # Initialize registers if not seen
-        registers.setdefault(cond_reg, 0)
-        registers.setdefault(reg, 0)
-
-        if ops[cond_op](registers[cond_reg], cond_val):
-            if op == 'inc':
-                registers[reg] += val
-            else:
-                registers[reg] -= val
-
-            # Track highest value ever seen
-            max_value_ever = max(max_value_ever, registers[reg])
+    program = compile_instructions(data_input)
+    execution = program.run({HIGHEST: float('-inf')})
+    registers = program.named(execution.registers)
 
+    max_value_ever = registers.pop(HIGHEST)
     largest_final_value = max(registers.values()) if registers else 0
     return largest_final_value, max_value_ever
 
@@ -10,7 +10,9 @@ Part 2: After increasing the Elves' attack power until it is just barely enough
 Answer: 59339
 """
 
-from typing import List, Tuple
+from typing import List, Optional, Tuple
+from utils import Grid
+from utils import bfs
 from utils import profiler
 
 
@@ -85,54 +87,41 @@ class Unit:
             default=None,
         )
 
-    def bfs_find_targets(self, game) -> List[Tuple[int, int, int, int, int]]:
+    def find_move(self, game) -> Optional[int]:
         """
-        Performs a breadth-first search (BFS) to find all reachable squares adjacent to enemies.
+        Chooses the first step towards the nearest reachable square adjacent to an enemy.
 
-        For each adjacent square around the unit, it explores the map using BFS,
-        trying to find the shortest path to any square adjacent to an enemy unit.
+        Two breadth-first searches over the free squares decide the move:
+        - From the unit, to find the nearest squares adjacent to an enemy. Ties go to the first one in reading order.
+        - From that target square back to the unit, to find which of the unit's free neighbors lie on a shortest path.
+          Ties again go to the first one in reading order.
 
-        The result is a list of candidate paths represented as tuples:
-        (distance, enemy_y, enemy_x, move_y, move_x)
-
-        - distance: Steps required to reach the square adjacent to the enemy
-        - enemy_y, enemy_x: Position adjacent to the enemy
-        - move_y, move_x: First step the unit should take to get there
+        Since cell indices are row-major, reading order is simply index order.
 
         Returns:
-            List[Tuple[int, int, int, int, int]]: All reachable enemy-adjacent positions and paths.
+            Optional[int]: Index of the square to step onto, or None if no enemy can be reached.
         """
-        paths = []
-        for move_x, move_y in adjacent(self.x, self.y):
-            if not game.free[move_y][move_x]:
-                continue
+        free = game.free.cells
+        neighbor_table = game.free.neighbor_table()
+        enemies = {game.free.index(unit.x, unit.y) for unit in game.units if unit.team != self.team}
+        position = game.free.index(self.x, self.y)
+
+        def neighbors(idx: int) -> List[int]:
+            return [neighbor for neighbor in neighbor_table[idx] if free[neighbor]]
+
+        def in_range(idx: int) -> bool:
+            return idx != position and not enemies.isdisjoint(neighbor_table[idx])
 
-            visited = set(((self.x, self.y),))
-            edges = [(move_x, move_y)]
-            visited.add((move_x, move_y))
-            distance = 1
-            best_distance = None
-
-            while edges:
-                new_edges = []
-                for edge_x, edge_y in edges:
-                    for x, y in adjacent(edge_x, edge_y):
-                        if any(
-                            unit.x == x and unit.y == y and unit.team != self.team
-                            for unit in game.units
-                        ):
-                            # Found an enemy-adjacent square
-                            paths.append((distance, edge_y, edge_x, move_y, move_x))
-                            best_distance = distance
-                        elif game.free[y][x] and (x, y) not in visited:
-                            visited.add((x, y))
-                            new_edges.append((x, y))
-                edges = new_edges
-                distance += 1
-                if best_distance and distance > best_distance:
-                    break
-
-        return paths
+        moves = set(neighbors(position))
+        if not moves:
+            return None
+
+        targets = bfs([position], neighbors, in_range)
+        if not targets.goals:
+            return None
+
+        steps = bfs([min(targets.goals)], neighbors, moves.__contains__)
+        return min(steps.goals)
 
     def tick(self, game):
         """
@@ -149,18 +138,14 @@ class Unit:
         attack_target = self.get_attack_target(game.units)
 
         if not attack_target:
-            # Use BFS to find reachable target positions
-            paths = self.bfs_find_targets(game)
-
-            if paths:
-                # Select the best target square to move to
-                _, _, _, move_y, move_x = min(paths)
+            # Use BFS to find the step towards the nearest reachable target
+            move = self.find_move(game)
 
+            if move is not None:
                 # Move to the chosen square
-                game.free[self.y][self.x] = True
-                self.x = move_x
-                self.y = move_y
-                game.free[self.y][self.x] = False
+                game.free.set(self.x, self.y, 1)
+                self.x, self.y = game.free.position(move)
+                game.free.set(self.x, self.y, 0)
 
                 # Try to attack after moving
                 attack_target = self.get_attack_target(game.units)
@@ -170,46 +155,25 @@ class Unit:
             attack_target.health -= self.attack
             if attack_target.health <= 0:
                 game.units.remove(attack_target)
-                game.free[attack_target.y][attack_target.x] = True
-
-
-def adjacent(x: int, y: int) -> List[Tuple[int, int]]:
-    """
-    Returns the list of coordinates adjacent to the given (x, y) position.
-
-    The returned coordinates follow reading order:
-    - Down (x, y+1)
-    - Up (x, y-1)
-    - Right (x+1, y)
-    - Left (x-1, y)
-
-    Args:
-        x (int): X-coordinate of the current position.
-        y (int): Y-coordinate of the current position.
-
-    Returns:
-        List[Tuple[int, int]]: A list of (x, y) tuples for adjacent squares.
-    """
-    return [(x + dx, y + dy) for dx, dy in [(0, 1), (0, -1), (1, 0), (-1, 0)]]
+                game.free.set(attack_target.x, attack_target.y, 1)
 
 
 class Game:
     """
     Represents the game state, including the map grid and all units.
 
-    The grid is a 2D boolean matrix where:
-    - True indicates a free/open space ('.')
-    - False indicates a wall or occupied square ('#', or unit present)
+    The grid is a flat `Grid` of flags where:
+    - 1 indicates a free/open space ('.')
+    - 0 indicates a wall or occupied square ('#', or unit present)
 
     Units are stored as a list of Unit objects and updated throughout the simulation.
     """
     def __init__(self, data: str, elf_attack: int = 3):
-        self.free = []  # 2D grid: True for empty space, False for wall or occupied
+        self.free = Grid(len(data[0]), len(data)) # 1 for empty space, 0 for wall or occupied
         self.units = [] # List of Unit objects
         for y, line in enumerate(data):
-            self.free.append([])
             for x, char in enumerate(line):
-                self.free[-1].append(char == '.')
+                self.free.set(x, y, char == '.')
                 if char == 'E' or char == 'G':
                     attack = elf_attack if char == 'E' else 3
                     self.units.append(Unit(char, x, y, attack))
@@ -1,4 +1,4 @@
-# pylint: disable=line-too-long, missing-function-docstring, multiple-statements
+# pylint: disable=line-too-long
 """
 Day 16: Chronal Classification
 
@@ -9,9 +9,12 @@ Part 2: What value is contained in register 0 after executing the test program?
 Answer: 577
 """
 
-from typing import List, Dict, Callable, Tuple
+from dataclasses import dataclass
+import operator
 import re
-from copy import deepcopy
+from typing import Callable, Dict, List, Optional, Set, Tuple
+from utils import Op
+from utils import Program
 from utils import profiler
 
 
@@ -61,32 +64,187 @@ def parse_input(data: List[str]) -> Tuple[List[Tuple[List[int], List[int], List[
     return samples, program
 
 
-# Define all 16 possible opcodes
-def addr(r, a, b, c): r[c] = r[a] + r[b]
-def addi(r, a, b, c): r[c] = r[a] + b
-def mulr(r, a, b, c): r[c] = r[a] * r[b]
-def muli(r, a, b, c): r[c] = r[a] * b
-def banr(r, a, b, c): r[c] = r[a] & r[b]
-def bani(r, a, b, c): r[c] = r[a] & b
-def borr(r, a, b, c): r[c] = r[a] | r[b]
-def bori(r, a, b, c): r[c] = r[a] | b
-def setr(r, a, _, c): r[c] = r[a]
-def seti(r, a, _, c): r[c] = a
-def gtir(r, a, b, c): r[c] = 1 if a > r[b] else 0
-def gtri(r, a, b, c): r[c] = 1 if r[a] > b else 0
-def gtrr(r, a, b, c): r[c] = 1 if r[a] > r[b] else 0
-def eqir(r, a, b, c): r[c] = 1 if a == r[b] else 0
-def eqri(r, a, b, c): r[c] = 1 if r[a] == b else 0
-def eqrr(r, a, b, c): r[c] = 1 if r[a] == r[b] else 0
-
-# Map all operation names to their corresponding functions
-ALL_OPS: Dict[str, Callable[[List[int], int, int, int], None]] = {
-    "addr": addr, "addi": addi, "mulr": mulr, "muli": muli,
-    "banr": banr, "bani": bani, "borr": borr, "bori": bori,
-    "setr": setr, "seti": seti, "gtir": gtir, "gtri": gtri,
-    "gtrr": gtrr, "eqir": eqir, "eqri": eqri, "eqrr": eqrr
+# All 16 operations as register machine operations, with whether A and B are registers (True) or values (False).
+# The set operations ignore B.
+ALL_OPS: Dict[str, Tuple[Op, bool, bool]] = {
+    "addr": (Op.ADD, True, True), "addi": (Op.ADD, True, False),
+    "mulr": (Op.MUL, True, True), "muli": (Op.MUL, True, False),
+    "banr": (Op.AND, True, True), "bani": (Op.AND, True, False),
+    "borr": (Op.OR, True, True), "bori": (Op.OR, True, False),
+    "setr": (Op.SET, True, False), "seti": (Op.SET, False, False),
+    "gtir": (Op.GT, False, True), "gtri": (Op.GT, True, False), "gtrr": (Op.GT, True, True),
+    "eqir": (Op.EQ, False, True), "eqri": (Op.EQ, True, False), "eqrr": (Op.EQ, True, True),
 }
 
+REGISTER_COUNT = 4
+
+# What every operation computes from its two inputs, applied to a whole column of samples at once
+KERNELS: Dict[Op, Callable[[int, int], int]] = {
+    Op.ADD: operator.add,
+    Op.MUL: operator.mul,
+    Op.AND: operator.and_,
+    Op.OR: operator.or_,
+    Op.SET: lambda x, _: x,
+    Op.GT: lambda x, y: int(x > y),
+    Op.EQ: lambda x, y: int(x == y),
+}
+
+
+@dataclass
+class SampleBatch:
+    """
+    The samples stored as columns, with one entry per sample.
+    Register reads out of range are None, as is the expected value of a sample that changed more than register C.
+    """
+    opcodes: List[int]
+    a: List[int]
+    b: List[int]
+    register_a: List[Optional[int]]
+    register_b: List[Optional[int]]
+    expected: List[Optional[int]]
+
+    @classmethod
+    def from_samples(cls, samples: List[Tuple[List[int], List[int], List[int]]]) -> 'SampleBatch':
+        """
+        Builds the columns of a list of (before, instruction, after) samples.
+        """
+        def read(registers: List[int], index: int) -> Optional[int]:
+            return registers[index] if index < REGISTER_COUNT else None
+
+        def expected(before: List[int], c: int, after: List[int]) -> Optional[int]:
+            if c >= REGISTER_COUNT or any(x != y for index, (x, y) in enumerate(zip(before, after)) if index != c):
+                return None
+            return after[c]
+
+        return cls(
+            opcodes=[instr[0] for _, instr, _ in samples],
+            a=[instr[1] for _, instr, _ in samples],
+            b=[instr[2] for _, instr, _ in samples],
+            register_a=[read(before, instr[1]) for before, instr, _ in samples],
+            register_b=[read(before, instr[2]) for before, instr, _ in samples],
+            expected=[expected(before, instr[3], after) for before, instr, after in samples],
+        )
+
+    def matches(self, name: str) -> bytes:
+        """
+        Runs an operation on every sample.
+
+        Args:
+            name (str): The operation name.
+
+        Returns:
+            bytes: 1 for every sample the operation explains, 0 for the others.
+        """
+        op, a_register, b_register = ALL_OPS[name]
+        kernel = KERNELS[op]
+        xs = self.register_a if a_register else self.a
+        ys = self.register_b if b_register else self.b
+        return bytes(
+            x is not None and y is not None and expected is not None and kernel(x, y) == expected
+            for x, y, expected in zip(xs, ys, self.expected)
+        )
+
+    def opcode_flags(self, opcode: int) -> bytes:
+        """
+        Returns 1 for every sample with the opcode, 0 for the others.
+        """
+        return bytes(sample_opcode == opcode for sample_opcode in self.opcodes)
+
+
+def to_mask(flags: bytes) -> int:
+    """
+    Packs a row of 0/1 flags into an int, so rows can be combined with bitwise operations.
+    """
+    return int.from_bytes(flags, "little")
+
+
+def opcode_candidates(batch: SampleBatch) -> Dict[int, Set[str]]:
+    """
+    Finds the operations every opcode could be: the ones that explain all samples with that opcode.
+
+    Args:
+        batch (SampleBatch): The samples.
+
+    Returns:
+        Dict[int, Set[str]]: Candidate operation names per opcode.
+    """
+    masks = {name: to_mask(batch.matches(name)) for name in ALL_OPS}
+    candidates = {}
+    for opcode in range(len(ALL_OPS)):
+        samples = to_mask(batch.opcode_flags(opcode))
+        candidates[opcode] = {name for name, mask in masks.items() if mask & samples == samples}
+    return candidates
+
+
+def assign_opcodes(candidates: Dict[int, Set[str]]) -> Dict[int, str]:
+    """
+    Resolves candidate operations into one operation per opcode by constraint propagation.
+    An opcode with a single candidate left takes it, as does the only opcode left that can be an operation,
+    and an assigned operation is removed from the candidates of every other opcode.
+
+    Args:
+        candidates (Dict[int, Set[str]]): Candidate operation names per opcode.
+
+    Returns:
+        Dict[int, str]: Operation name per opcode.
+
+    Raises:
+        ValueError: If the candidates contradict each other or don't determine a single assignment.
+    """
+    remaining = {opcode: set(names) for opcode, names in candidates.items()}
+    assigned: Dict[int, str] = {}
+
+    def assign(opcode: int, name: str) -> None:
+        assigned[opcode] = name
+        del remaining[opcode]
+        for names in remaining.values():
+            names.discard(name)
+
+    while remaining:
+        progress = False
+        for opcode, names in list(remaining.items()):
+            if opcode not in remaining:
+                continue
+            if not names:
+                raise ValueError(f"No operation left for opcode {opcode}")
+            if len(names) == 1:
+                assign(opcode, next(iter(names)))
+                progress = True
+
+        owners: Dict[str, List[int]] = {}
+        for opcode, names in remaining.items():
+            for name in names:
+                owners.setdefault(name, []).append(opcode)
+        for name, opcodes in owners.items():
+            if len(opcodes) == 1 and opcodes[0] in remaining:
+                assign(opcodes[0], name)
+                progress = True
+
+        if not progress:
+            raise ValueError(f"Opcodes {sorted(remaining)} have more than one possible operation")
+    return assigned
+
+
+def compile_program(program: List[List[int]], opcodes: Dict[int, str]) -> Program:
+    """
+    Compiles the test program into register machine code.
+
+    Args:
+        program (List[List[int]]): The instructions: opcode, A, B and C.
+        opcodes (Dict[int, str]): Operation name per opcode number.
+
+    Returns:
+        Program: The compiled program.
+    """
+    compiled = Program([f"r{index}" for index in range(REGISTER_COUNT)])
+    for opcode, a, b, c in program:
+        op, a_register, b_register = ALL_OPS[opcodes[opcode]]
+        compiled.begin()
+        x = compiled.register(f"r{a}") if a_register else compiled.constant(a)
+        y = compiled.register(f"r{b}") if b_register else compiled.constant(b)
+        compiled.emit(op, compiled.register(f"r{c}"), x, y)
+    return compiled.finish()
+
 
 @profiler
 def part_one(data_input: List[str]) -> int:
@@ -100,19 +258,11 @@ def part_one(data_input: List[str]) -> int:
         int: Number of samples that behave like three or more opcodes.
     """
     samples, _ = parse_input(data_input)
-    count = 0
-
-    for before, instr, after in samples:
-        matches = 0
-        for func in ALL_OPS.values():
-            regs = deepcopy(before)
-            func(regs, *instr[1:])  # Apply the function using instruction parameters (a, b, c)
-            if regs == after:
-                matches += 1
-        if matches >= 3:
-            count += 1
+    batch = SampleBatch.from_samples(samples)
 
-    return count
+    # Every operation runs on all samples at once, the number of operations explaining a sample is the sum of its column
+    matches = [batch.matches(name) for name in ALL_OPS]
+    return sum(count >= 3 for count in map(sum, zip(*matches)))
 
 
 @profiler
@@ -127,37 +277,11 @@ def part_two(data_input: List[str]) -> int:
         int: The value in register 0 after executing the program.
     """
     samples, program = parse_input(data_input)
-
-    # Initialize candidate opcode mappings (each opcode could be any of the 16 functions)
-    opcode_candidates: Dict[int, set[str]] = {
-        i: set(ALL_OPS.keys()) for i in range(16)
-    }
-
-    # Narrow down candidates using the samples
-    for before, instr, after in samples:
-        opcode = instr[0]
-        for name in list(opcode_candidates[opcode]):
-            regs = deepcopy(before)
-            ALL_OPS[name](regs, *instr[1:])
-            if regs != after:
-                opcode_candidates[opcode].discard(name)
-
-    # Resolve opcode-function mapping by elimination
-    final_opcodes: Dict[int, str] = {}
-    while len(final_opcodes) < 16:
-        for code, options in opcode_candidates.items():
-            options -= set(final_opcodes.values())  # Remove already assigned operations
-            if len(options) == 1:
-                final_opcodes[code] = options.pop()
+    opcodes = assign_opcodes(opcode_candidates(SampleBatch.from_samples(samples)))
 
     # Execute the actual test program using the resolved opcode mapping
-    regs = [0, 0, 0, 0]
-    for instr in program:
-        opcode = instr[0]
-        func = ALL_OPS[final_opcodes[opcode]]
-        func(regs, *instr[1:])
-
-    return regs[0]
+    execution = compile_program(program, opcodes).run()
+    return execution.registers[0]
 
 
 if __name__ == "__main__":
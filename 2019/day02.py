@@ -9,9 +9,12 @@ Part 2: Find noun and verb that result in output 19690720.
 Answer: 6577
 """
 
-from typing import List
-from utils import IntcodeComputer
+from typing import List, Optional
+from utils import CompiledIntcodeComputer
+from utils import Polynomial
+from utils import intcode_engine
 from utils import profiler
+from utils import symbolic_execute
 
 
 def get_input(file_path: str) -> List[int]:
@@ -41,13 +44,11 @@ def run_program_with_inputs(program: List[int], noun: int, verb: int) -> int:
     Returns:
         int: The value at position 0 of the program after it halts.
     """
-    memory = program.copy()
-    memory[1] = noun
-    memory[2] = verb
-    computer = IntcodeComputer(memory)
-
-    while not computer.halted:
-        computer.run()
+    # Every run starts from the same program, so the compiled code is reused across all noun/verb pairs
+    computer = intcode_engine(CompiledIntcodeComputer)(program)
+    computer.memory[1] = noun
+    computer.memory[2] = verb
+    computer.run_batch()
 
     return computer.memory[0]
 
@@ -66,16 +67,16 @@ def part_1(program: List[int]) -> int:
     return run_program_with_inputs(program, 12, 2)
 
 
-@profiler
-def part_2(program: List[int], target: int = 19690720) -> int:
+def search_noun_verb(program: List[int], target: int) -> Optional[int]:
     """
     Brute-force search for noun and verb that cause the program to produce the target output.
 
     Args:
         program (List[int]): The Intcode program.
+        target (int): The required value at position 0.
 
     Returns:
-        int: 100 * noun + verb that produces the target output.
+        Optional[int]: 100 * noun + verb that produces the target output, None if there is none.
     """
     for noun in range(100):
         for verb in range(100):
@@ -85,6 +86,35 @@ def part_2(program: List[int], target: int = 19690720) -> int:
     return None  # Not found
 
 
+@profiler
+def part_2(program: List[int], target: int = 19690720) -> int:
+    """
+    Finds the noun and verb that cause the program to produce the target output.
+
+    The program is run once with the noun and verb as variables (x0 and x1), which gives position 0
+    as a polynomial of both, e.g. 230400 * x0 + x1 + 190687. For every noun that leaves an equation
+    in the verb, which is solved directly. When the program branches on the noun or verb this isn't
+    possible, and every pair is run instead.
+
+    Args:
+        program (List[int]): The Intcode program.
+        target (int): The required value at position 0.
+
+    Returns:
+        int: 100 * noun + verb that produces the target output.
+    """
+    memory = symbolic_execute(program, {1: 0, 2: 1})
+    if memory is None or memory[0] is None:
+        return search_noun_verb(program, target)
+
+    output = Polynomial.lift(memory[0])
+    for noun in range(100):
+        verbs = output.substitute({0: noun}).solve(1, target, range(100))
+        if verbs:
+            return 100 * noun + verbs[0]
+    return None  # Not found
+
+
 if __name__ == "__main__":
     input_data = get_input("inputs/2_input.txt")
 
@@ -9,9 +9,12 @@ Part 2: Try every combination of the new phase settings on the amplifier feedbac
 Answer: 3745599
 """
 
-from typing import List
+from functools import partial
+from typing import List, Tuple
 from itertools import permutations
 from utils import IntcodeComputer
+from utils import IntcodeNetwork
+from utils import parallel_map
 from utils import profiler
 
 
@@ -29,27 +32,42 @@ def get_input(file_path: str) -> List[int]:
         return list(map(int, file.read().strip().split(",")))
 
 
+def amplify(program: List[int], phase_settings: Tuple[int, ...], feedback: bool = False) -> int:
+    """
+    Runs a chain of amplifiers, each with its own phase setting, on an input signal of 0.
+
+    Args:
+        program (List[int]): The Intcode program for the amplifiers.
+        phase_settings (Tuple[int, ...]): Phase setting of every amplifier, in chain order.
+        feedback (bool): Connect the last amplifier back into the first one.
+
+    Returns:
+        int: The last signal sent by the last amplifier.
+    """
+    amplifiers = [IntcodeComputer(program, [phase]) for phase in phase_settings]
+    network = IntcodeNetwork(amplifiers)
+    for index in range(len(amplifiers) - 1):
+        network.connect(index, index + 1)
+    if feedback:
+        network.connect(len(amplifiers) - 1, 0)
+
+    amplifiers[0].add_input(0)
+    network.run()
+    return network.outputs[-1][-1]
+
+
 @profiler
-def part_one(program: List[str]) -> int:
+def part_one(program: List[int]) -> int:
     """
     Calculate every combination of phase settings on the amplifiers.
 
     Args:
-        data_input (List[str]): A list of input lines from the puzzle input file.
+        program (List[int]): The Intcode program for the amplifiers.
 
     Returns:
         int: The highest signal that can be sent to the thrusters.
     """
-    max_signal = 0
-
-    for phase_settings in permutations(range(5)):
-        signal = 0
-        for phase in phase_settings:
-            amp = IntcodeComputer(program, [phase, signal])
-            signal = amp.run()
-        max_signal = max(max_signal, signal)
-
-    return max_signal
+    return max(parallel_map(partial(amplify, program), permutations(range(5))))
 
 
 @profiler
@@ -63,28 +81,7 @@ def part_two(program: List[int]) -> int:
     Returns:
         int: The highest output signal that can be sent to the thrusters.
     """
-    max_output = 0
-
-    for phase_setting in permutations(range(5, 10)):
-        # Initialize each amplifier with its phase setting
-        amplifiers = [IntcodeComputer(program[:], [phase]) for phase in phase_setting]
-
-        signal = 0
-        pointer = 0
-        last_output = 0
-
-        while not amplifiers[-1].halted:
-            amp = amplifiers[pointer % 5]
-            amp.add_input(signal)
-            output = amp.run()
-            if output is not None:
-                signal = output
-                last_output = signal
-            pointer += 1
-
-        max_output = max(max_output, last_output)
-
-    return max_output
+    return max(parallel_map(partial(amplify, program, feedback=True), permutations(range(5, 10))))
 
 
 if __name__ == "__main__":
@@ -40,14 +40,10 @@ def part_one(program: List[int]) -> int:
         int: Number of block tiles on the screen.
     """
     computer = IntcodeComputer(program.copy())
-    outputs = []
-    while not computer.halted:
-        val = computer.run()
-        if val is not None:
-            outputs.append(val)
+    outputs = computer.run_batch()
 
     # Outputs come in triples: (x, y, tile_id)
-    tiles = [outputs[i + 2] for i in range(0, len(outputs), 3)]
+    tiles = outputs[2::3]
     return tiles.count(2) # Count of block tiles
 
 
@@ -73,24 +69,20 @@ def part_two(program: List[int]) -> int:
     ball_x = 0
     paddle_x = 0
 
-    output_buffer = []
-
     while not computer.halted:
-        val = computer.run()
-        if val is not None:
-            output_buffer.append(val)
-            if len(output_buffer) == 3:
-                x, y, tile_id = output_buffer
-                output_buffer.clear()
-                if (x, y) == (-1, 0):
-                    score = tile_id  # Update score
-                else:
-                    screen[(x, y)] = tile_id
-                    if tile_id == 3:
-                        paddle_x = x
-                    elif tile_id == 4:
-                        ball_x = x
-        else:
+        # Draws everything up to the next joystick read in one go, outputs come in triples: (x, y, tile_id)
+        outputs = computer.run_batch()
+        for x, y, tile_id in zip(*[iter(outputs)] * 3):
+            if (x, y) == (-1, 0):
+                score = tile_id  # Update score
+            else:
+                screen[(x, y)] = tile_id
+                if tile_id == 3:
+                    paddle_x = x
+                elif tile_id == 4:
+                    ball_x = x
+
+        if computer.paused:
             # Computer is waiting for input
             # Decide joystick input based on ball and paddle positions
             if ball_x > paddle_x:
@@ -9,9 +9,10 @@ Part 2: Use the repair droid to get a complete map of the area. How many minutes
 Answer: 288
 """
 
-from typing import List, Tuple, Dict
-from collections import deque
-from utils import IntcodeComputer
+from typing import Callable, Dict, List, Tuple
+from utils import SnapshotIntcodeComputer
+from utils import bfs
+from utils import intcode_engine
 from utils import profiler
 
 
@@ -29,104 +30,95 @@ def get_input(file_path: str) -> List[int]:
         return list(map(int, file.read().strip().split(",")))
 
 
+# Positions are packed into a single int as y * STRIDE + x, with the droid starting at 0
+STRIDE = 1 << 16
+
 DIRECTIONS = {
-    1: (0, -1),  # North
-    2: (0, 1),   # South
-    3: (-1, 0),  # West
-    4: (1, 0),   # East
+    1: -STRIDE,  # North
+    2: STRIDE,   # South
+    3: -1,       # West
+    4: 1,        # East
 }
 
 
-def bfs_explore(program: List[int]) -> Tuple[Dict[Tuple[int, int], int], Tuple[int, int]]:
+def bfs_explore(program: List[int]) -> Tuple[Dict[int, int], int]:
     """
     Explore the map using BFS controlling the Intcode droid.
+    Every search state holds a snapshot of the droid that stands on that position,
+    snapshots share the memory pages the droids haven't written to since forking.
 
     Returns:
         Tuple:
             - map of positions to tile type (0=wall, 1=empty, 2=oxygen system)
             - position of oxygen system
     """
-    computer = IntcodeComputer(program)
-    start = (0, 0)
-    visited = {start: 1}
-    queue = deque([(start, computer)])
-    oxygen_pos = None
-
-    while queue:
-        pos, comp = queue.popleft()
-        for direction, (dx, dy) in DIRECTIONS.items():
-            new_pos = (pos[0] + dx, pos[1] + dy)
-            if new_pos in visited:
+    tiles = {0: 1}
+
+    def neighbors(state: Tuple[int, SnapshotIntcodeComputer]) -> List[Tuple[int, SnapshotIntcodeComputer]]:
+        pos, comp = state
+        moves = []
+        for direction, step in DIRECTIONS.items():
+            new_pos = pos + step
+            if new_pos in tiles:
                 continue
 
             new_comp = comp.copy()
             new_comp.add_input(direction)
             status = new_comp.run()
 
-            visited[new_pos] = status
-            if status == 0:
-                continue
-            if status == 2:
-                oxygen_pos = new_pos
-            queue.append((new_pos, new_comp))
+            tiles[new_pos] = status
+            if status != 0:
+                moves.append((new_pos, new_comp))
+        return moves
 
-    return visited, oxygen_pos
+    bfs([(0, intcode_engine(SnapshotIntcodeComputer)(program))], neighbors, key=lambda state: state[0])
+    oxygen_pos = next(pos for pos, status in tiles.items() if status == 2)
+    return tiles, oxygen_pos
 
 
-def bfs_shortest_path(visited: Dict[Tuple[int, int], int], start: Tuple[int, int], target: Tuple[int, int]) -> int:
+def open_neighbors(tiles: Dict[int, int]) -> Callable[[int], List[int]]:
     """
-    BFS to find shortest path length between start and target in the map.
+    Returns the neighbor function of a BFS over the explored open tiles.
 
     Args:
-        visited (Dict[Tuple[int, int], int]): Map of positions to tile types.
-        start (Tuple[int, int]): Start position.
-        target (Tuple[int, int]): Target position.
+        tiles (Dict[int, int]): Map of positions to tile types.
 
     Returns:
-        int: Shortest path length.
+        Callable[[int], List[int]]: The open positions next to a position.
     """
-    queue = deque([(start, 0)])
-    seen = {start}
+    def neighbors(pos: int) -> List[int]:
+        return [pos + step for step in DIRECTIONS.values() if tiles.get(pos + step, 0) != 0]
+    return neighbors
 
-    while queue:
-        pos, dist = queue.popleft()
-        if pos == target:
-            return dist
 
-        for dx, dy in DIRECTIONS.values():
-            new_pos = (pos[0] + dx, pos[1] + dy)
-            if new_pos in visited and visited[new_pos] != 0 and new_pos not in seen:
-                seen.add(new_pos)
-                queue.append((new_pos, dist + 1))
+def bfs_shortest_path(tiles: Dict[int, int], start: int, target: int) -> int:
+    """
+    BFS to find shortest path length between start and target in the map.
 
-    return -1
+    Args:
+        tiles (Dict[int, int]): Map of positions to tile types.
+        start (int): Start position.
+        target (int): Target position.
 
+    Returns:
+        int: Shortest path length.
+    """
+    result = bfs([start], open_neighbors(tiles), target.__eq__)
+    return result.cost if result.cost is not None else -1
 
-def bfs_fill_oxygen(visited: Dict[Tuple[int, int], int], start: Tuple[int, int]) -> int:
+
+def bfs_fill_oxygen(tiles: Dict[int, int], start: int) -> int:
     """
     BFS to find time to fill entire area with oxygen.
 
     Args:
-        visited (Dict[Tuple[int, int], int]): Map of positions to tile types.
-        start (Tuple[int, int]): Oxygen system position.
+        tiles (Dict[int, int]): Map of positions to tile types.
+        start (int): Oxygen system position.
 
     Returns:
         int: Minutes to fill with oxygen.
     """
-    queue = deque([(start, 0)])
-    seen = {start}
-    max_dist = 0
-
-    while queue:
-        pos, dist = queue.popleft()
-        max_dist = max(max_dist, dist)
-        for dx, dy in DIRECTIONS.values():
-            new_pos = (pos[0] + dx, pos[1] + dy)
-            if new_pos in visited and visited[new_pos] != 0 and new_pos not in seen:
-                seen.add(new_pos)
-                queue.append((new_pos, dist + 1))
-
-    return max_dist
+    return max(bfs([start], open_neighbors(tiles)).distances.values())
 
 
 @profiler
@@ -140,8 +132,8 @@ def part_one(data_input: List[int]) -> int:
     Returns:
         int: Number of steps to oxygen system.
     """
-    visited, oxygen_pos = bfs_explore(data_input)
-    return bfs_shortest_path(visited, (0, 0), oxygen_pos)
+    tiles, oxygen_pos = bfs_explore(data_input)
+    return bfs_shortest_path(tiles, 0, oxygen_pos)
 
 
 @profiler
@@ -155,8 +147,8 @@ def part_two(data_input: List[int]) -> int:
     Returns:
         int: Minutes to fill with oxygen.
     """
-    visited, oxygen_pos = bfs_explore(data_input)
-    return bfs_fill_oxygen(visited, oxygen_pos)
+    tiles, oxygen_pos = bfs_explore(data_input)
+    return bfs_fill_oxygen(tiles, oxygen_pos)
 
 
 if __name__ == "__main__":
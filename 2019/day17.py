@@ -47,12 +47,7 @@ def build_map(program: List[int]) -> List[str]:
         List[List[str]]: 2D map of scaffold (#) and open space (.) characters.
     """
     computer = IntcodeComputer(program)
-    grid_output = []
-    while not computer.halted:
-        output = computer.run()
-        if output is not None:
-            grid_output.append(chr(output))
-    return ''.join(grid_output).splitlines()
+    return ''.join(map(chr, computer.stream())).splitlines()
 
 
 def find_intersections(grid: List[str]) -> List[Tuple[int, int]]:
@@ -239,13 +234,9 @@ def drive_bot(codes: List[int], main: str, registers: List[str]) -> int:
     for i in inputs:
         computer.add_input(i)
 
-    last_output = None
-    while not computer.halted:
-        output = computer.run()
-        if output is not None:
-            last_output = output
-
-    return last_output
+    # The prompts and the final map are printed before the dust amount, the last output
+    outputs = computer.run_batch()
+    return outputs[-1] if outputs else None
 
 
 @profiler
@@ -2,71 +2,79 @@
 # pylint: disable=line-too-long
 """
 Useful functions to help with puzzles
-"""
 
-from collections import defaultdict
-from functools import wraps
-import time
-from typing import List, Optional
+Intcode engines, all with the same public API:
+- ReferenceIntcodeComputer: The straightforward interpreter, kept as the reference implementation.
+- FastIntcodeComputer: Flat list memory, instructions decoded once per address, and a single dispatch loop.
+- SnapshotIntcodeComputer: The fast engine on copy-on-write memory pages, for searches that fork the computer a lot.
+- CompiledIntcodeComputer: Compiles straight-line code into Python functions, shared by every run of the same program.
 
+`IntcodeComputer` is the fast engine, set AOC_INTCODE_ENGINE=reference to run every solution on the
+reference engine instead (solutions that need a specialised engine get it through `intcode_engine`).
+`compare_engines` runs a program on both engines and reports the first difference, `python test.py --compare-engines`
+runs every 2019 day on both and compares the answers. All engines reject negative addresses with a ValueError.
 
-def profiler(func):
-    """
-    A decorator to measure and log the execution time of a function.
-    
-    This decorator wraps the provided function and tracks the time it takes 
-    to execute. The measured execution time is printed to the console 
-    with a timestamp.
+All engines share IntcodeChannels: deque input and output channels, `run` to execute until the next output,
+and `run_batch`, `run_until` and `stream` to drain many outputs in one call.
 
-    Args:
-        func (function): The function whose execution time needs to be measured.
+IntcodeNetwork wires computers together and runs them from a ready queue until none can make progress,
+`parallel_map` spreads independent runs (e.g. phase permutations) over a process pool.
 
-    Returns:
-        function: A wrapped version of the input function, which logs the execution time.
-    """
-    @wraps(func)
-    def wrapper(*args, **kwargs):
-        start_time = time.time() # Record the start time of the function call
-        result = func(*args, **kwargs) # Execute the original function
-        elapsed_time = time.time() - start_time # Compute the elapsed time
-        print(f"Execution time of '{func.__name__}': {elapsed_time:.4f} seconds")
-        return result
+For analysis, `disassemble` lists a program as readable instructions and `profile_program` counts how often
+every instruction is executed, `format_profile` combines both to show the hot spots.
+`symbolic_execute` runs a program with some memory cells as variables, and gives the final memory
+as polynomials of them as long as the control flow doesn't depend on them.
+"""
+
+import abc
+from collections import Counter, defaultdict, deque
+import multiprocessing
+import os
+import sys
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
-    return wrapper
+# Make the shared `aoc` package importable when a solution is run from this directory
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from aoc.inputs import cached_input, read_lines, read_text # pylint: disable=wrong-import-position,unused-import
+from aoc.profiling import profiler # pylint: disable=wrong-import-position,unused-import
+from aoc.search import SearchResult, bfs, bidirectional_bfs, dijkstra, shortest_path_states # pylint: disable=wrong-import-position,unused-import
 
-class IntcodeComputer:
+
+# Number of outputs `stream` lets an engine produce per batch
+STREAM_BATCH = 1024
+
+
+class IntcodeChannels(abc.ABC):
     """
-    Simulates an Intcode virtual machine capable of executing a list of integer instructions.
+    Input and output channels and the run API shared by the Intcode engines.
 
-    The Intcode computer supports position, immediate, and relative parameter modes.
-    It is used across many Advent of Code 2019 challenges to interpret a variety of
-    custom assembly-like programs.
+    Every engine implements the abstract `_execute`, which keeps running until it produced a number of outputs,
+    an output satisfies a predicate, input is required but not available, or the program halts.
     """
-    def __init__(self, program: List[int], inputs: List[int] = None):
+    inputs: Deque[int]
+    outputs: Deque[int]
+    halted: bool
+    paused: bool
+
+    def add_input(self, value: int) -> None:
         """
-        Initializes the IntcodeComputer with a given program and optional input list.
+        Adds an input value to the input queue.
 
         Args:
-            program (List[int]): The initial program code to load into memory.
-            inputs (List[int], optional): A list of input values to be used by the program.
+            value (int): The input value to append.
         """
-        self.memory = defaultdict(int, enumerate(program)) # Supports arbitrary program size
-        self.inputs = inputs or []
-        self.outputs = []
-        self.ptr = 0 # instruction pointer
-        self.relative_base = 0
-        self.halted = False
+        self.inputs.append(value)
         self.paused = False
 
-    def add_input(self, value: int) -> None:
+    def add_inputs(self, values: Iterable[int]) -> None:
         """
-        Adds an input value to the input queue.
+        Adds several input values to the input queue.
 
         Args:
-            value (int): The input value to append.
+            values (Iterable[int]): The input values to append, in order.
         """
-        self.inputs.append(value)
+        self.inputs.extend(values)
         self.paused = False
 
     def get_output(self) -> Optional[int]:
@@ -77,9 +85,123 @@ class IntcodeComputer:
             Optional[int]: The next output value, or None if no output is available.
         """
         if self.outputs:
-            return self.outputs.pop(0)
+            return self.outputs.popleft()
         return None
 
+    @abc.abstractmethod
+    def _execute(self, max_outputs: Optional[int], predicate: Optional[Callable[[Deque[int]], bool]]) -> int:
+        """
+        Executes the program from the current instruction pointer.
+
+        Args:
+            max_outputs (Optional[int]): Stop after this many outputs, None for no limit.
+            predicate (Optional[Callable[[Deque[int]], bool]]): Stop after an output when this returns True for the output queue.
+
+        Returns:
+            int: The number of outputs produced.
+        """
+
+    def run(self) -> Optional[int]:
+        """
+        Executes the Intcode program starting at the current instruction pointer.
+
+        Execution continues until:
+        - The program halts (opcode 99),
+        - An output is produced (opcode 4), or
+        - Input is required but not available (opcode 3).
+
+        Returns:
+            Optional[int]: The next output value if generated; otherwise, None.
+        """
+        if self._execute(1, None):
+            return self.outputs[-1]
+        return None
+
+    def run_batch(self, max_outputs: Optional[int] = None) -> List[int]:
+        """
+        Executes until `max_outputs` more outputs are produced, input is required or the program halts,
+        and drains the output queue.
+
+        Args:
+            max_outputs (Optional[int]): Maximum number of new outputs, None to run until input is required or the program halts.
+
+        Returns:
+            List[int]: All values in the output queue, oldest first.
+        """
+        self._execute(max_outputs, None)
+        values = list(self.outputs)
+        self.outputs.clear()
+        return values
+
+    def run_until(self, predicate: Callable[[Deque[int]], bool]) -> bool:
+        """
+        Executes until an output makes the predicate return True for the output queue.
+
+        Args:
+            predicate (Callable[[Deque[int]], bool]): Called with the output queue after every output.
+
+        Returns:
+            bool: True if the predicate was satisfied, False if the program halted or is waiting for input.
+        """
+        self._execute(None, predicate)
+        return not (self.halted or self.paused)
+
+    def stream(self, batch_size: int = STREAM_BATCH) -> Iterator[int]:
+        """
+        Yields the outputs of the program until it halts or requires input, the output queue is drained along the way.
+
+        Args:
+            batch_size (int): Number of outputs the engine produces in one go.
+
+        Yields:
+            int: Every output value.
+        """
+        while True:
+            yield from self.run_batch(batch_size)
+            if self.halted or self.paused:
+                return
+
+
+def negative_address(address: int, ptr: int) -> ValueError:
+    """
+    Returns the error every engine raises when a program reads, writes or jumps to a negative address.
+    Intcode memory starts at 0, and each engine would otherwise resolve -1 differently (list engines wrap around).
+
+    Args:
+        address (int): The negative address.
+        ptr (int): Address of the instruction that used it.
+
+    Returns:
+        ValueError: The error to raise.
+    """
+    return ValueError(f"Negative Intcode address {address} at instruction {ptr}")
+
+
+class ReferenceIntcodeComputer(IntcodeChannels):
+    """
+    Simulates an Intcode virtual machine capable of executing a list of integer instructions.
+
+    The Intcode computer supports position, immediate, and relative parameter modes.
+    It is used across many Advent of Code 2019 challenges to interpret a variety of
+    custom assembly-like programs.
+    """
+    def __init__(self, program: List[int], inputs: List[int] = None):
+        """
+        Initializes the IntcodeComputer with a given program and optional input list.
+
+        Args:
+            program (List[int]): The initial program code to load into memory.
+            inputs (List[int], optional): A list of input values to be used by the program.
+        """
+        self.memory = defaultdict(int, enumerate(program)) # Supports arbitrary program size
+        self.inputs = deque(inputs or [])
+        self.outputs = deque()
+        self.ptr = 0 # instruction pointer
+        self.relative_base = 0
+        self.halted = False
+        self.paused = False
+        self.counts: Optional[Counter] = None # executions per instruction address, when profiling
+
     def get_param(self, mode: int, offset: int) -> int:
         """
         Retrieves a parameter value based on its addressing mode.
@@ -93,16 +215,34 @@ class IntcodeComputer:
 
         Raises:
             Exception: If an unknown parameter mode is encountered.
+            ValueError: If the parameter points to a negative address.
         """
         if mode == 0: # position mode
-            return self.memory[self.memory[self.ptr + offset]]
+            return self.memory[self.address(self.memory[self.ptr + offset])]
         elif mode == 1: # immediate mode
             return self.memory[self.ptr + offset]
         elif mode == 2: # relative mode
-            return self.memory[self.relative_base + self.memory[self.ptr + offset]]
+            return self.memory[self.address(self.relative_base + self.memory[self.ptr + offset])]
         else:
             raise Exception(f"Unknown parameter mode: {mode}")
 
+    def address(self, address: int) -> int:
+        """
+        Checks that an address used by the current instruction isn't negative.
+
+        Args:
+            address (int): The address.
+
+        Returns:
+            int: The same address.
+
+        Raises:
+            ValueError: If the address is negative.
+        """
+        if address < 0:
+            raise negative_address(address, self.ptr)
+        return address
+
     def set_param(self, mode: int, offset: int, value: int):
         """
         Sets a value in memory based on parameter mode.
@@ -114,27 +254,30 @@ class IntcodeComputer:
 
         Raises:
             Exception: If an invalid write mode is encountered.
+            ValueError: If the parameter points to a negative address.
         """
         if mode == 0:
-            self.memory[self.memory[self.ptr + offset]] = value
+            self.memory[self.address(self.memory[self.ptr + offset])] = value
         elif mode == 2:
-            self.memory[self.relative_base + self.memory[self.ptr + offset]] = value
+            self.memory[self.address(self.relative_base + self.memory[self.ptr + offset])] = value
         else:
             raise Exception(f"Invalid write mode: {mode}")
 
-    def run(self):
+    def _execute(self, max_outputs: Optional[int], predicate: Optional[Callable[[Deque[int]], bool]]) -> int:
         """
         Executes the Intcode program starting at the current instruction pointer.
 
-        Execution continues until:
-        - The program halts (opcode 99),
-        - An output is produced (opcode 4), or
-        - Input is required but not available (opcode 3).
+        Args:
+            max_outputs (Optional[int]): Stop after this many outputs, None for no limit.
+            predicate (Optional[Callable[[Deque[int]], bool]]): Stop after an output when this returns True for the output queue.
 
         Returns:
-            Optional[int]: The next output value if generated; otherwise, None.
+            int: The number of outputs produced.
         """
+        produced = 0
         while not self.halted:
+            if self.counts is not None:
+                self.counts[self.ptr] += 1
             instr = self.memory[self.ptr]
             opcode = instr % 100
             modes = [(instr // 10 ** i) % 10 for i in range(2, 5)]
@@ -155,28 +298,29 @@ class IntcodeComputer:
                 if not self.inputs:
                     # wait for input
                     self.paused = True
-                    return None
-                self.set_param(modes[0], 1, self.inputs.pop(0))
+                    return produced
+                self.set_param(modes[0], 1, self.inputs.popleft())
                 self.ptr += 2
             elif opcode == 4: # output
-                val = self.get_param(modes[0], 1)
-                self.outputs.append(val)
+                self.outputs.append(self.get_param(modes[0], 1))
                 self.ptr += 2
-                return val
+                produced += 1
+                if produced == max_outputs or (predicate is not None and predicate(self.outputs)):
+                    return produced
             elif opcode == 5: # jump if true
-                self.ptr = self.get_param(modes[1], 2) if self.get_param(modes[0], 1) != 0 else self.ptr + 3
+                self.ptr = self.address(self.get_param(modes[1], 2)) if self.get_param(modes[0], 1) != 0 else self.ptr + 3
             elif opcode == 6: # jump if false
-                self.ptr = self.get_param(modes[1], 2) if self.get_param(modes[0], 1) == 0 else self.ptr + 3
+                self.ptr = self.address(self.get_param(modes[1], 2)) if self.get_param(modes[0], 1) == 0 else self.ptr + 3
             elif opcode == 9: # adjust relative base
                 self.relative_base += self.get_param(modes[0], 1)
                 self.ptr += 2
             elif opcode == 99: # halt
                 self.halted = True
-                return None
             else:
                 raise Exception(f"Unknown opcode: {opcode}")
+        return produced
 
-    def copy(self) -> 'IntcodeComputer':
+    def copy(self) -> 'ReferenceIntcodeComputer':
         """
         Creates a deep copy of the current state of the IntcodeComputer.
 
@@ -184,9 +328,921 @@ class IntcodeComputer:
         involving branching logic.
 
         Returns:
-            IntcodeComputer: A new instance with the same memory and state.
+            ReferenceIntcodeComputer: A new instance with the same memory and state.
+        """
+        new_computer = ReferenceIntcodeComputer([])
+        new_computer.memory = self.memory.copy()
+        new_computer.ptr = self.ptr
+        new_computer.relative_base = self.relative_base
+        new_computer.inputs = self.inputs.copy()
+        new_computer.outputs = self.outputs.copy()
+        new_computer.halted = self.halted
+        new_computer.paused = self.paused
+        return new_computer
+
+
+# Largest memory the fast engine grows to, addresses beyond it are a bug in the program
+MAX_MEMORY = 1 << 24
+
+
+def decode_instruction(word: int) -> Tuple[int, int, int, int, int]:
+    """
+    Splits an instruction into its opcode and the modes of its three parameters.
+
+    Args:
+        word (int): The instruction as stored in memory.
+
+    Returns:
+        Tuple[int, int, int, int, int]: The instruction itself (to validate cached decodings), opcode and three modes.
+    """
+    return word, word % 100, word // 100 % 10, word // 1000 % 10, word // 10000 % 10
+
+
+class FastIntcodeComputer(IntcodeChannels):
+    """
+    Intcode virtual machine tuned for speed, with the same public API as ReferenceIntcodeComputer.
+
+    - Memory is a flat list that grows (doubling) when an address beyond its end is used.
+    - Every address keeps its decoded instruction. A cached decoding is only used while the instruction
+      at that address is unchanged, so self-modifying programs (and writes to `memory` from outside) are safe.
+      Copies share the cache, as it only depends on the instruction values.
+    - `run` executes all instructions in one loop with the state in local variables.
+    """
+    def __init__(self, program: List[int], inputs: Iterable[int] = None):
+        """
+        Initializes the IntcodeComputer with a given program and optional input list.
+
+        Args:
+            program (List[int]): The initial program code to load into memory.
+            inputs (Iterable[int], optional): Input values to be used by the program.
+        """
+        self.memory: List[int] = list(program)
+        self.inputs = deque(inputs or [])
+        self.outputs = deque()
+        self.ptr = 0 # instruction pointer
+        self.relative_base = 0
+        self.halted = False
+        self.paused = False
+        self._decoded: Dict[int, Tuple[int, int, int, int, int]] = {}
+
+    def _grow(self) -> None:
+        """
+        Doubles the memory, filling it with zeros.
+        """
+        if len(self.memory) >= MAX_MEMORY:
+            raise MemoryError(f"Intcode address out of range at instruction {self.ptr}")
+        self.memory.extend([0] * max(len(self.memory), 1024))
+
+    def _execute(self, max_outputs: Optional[int], predicate: Optional[Callable[[Deque[int]], bool]]) -> int: # pylint: disable=too-many-branches,too-many-statements
+        """
+        Executes the Intcode program starting at the current instruction pointer.
+
+        Args:
+            max_outputs (Optional[int]): Stop after this many outputs, None for no limit.
+            predicate (Optional[Callable[[Deque[int]], bool]]): Stop after an output when this returns True for the output queue.
+
+        Returns:
+            int: The number of outputs produced.
+        """
+        if self.halted:
+            return 0
+
+        decoded = self._decoded
+        inputs = self.inputs
+        outputs = self.outputs
+        produced = 0
+        ptr = self.ptr
+        base = self.relative_base
+
+        while True:
+            mem = self.memory
+            try:
+                while True:
+                    entry = decoded.get(ptr)
+                    if entry is None or entry[0] != mem[ptr]:
+                        entry = decoded[ptr] = decode_instruction(mem[ptr])
+                    _, opcode, mode_a, mode_b, mode_c = entry
+
+                    # Parameters are resolved before anything is written, so an instruction that touches
+                    # an address beyond the memory can simply be retried after growing it
+                    if opcode in (1, 2, 7, 8):
+                        a = mem[ptr + 1]
+                        if mode_a == 0:
+                            if a < 0:
+                                raise negative_address(a, ptr)
+                            a = mem[a]
+                        elif mode_a == 2:
+                            a += base
+                            if a < 0:
+                                raise negative_address(a, ptr)
+                            a = mem[a]
+                        b = mem[ptr + 2]
+                        if mode_b == 0:
+                            if b < 0:
+                                raise negative_address(b, ptr)
+                            b = mem[b]
+                        elif mode_b == 2:
+                            b += base
+                            if b < 0:
+                                raise negative_address(b, ptr)
+                            b = mem[b]
+                        target = mem[ptr + 3] + base if mode_c == 2 else mem[ptr + 3]
+                        if target < 0:
+                            raise negative_address(target, ptr)
+
+                        if opcode == 1: # add
+                            mem[target] = a + b
+                        elif opcode == 2: # multiply
+                            mem[target] = a * b
+                        elif opcode == 7: # less than
+                            mem[target] = 1 if a < b else 0
+                        else: # equals
+                            mem[target] = 1 if a == b else 0
+                        ptr += 4
+                    elif opcode in (5, 6):
+                        a = mem[ptr + 1]
+                        if mode_a == 0:
+                            if a < 0:
+                                raise negative_address(a, ptr)
+                            a = mem[a]
+                        elif mode_a == 2:
+                            a += base
+                            if a < 0:
+                                raise negative_address(a, ptr)
+                            a = mem[a]
+                        if (a != 0) == (opcode == 5): # jump if true / jump if false
+                            b = mem[ptr + 2]
+                            if mode_b == 0:
+                                if b < 0:
+                                    raise negative_address(b, ptr)
+                                b = mem[b]
+                            elif mode_b == 2:
+                                b += base
+                                if b < 0:
+                                    raise negative_address(b, ptr)
+                                b = mem[b]
+                            if b < 0:
+                                raise negative_address(b, ptr)
+                            ptr = b
+                        else:
+                            ptr += 3
+                    elif opcode == 3: # input
+                        target = mem[ptr + 1] + base if mode_a == 2 else mem[ptr + 1]
+                        if target < 0:
+                            raise negative_address(target, ptr)
+                        mem[target] # pylint: disable=pointless-statement # Grow before consuming the input
+                        if not inputs:
+                            # wait for input
+                            self.ptr, self.relative_base = ptr, base
+                            self.paused = True
+                            return produced
+                        mem[target] = inputs.popleft()
+                        ptr += 2
+                    elif opcode == 4: # output
+                        a = mem[ptr + 1]
+                        if mode_a == 0:
+                            if a < 0:
+                                raise negative_address(a, ptr)
+                            a = mem[a]
+                        elif mode_a == 2:
+                            a += base
+                            if a < 0:
+                                raise negative_address(a, ptr)
+                            a = mem[a]
+                        outputs.append(a)
+                        ptr += 2
+                        produced += 1
+                        if produced == max_outputs or (predicate is not None and predicate(outputs)):
+                            self.ptr, self.relative_base = ptr, base
+                            return produced
+                    elif opcode == 9: # adjust relative base
+                        a = mem[ptr + 1]
+                        if mode_a == 0:
+                            if a < 0:
+                                raise negative_address(a, ptr)
+                            a = mem[a]
+                        elif mode_a == 2:
+                            a += base
+                            if a < 0:
+                                raise negative_address(a, ptr)
+                            a = mem[a]
+                        base += a
+                        ptr += 2
+                    elif opcode == 99: # halt
+                        self.ptr, self.relative_base = ptr, base
+                        self.halted = True
+                        return produced
+                    else:
+                        raise ValueError(f"Unknown opcode: {opcode}")
+            except IndexError:
+                self.ptr = ptr
+                self._grow()
+
+    def copy(self) -> 'FastIntcodeComputer':
+        """
+        Creates a deep copy of the current state of the IntcodeComputer.
+
+        Useful for saving state or exploring multiple paths in problems
+        involving branching logic.
+
+        Returns:
+            FastIntcodeComputer: A new instance with the same memory and state.
+        """
+        new_computer = FastIntcodeComputer([])
+        new_computer.memory = self.memory.copy()
+        new_computer.ptr = self.ptr
+        new_computer.relative_base = self.relative_base
+        new_computer.inputs = self.inputs.copy()
+        new_computer.outputs = self.outputs.copy()
+        new_computer.halted = self.halted
+        new_computer.paused = self.paused
+        new_computer._decoded = self._decoded # pylint: disable=protected-access
+        return new_computer
+
+
+# Snapshot memory pages hold 2 ** PAGE_BITS words
+PAGE_BITS = 8
+PAGE_SIZE = 1 << PAGE_BITS
+PAGE_MASK = PAGE_SIZE - 1
+
+
+class PagedMemory:
+    """
+    List-like view on the memory pages of a SnapshotIntcodeComputer, writes go through copy-on-write.
+    Unlike a list, negative addresses are rejected instead of counting from the end.
+    """
+    def __init__(self, computer: 'SnapshotIntcodeComputer'):
+        self.computer = computer
+
+    def __len__(self) -> int:
+        return len(self.computer.pages) << PAGE_BITS
+
+    def __getitem__(self, address: int) -> int:
+        if address < 0:
+            raise negative_address(address, self.computer.ptr)
+        return self.computer.pages[address >> PAGE_BITS][address & PAGE_MASK]
+
+    def __setitem__(self, address: int, value: int) -> None:
+        if address < 0:
+            raise negative_address(address, self.computer.ptr)
+        self.computer.write(address, value)
+
+
+class SnapshotIntcodeComputer(FastIntcodeComputer):
+    """
+    Fast Intcode engine whose copies are cheap snapshots.
+
+    Memory is split into pages that copies share. A computer copies a page the first time it writes to it
+    while the page is shared, so forking a paused computer costs a list of page references, and every
+    branch only pays for the pages it actually changes.
+    """
+    def __init__(self, program: List[int], inputs: Iterable[int] = None): # pylint: disable=super-init-not-called
+        """
+        Initializes the IntcodeComputer with a given program and optional input list.
+
+        Args:
+            program (List[int]): The initial program code to load into memory.
+            inputs (Iterable[int], optional): Input values to be used by the program.
+        """
+        self.pages: List[List[int]] = []
+        for start in range(0, max(len(program), 1), PAGE_SIZE):
+            page = list(program[start:start + PAGE_SIZE])
+            self.pages.append(page + [0] * (PAGE_SIZE - len(page)))
+        self.owned: List[bool] = [True] * len(self.pages) # pages no other computer refers to
+        self.inputs = deque(inputs or [])
+        self.outputs = deque()
+        self.ptr = 0 # instruction pointer
+        self.relative_base = 0
+        self.halted = False
+        self.paused = False
+        self._decoded: Dict[int, Tuple[int, int, int, int, int]] = {}
+
+    @property
+    def memory(self) -> PagedMemory:
+        """
+        The memory as a list-like object.
+        """
+        return PagedMemory(self)
+
+    def write(self, address: int, value: int) -> None:
+        """
+        Writes a value to memory, copying the page first when it is shared.
+
+        Args:
+            address (int): The memory address.
+            value (int): The value to store.
+        """
+        index = address >> PAGE_BITS
+        while index >= len(self.pages):
+            self._grow()
+        page = self.pages[index]
+        if not self.owned[index]:
+            page = self.pages[index] = page.copy()
+            self.owned[index] = True
+        page[address & PAGE_MASK] = value
+
+    def _grow(self) -> None:
+        """
+        Doubles the number of pages, adding pages of zeros.
+        """
+        if len(self.pages) << PAGE_BITS >= MAX_MEMORY:
+            raise MemoryError(f"Intcode address out of range at instruction {self.ptr}")
+        count = len(self.pages)
+        self.pages.extend([0] * PAGE_SIZE for _ in range(count))
+        self.owned.extend([True] * count)
+
+    def _execute(self, max_outputs: Optional[int], predicate: Optional[Callable[[Deque[int]], bool]]) -> int: # pylint: disable=too-many-branches,too-many-statements
+        """
+        Executes the Intcode program starting at the current instruction pointer.
+
+        Args:
+            max_outputs (Optional[int]): Stop after this many outputs, None for no limit.
+            predicate (Optional[Callable[[Deque[int]], bool]]): Stop after an output when this returns True for the output queue.
+
+        Returns:
+            int: The number of outputs produced.
+        """
+        if self.halted:
+            return 0
+
+        decoded = self._decoded
+        inputs = self.inputs
+        outputs = self.outputs
+        produced = 0
+        write = self.write
+        ptr = self.ptr
+        base = self.relative_base
+
+        while True:
+            pages = self.pages
+            try:
+                while True:
+                    word = pages[ptr >> PAGE_BITS][ptr & PAGE_MASK]
+                    entry = decoded.get(ptr)
+                    if entry is None or entry[0] != word:
+                        entry = decoded[ptr] = decode_instruction(word)
+                    _, opcode, mode_a, mode_b, mode_c = entry
+
+                    # Parameters are resolved before anything is written, so an instruction that touches
+                    # an address beyond the memory can simply be retried after growing it
+                    address = ptr + 1
+                    a = pages[address >> PAGE_BITS][address & PAGE_MASK]
+                    if opcode in (1, 2, 7, 8):
+                        if mode_a != 1:
+                            address = a + base if mode_a == 2 else a
+                            if address < 0:
+                                raise negative_address(address, ptr)
+                            a = pages[address >> PAGE_BITS][address & PAGE_MASK]
+                        address = ptr + 2
+                        b = pages[address >> PAGE_BITS][address & PAGE_MASK]
+                        if mode_b != 1:
+                            address = b + base if mode_b == 2 else b
+                            if address < 0:
+                                raise negative_address(address, ptr)
+                            b = pages[address >> PAGE_BITS][address & PAGE_MASK]
+                        address = ptr + 3
+                        target = pages[address >> PAGE_BITS][address & PAGE_MASK]
+                        if mode_c == 2:
+                            target += base
+                        if target < 0:
+                            raise negative_address(target, ptr)
+
+                        if opcode == 1: # add
+                            write(target, a + b)
+                        elif opcode == 2: # multiply
+                            write(target, a * b)
+                        elif opcode == 7: # less than
+                            write(target, 1 if a < b else 0)
+                        else: # equals
+                            write(target, 1 if a == b else 0)
+                        ptr += 4
+                    elif opcode in (5, 6):
+                        if mode_a != 1:
+                            address = a + base if mode_a == 2 else a
+                            if address < 0:
+                                raise negative_address(address, ptr)
+                            a = pages[address >> PAGE_BITS][address & PAGE_MASK]
+                        if (a != 0) == (opcode == 5): # jump if true / jump if false
+                            address = ptr + 2
+                            b = pages[address >> PAGE_BITS][address & PAGE_MASK]
+                            if mode_b != 1:
+                                address = b + base if mode_b == 2 else b
+                                if address < 0:
+                                    raise negative_address(address, ptr)
+                                b = pages[address >> PAGE_BITS][address & PAGE_MASK]
+                            if b < 0:
+                                raise negative_address(b, ptr)
+                            ptr = b
+                        else:
+                            ptr += 3
+                    elif opcode == 3: # input
+                        if not inputs:
+                            # wait for input
+                            self.ptr, self.relative_base = ptr, base
+                            self.paused = True
+                            return produced
+                        target = a + base if mode_a == 2 else a
+                        if target < 0:
+                            raise negative_address(target, ptr)
+                        write(target, inputs.popleft())
+                        ptr += 2
+                    elif opcode == 4: # output
+                        if mode_a != 1:
+                            address = a + base if mode_a == 2 else a
+                            if address < 0:
+                                raise negative_address(address, ptr)
+                            a = pages[address >> PAGE_BITS][address & PAGE_MASK]
+                        outputs.append(a)
+                        ptr += 2
+                        produced += 1
+                        if produced == max_outputs or (predicate is not None and predicate(outputs)):
+                            self.ptr, self.relative_base = ptr, base
+                            return produced
+                    elif opcode == 9: # adjust relative base
+                        if mode_a != 1:
+                            address = a + base if mode_a == 2 else a
+                            if address < 0:
+                                raise negative_address(address, ptr)
+                            a = pages[address >> PAGE_BITS][address & PAGE_MASK]
+                        base += a
+                        ptr += 2
+                    elif opcode == 99: # halt
+                        self.ptr, self.relative_base = ptr, base
+                        self.halted = True
+                        return produced
+                    else:
+                        raise ValueError(f"Unknown opcode: {opcode}")
+            except IndexError:
+                self.ptr = ptr
+                self._grow()
+
+    def copy(self) -> 'SnapshotIntcodeComputer':
+        """
+        Creates a snapshot of the current state of the IntcodeComputer.
+
+        The snapshot shares all memory pages with this computer, whichever of the two writes
+        to a page first gets its own copy of it.
+
+        Returns:
+            SnapshotIntcodeComputer: A new instance with the same memory and state.
+        """
+        new_computer = SnapshotIntcodeComputer([])
+        new_computer.pages = self.pages.copy()
+        self.owned = [False] * len(self.pages)
+        new_computer.owned = self.owned.copy()
+        new_computer.ptr = self.ptr
+        new_computer.relative_base = self.relative_base
+        new_computer.inputs = self.inputs.copy()
+        new_computer.outputs = self.outputs.copy()
+        new_computer.halted = self.halted
+        new_computer.paused = self.paused
+        new_computer._decoded = self._decoded
+        return new_computer
+
+
+# Set AOC_INTCODE_ENGINE=reference to run every solution on the reference engine
+REFERENCE_ENGINE = os.environ.get("AOC_INTCODE_ENGINE") == "reference"
+
+
+def intcode_engine(engine: type) -> type:
+    """
+    Returns the engine a solution runs on: the given engine, or the reference engine when AOC_INTCODE_ENGINE=reference.
+    Solutions that pick a specialised engine go through this too, so a reference run covers every Intcode day.
+
+    Args:
+        engine (type): The engine the solution is written for.
+
+    Returns:
+        type: The engine class to instantiate.
+    """
+    return ReferenceIntcodeComputer if REFERENCE_ENGINE else engine
+
+
+IntcodeComputer = intcode_engine(FastIntcodeComputer)
+
+
+def compare_engines(program: List[int], inputs: Iterable[int] = (), max_outputs: int = 1_000_000,
+                    engine: type = FastIntcodeComputer) -> Optional[str]:
+    """
+    Runs a program on the reference engine and another engine with the same inputs and compares them after every output.
+
+    Args:
+        program (List[int]): The Intcode program.
+        inputs (Iterable[int]): The input values, all available from the start.
+        max_outputs (int): Stop comparing after this many outputs.
+        engine (type): The engine to check against the reference engine.
+
+    Returns:
+        Optional[str]: A description of the first difference, or None when both engines behave the same.
+    """
+    inputs = list(inputs)
+    reference = ReferenceIntcodeComputer(program, inputs.copy())
+    other = engine(program, inputs)
+
+    for step in range(max_outputs):
+        expected, actual = reference.run(), other.run()
+        if expected != actual:
+            return f"Output {step}: expected {expected}, got {actual}"
+        if (reference.halted, reference.paused) != (other.halted, other.paused):
+            return f"Output {step}: expected halted={reference.halted} paused={reference.paused}, got halted={other.halted} paused={other.paused}"
+        if reference.halted or reference.paused:
+            break
+
+    expected_memory = [reference.memory[address] for address in range(max(reference.memory) + 1)]
+    actual_memory = list(other.memory)
+    actual_memory += [0] * (len(expected_memory) - len(actual_memory))
+    if expected_memory != actual_memory[:len(expected_memory)] or any(actual_memory[len(expected_memory):]):
+        return "Memory differs after the run"
+    return None
+
+
+class IntcodeNetwork:
+    """
+    Runs a group of Intcode computers whose outputs are wired into the inputs of other computers.
+
+    Computers are scheduled cooperatively from a ready queue: a scheduled computer runs until it halts
+    or needs input, its outputs are delivered to the computers it is connected to, and every receiver
+    that isn't queued yet is queued. The network is quiescent when the queue runs empty, every computer
+    has then halted or is waiting for input nobody will send.
+    """
+    def __init__(self, computers: List[IntcodeChannels]):
+        """
+        Args:
+            computers (List[IntcodeChannels]): The computers, identified by their index.
+        """
+        self.computers = computers
+        self.links: List[List[int]] = [[] for _ in computers]
+        self.outputs: List[List[int]] = [[] for _ in computers] # everything each computer sent
+
+    def connect(self, source: int, target: int) -> None:
         """
-        new_computer = IntcodeComputer([])
+        Delivers every output of the source computer to the input of the target computer.
+
+        Args:
+            source (int): Index of the sending computer.
+            target (int): Index of the receiving computer.
+        """
+        self.links[source].append(target)
+
+    def run(self) -> None:
+        """
+        Runs the computers until the network is quiescent.
+        """
+        computers = self.computers
+        ready = deque(index for index, computer in enumerate(computers) if not computer.halted)
+        queued = [False] * len(computers)
+        for index in ready:
+            queued[index] = True
+
+        while ready:
+            index = ready.popleft()
+            queued[index] = False
+            values = computers[index].run_batch()
+            if not values:
+                continue
+
+            self.outputs[index].extend(values)
+            for target in self.links[index]:
+                receiver = computers[target]
+                receiver.add_inputs(values)
+                if not queued[target] and not receiver.halted:
+                    ready.append(target)
+                    queued[target] = True
+
+
+def parallel_map(func: Callable[[Any], Any], items: Iterable[Any], workers: Optional[int] = None, chunk_size: int = 8) -> List[Any]:
+    """
+    Applies a function to every item on a process pool and returns the results in order.
+    Runs in this process with a single worker, or when this process can't have children (daemonic processes).
+
+    Args:
+        func (Callable[[Any], Any]): A module level (picklable) function, e.g. a functools.partial of one.
+        items (Iterable[Any]): The arguments.
+        workers (Optional[int]): Number of processes, defaults to the core count.
+        chunk_size (int): Number of items sent to a worker at once.
+
+    Returns:
+        List[Any]: The result for every item.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or multiprocessing.current_process().daemon:
+        return list(map(func, items))
+    with multiprocessing.Pool(workers) as pool:
+        return pool.map(func, items, chunk_size)
+
+
+# Mnemonic and parameter count of every opcode
+INSTRUCTIONS = {
+    1: ("add", 3),
+    2: ("mul", 3),
+    3: ("in", 1),
+    4: ("out", 1),
+    5: ("jnz", 2),
+    6: ("jz", 2),
+    7: ("lt", 3),
+    8: ("eq", 3),
+    9: ("arb", 1),
+    99: ("halt", 0),
+}
+
+
+def format_parameter(mode: int, value: int) -> str:
+    """
+    Formats a parameter for the disassembly: [address], value or [rb+offset].
+
+    Args:
+        mode (int): The parameter mode.
+        value (int): The parameter as stored in memory.
+
+    Returns:
+        str: The formatted parameter.
+    """
+    if mode == 0:
+        return f"[{value}]"
+    if mode == 1:
+        return str(value)
+    return f"[rb{value:+d}]"
+
+
+def disassemble(program: List[int], start: int = 0, stop: Optional[int] = None) -> List[Tuple[int, str]]:
+    """
+    Disassembles a program by reading it as consecutive instructions.
+    Words that don't form a valid instruction are listed as data.
+
+    Args:
+        program (List[int]): The Intcode program.
+        start (int): Address to start at.
+        stop (Optional[int]): Address to stop before, defaults to the end of the program.
+
+    Returns:
+        List[Tuple[int, str]]: The address and text of every instruction.
+    """
+    stop = len(program) if stop is None else min(stop, len(program))
+    lines = []
+    address = start
+    while address < stop:
+        word = program[address]
+        name, count = INSTRUCTIONS.get(word % 100, (None, 0))
+        modes = [word // 10 ** digit % 10 for digit in range(2, 2 + count)]
+        if name is None or address + count >= stop or any(mode > 2 for mode in modes):
+            lines.append((address, f"data {word}"))
+            address += 1
+            continue
+
+        parameters = [format_parameter(mode, program[address + 1 + i]) for i, mode in enumerate(modes)]
+        lines.append((address, " ".join([name] + parameters)))
+        address += count + 1
+    return lines
+
+
+def profile_program(program: List[int], inputs: Iterable[int] = ()) -> Counter:
+    """
+    Runs a program on the reference engine until it halts or needs more input,
+    counting how often every instruction is executed.
+
+    Args:
+        program (List[int]): The Intcode program.
+        inputs (Iterable[int]): The input values.
+
+    Returns:
+        Counter: Number of executions per instruction address.
+    """
+    computer = ReferenceIntcodeComputer(program, list(inputs))
+    computer.counts = Counter()
+    computer.run_batch()
+    return computer.counts
+
+
+def format_profile(program: List[int], counts: Counter, top: int = 20) -> str:
+    """
+    Lists the most executed instructions of a profile together with their disassembly.
+
+    Args:
+        program (List[int]): The Intcode program.
+        counts (Counter): Number of executions per instruction address, see `profile_program`.
+        top (int): Number of instructions to list.
+
+    Returns:
+        str: One line per instruction: executions, address and instruction.
+    """
+    lines = []
+    for address, count in counts.most_common(top):
+        text = disassemble(program, address, address + 4)[0][1] if address < len(program) else "(beyond program)"
+        lines.append(f"{count:>10} {address:>6}: {text}")
+    return "\n".join(lines)
+
+
+# Statuses returned by compiled blocks
+BLOCK_DONE = 0 # continue at the returned address
+BLOCK_GROW = 1 # an address beyond the memory was used, retry at the returned address after growing it
+BLOCK_STALE = 2 # the code of the block was overwritten, recompile it
+
+# Longest straight-line run of instructions compiled into one block
+MAX_BLOCK_INSTRUCTIONS = 256
+
+# Compiled blocks per program (hash of the initial memory) and address
+_BLOCK_CACHE: Dict[int, Dict[int, Callable[[List[int], int], Tuple[int, int, int]]]] = {}
+
+
+# Value an arithmetic or comparison instruction writes, in terms of its parameters a and b
+ARITHMETIC = {1: "a + b", 2: "a * b", 7: "1 if a < b else 0", 8: "1 if a == b else 0"}
+
+
+def _address_statements(name: str, mode: int, address: int) -> List[str]:
+    """
+    Returns the Python statements that store the address a parameter stored at an address points to in `name`,
+    rejecting negative addresses.
+    """
+    return [
+        f"{name} = mem[{address}]" if mode == 0 else f"{name} = base + mem[{address}]",
+        f"if {name} < 0:",
+        f"    raise negative_address({name}, at)",
+    ]
+
+
+def _read_statements(name: str, mode: int, address: int) -> List[str]:
+    """
+    Returns the Python statements that read a parameter stored at an address into `name`.
+    """
+    if mode == 1:
+        return [f"{name} = mem[{address}]"]
+    return _address_statements(name, mode, address) + [f"{name} = mem[{name}]"]
+
+
+def compile_block(memory: List[int], start: int) -> Optional[Callable[[List[int], int], Tuple[int, int, int]]]:
+    """
+    Compiles the straight-line code at an address into a Python function.
+
+    A block runs arithmetic, comparisons and relative base adjustments up to and including the first jump,
+    and stops before input, output, halt and anything that isn't a valid instruction.
+    Parameters are read from memory when the block runs, so only the instruction words themselves are
+    baked into the function: the block checks them on entry, and leaves early when it writes to one of
+    its own later instructions.
+
+    The function takes the memory and relative base, and returns the next instruction pointer,
+    the relative base and a BLOCK_* status.
+
+    Args:
+        memory (List[int]): The memory holding the code.
+        start (int): Address of the first instruction.
+
+    Returns:
+        Optional[Callable[[List[int], int], Tuple[int, int, int]]]: The block, or None when the instruction at start can't be compiled.
+    """
+    instructions = []
+    address = start
+    while address < len(memory) and len(instructions) < MAX_BLOCK_INSTRUCTIONS:
+        word, opcode, mode_a, mode_b, mode_c = decode_instruction(memory[address])
+        if opcode not in (1, 2, 5, 6, 7, 8, 9) or max(mode_a, mode_b, mode_c) > 2 or (opcode in (1, 2, 7, 8) and mode_c == 1):
+            break
+        instructions.append((address, word, opcode, mode_a, mode_b, mode_c))
+        if opcode in (5, 6):
+            break
+        address += 4 if opcode != 9 else 2
+    if not instructions:
+        return None
+    end = address
+
+    guard = " or ".join(f"mem[{address}] != {word}" for address, word, *_ in instructions)
+    lines = [
+        "def block(mem, base):",
+        f"    if {guard}:",
+        f"        return {start}, base, {BLOCK_STALE}",
+        "    try:",
+    ]
+    for index, (address, _, opcode, mode_a, mode_b, mode_c) in enumerate(instructions):
+        body = [f"at = {address}"] + _read_statements("a", mode_a, address + 1)
+        if opcode in (1, 2, 7, 8):
+            body += _read_statements("b", mode_b, address + 2)
+            body += _address_statements("target", mode_c, address + 3)
+            body.append(f"mem[target] = {ARITHMETIC[opcode]}")
+            later = [later_address for later_address, *_ in instructions[index + 1:]]
+            if later:
+                body.append(f"if target in {set(later)}:")
+                body.append(f"    return {address + 4}, base, {BLOCK_DONE}")
+        elif opcode in (5, 6):
+            body.append("if a != 0:" if opcode == 5 else "if a == 0:")
+            body += ["    " + line for line in _read_statements("b", mode_b, address + 2)]
+            body += ["    if b < 0:", "        raise negative_address(b, at)", f"    return b, base, {BLOCK_DONE}"]
+            body.append(f"return {address + 3}, base, {BLOCK_DONE}")
+        else:
+            body.append("base += a")
+        lines += ["        " + line for line in body]
+    lines.append("    except IndexError:")
+    lines.append(f"        return at, base, {BLOCK_GROW}")
+    lines.append(f"    return {end}, base, {BLOCK_DONE}")
+
+    namespace = {"negative_address": negative_address}
+    exec(compile("\n".join(lines), f"<intcode block {start}>", "exec"), namespace) # pylint: disable=exec-used
+    return namespace["block"]
+
+
+class CompiledIntcodeComputer(FastIntcodeComputer):
+    """
+    Intcode engine that runs compiled blocks of straight-line code, see `compile_block`.
+
+    Blocks are compiled the first time their address is reached and cached per program, so every
+    computer created from the same program reuses them. Blocks check their code on entry, which keeps
+    them valid when the memory changes, e.g. a different noun and verb or self-modifying code.
+    Input, output and halt are interpreted.
+    """
+    def __init__(self, program: List[int], inputs: Iterable[int] = None):
+        """
+        Initializes the IntcodeComputer with a given program and optional input list.
+
+        Args:
+            program (List[int]): The initial program code to load into memory.
+            inputs (Iterable[int], optional): Input values to be used by the program.
+        """
+        super().__init__(program, inputs)
+        self._blocks = _BLOCK_CACHE.setdefault(hash(tuple(program)), {})
+
+    def _execute(self, max_outputs: Optional[int], predicate: Optional[Callable[[Deque[int]], bool]]) -> int: # pylint: disable=too-many-branches
+        """
+        Executes the Intcode program starting at the current instruction pointer.
+
+        Args:
+            max_outputs (Optional[int]): Stop after this many outputs, None for no limit.
+            predicate (Optional[Callable[[Deque[int]], bool]]): Stop after an output when this returns True for the output queue.
+
+        Returns:
+            int: The number of outputs produced.
+        """
+        if self.halted:
+            return 0
+
+        blocks = self._blocks
+        mem = self.memory
+        inputs = self.inputs
+        outputs = self.outputs
+        produced = 0
+        ptr = self.ptr
+        base = self.relative_base
+
+        while True:
+            block = blocks.get(ptr)
+            if block is not None:
+                ptr, base, status = block(mem, base)
+                if status == BLOCK_DONE:
+                    continue
+                if status == BLOCK_GROW:
+                    self.ptr = ptr
+                    self._grow()
+                    continue
+
+            try:
+                word = mem[ptr]
+                opcode, mode_a = word % 100, word // 100 % 10
+                if opcode == 3: # input
+                    target = mem[ptr + 1] + base if mode_a == 2 else mem[ptr + 1]
+                    if target < 0:
+                        raise negative_address(target, ptr)
+                    mem[target] # pylint: disable=pointless-statement # Grow before consuming the input
+                    if not inputs:
+                        # wait for input
+                        self.ptr, self.relative_base = ptr, base
+                        self.paused = True
+                        return produced
+                    mem[target] = inputs.popleft()
+                    ptr += 2
+                elif opcode == 4: # output
+                    a = mem[ptr + 1]
+                    if mode_a == 0:
+                        if a < 0:
+                            raise negative_address(a, ptr)
+                        a = mem[a]
+                    elif mode_a == 2:
+                        a += base
+                        if a < 0:
+                            raise negative_address(a, ptr)
+                        a = mem[a]
+                    outputs.append(a)
+                    ptr += 2
+                    produced += 1
+                    if produced == max_outputs or (predicate is not None and predicate(outputs)):
+                        self.ptr, self.relative_base = ptr, base
+                        return produced
+                elif opcode == 99: # halt
+                    self.ptr, self.relative_base = ptr, base
+                    self.halted = True
+                    return produced
+                else:
+                    block = compile_block(mem, ptr)
+                    if block is None:
+                        raise ValueError(f"Unknown opcode: {opcode}")
+                    blocks[ptr] = block
+            except IndexError:
+                self.ptr = ptr
+                self._grow()
+
+    def copy(self) -> 'CompiledIntcodeComputer':
+        """
+        Creates a deep copy of the current state of the IntcodeComputer.
+
+        Returns:
+            CompiledIntcodeComputer: A new instance with the same memory and state.
+        """
+        new_computer = CompiledIntcodeComputer([])
         new_computer.memory = self.memory.copy()
         new_computer.ptr = self.ptr
         new_computer.relative_base = self.relative_base
@@ -194,4 +1250,213 @@ class IntcodeComputer:
         new_computer.outputs = self.outputs.copy()
         new_computer.halted = self.halted
         new_computer.paused = self.paused
+        new_computer._decoded = self._decoded
+        new_computer._blocks = self._blocks
         return new_computer
+
+
+class Polynomial:
+    """
+    Polynomial with integer coefficients in the variables x0, x1, ...
+
+    Terms map a monomial, the sorted tuple of the indices of its variables (x0 * x1 ** 2 is (0, 1, 1)),
+    to its coefficient. The constant term is the empty tuple.
+    """
+    __slots__ = ("terms",)
+
+    def __init__(self, terms: Dict[Tuple[int, ...], int]):
+        self.terms = {monomial: coefficient for monomial, coefficient in terms.items() if coefficient}
+
+    @classmethod
+    def variable(cls, index: int) -> 'Polynomial':
+        """
+        Returns the polynomial x<index>.
+        """
+        return cls({(index,): 1})
+
+    @classmethod
+    def lift(cls, value: Union[int, 'Polynomial']) -> 'Polynomial':
+        """
+        Returns a value as a polynomial, integers become constants.
+        """
+        return value if isinstance(value, Polynomial) else cls({(): value})
+
+    def __add__(self, other: Union[int, 'Polynomial']) -> 'Polynomial':
+        terms = self.terms.copy()
+        for monomial, coefficient in Polynomial.lift(other).terms.items():
+            terms[monomial] = terms.get(monomial, 0) + coefficient
+        return Polynomial(terms)
+
+    __radd__ = __add__
+
+    def __sub__(self, other: Union[int, 'Polynomial']) -> 'Polynomial':
+        return self + Polynomial.lift(other) * -1
+
+    def __mul__(self, other: Union[int, 'Polynomial']) -> 'Polynomial':
+        terms = {}
+        for monomial, coefficient in self.terms.items():
+            for other_monomial, other_coefficient in Polynomial.lift(other).terms.items():
+                product = tuple(sorted(monomial + other_monomial))
+                terms[product] = terms.get(product, 0) + coefficient * other_coefficient
+        return Polynomial(terms)
+
+    __rmul__ = __mul__
+
+    def __repr__(self) -> str:
+        if not self.terms:
+            return "0"
+        return " + ".join(f"{coefficient}" + "".join(f"*x{index}" for index in monomial) for monomial, coefficient in sorted(self.terms.items()))
+
+    def constant(self) -> Optional[int]:
+        """
+        Returns the value of a constant polynomial, None if it depends on a variable.
+        """
+        if any(self.terms.keys() - {()}):
+            return None
+        return self.terms.get((), 0)
+
+    def substitute(self, values: Dict[int, int]) -> 'Polynomial':
+        """
+        Replaces variables with values.
+
+        Args:
+            values (Dict[int, int]): Value per variable index.
+
+        Returns:
+            Polynomial: The polynomial in the remaining variables.
+        """
+        terms = {}
+        for monomial, coefficient in self.terms.items():
+            remaining = []
+            for index in monomial:
+                if index in values:
+                    coefficient *= values[index]
+                else:
+                    remaining.append(index)
+            terms[tuple(remaining)] = terms.get(tuple(remaining), 0) + coefficient
+        return Polynomial(terms)
+
+    def solve(self, index: int, target: int, candidates: range) -> List[int]:
+        """
+        Finds the values of a variable among candidates for which the polynomial equals the target.
+        The polynomial may only depend on that variable. Linear equations are solved directly,
+        higher degrees are evaluated at every candidate.
+
+        Args:
+            index (int): The variable to solve for.
+            target (int): The value the polynomial should take.
+            candidates (range): The allowed values of the variable.
+
+        Returns:
+            List[int]: The solutions, in candidate order.
+        """
+        powers: Dict[int, int] = defaultdict(int)
+        for monomial, coefficient in self.terms.items():
+            if any(variable != index for variable in monomial):
+                raise ValueError(f"{self} depends on other variables than x{index}")
+            powers[len(monomial)] += coefficient
+
+        if max(powers, default=0) <= 1:
+            slope, offset = powers[1], powers[0] - target
+            if slope == 0:
+                return list(candidates) if offset == 0 else []
+            value, remainder = divmod(-offset, slope)
+            return [value] if remainder == 0 and value in candidates else []
+        return [value for value in candidates if sum(coefficient * value ** power for power, coefficient in powers.items()) == target]
+
+
+class SymbolicDependency(Exception):
+    """
+    Raised when symbolic execution needs the concrete value of something that depends on a variable.
+    """
+
+
+def symbolic_execute(program: List[int], variables: Dict[int, int], max_steps: int = 1_000_000) -> Optional[List[Union[int, Polynomial, None]]]:
+    """
+    Runs a program with some memory cells replaced by variables, computing with polynomials where they are involved.
+
+    Additions and multiplications build polynomials, everything that decides where the program goes must stay concrete:
+    instructions, write addresses, jump conditions, comparisons and the relative base. The run is abandoned (None) when
+    one of those depends on a variable, when the program needs input, or when it doesn't halt within max_steps,
+    the caller then falls back to concrete execution.
+    A read from an address that depends on a variable gives an unknown value (None). That is fine as long as the
+    value is overwritten or never needed, like the `1,noun,verb,3` instruction at the start of 2019 day 2.
+
+    Args:
+        program (List[int]): The Intcode program.
+        variables (Dict[int, int]): Variable index per memory address, e.g. {1: 0, 2: 1} for noun x0 and verb x1.
+        max_steps (int): Maximum number of instructions to execute.
+
+    Returns:
+        Optional[List[Union[int, Polynomial, None]]]: The memory after the program halted, cells depending on variables
+        hold a Polynomial, unknown cells hold None.
+    """
+    memory: List[Union[int, Polynomial, None]] = list(program)
+    for address, index in variables.items():
+        memory[address] = Polynomial.variable(index)
+
+    def concrete(value: Union[int, Polynomial, None]) -> int:
+        if value is None:
+            raise SymbolicDependency
+        if isinstance(value, Polynomial):
+            value = value.constant()
+            if value is None:
+                raise SymbolicDependency
+        return value
+
+    def address_of(mode: int, address: int) -> Optional[int]:
+        if mode == 1:
+            return address
+        try:
+            target = concrete(memory[address]) + (base if mode == 2 else 0)
+        except SymbolicDependency:
+            return None
+        if target < 0:
+            raise SymbolicDependency
+        if target >= len(memory):
+            memory.extend([0] * (target + 1 - len(memory)))
+        return target
+
+    ptr, base = 0, 0
+    try:
+        for _ in range(max_steps):
+            _, opcode, mode_a, mode_b, mode_c = decode_instruction(concrete(memory[ptr]))
+            if opcode == 99:
+                return memory
+            if opcode in (3, 4) or opcode not in INSTRUCTIONS:
+                return None
+            count = INSTRUCTIONS[opcode][1]
+            modes = (mode_a, mode_b, mode_c)[:count]
+            if any(mode > 2 for mode in modes) or (count == 3 and mode_c == 1):
+                return None
+            if ptr + count >= len(memory):
+                memory.extend([0] * (ptr + count + 1 - len(memory)))
+
+            parameters = [address_of(mode, ptr + offset) for offset, mode in enumerate(modes, 1)]
+            values = [None if address is None else memory[address] for address in parameters]
+            if count == 3 and parameters[2] is None:
+                raise SymbolicDependency
+
+            if opcode in (1, 2):
+                a, b = values[0], values[1]
+                if a is None or b is None:
+                    result = None
+                else:
+                    result = a + b if opcode == 1 else a * b
+                    if isinstance(result, Polynomial) and result.constant() is not None:
+                        result = result.constant()
+                memory[parameters[2]] = result
+                ptr += 4
+            elif opcode in (7, 8):
+                a, b = concrete(values[0]), concrete(values[1])
+                memory[parameters[2]] = int(a < b) if opcode == 7 else int(a == b)
+                ptr += 4
+            elif opcode in (5, 6):
+                condition = concrete(values[0])
+                ptr = concrete(values[1]) if (condition != 0) == (opcode == 5) else ptr + 3
+            else: # adjust relative base
+                base += concrete(values[0])
+                ptr += 2
+    except SymbolicDependency:
+        return None
+    return None
@@ -10,7 +10,10 @@ Answer: 1688
 """
 
 from typing import List, Tuple
+from utils import Op
+from utils import Program
 from utils import profiler
+from utils import repair_search
 
 
 def load_instructions(file_path: str) -> List[Tuple[str, int]]:
@@ -29,34 +32,42 @@ def load_instructions(file_path: str) -> List[Tuple[str, int]]:
         return [(line[:3], int(line[4:])) for line in file]
 
 
-def execute_instructions(instructions: List[Tuple[str, int]]) -> Tuple[int, bool]:
+def compile_instructions(instructions: List[Tuple[str, int]]) -> Program:
     """
-    Executes the instructions and returns the accumulator value and whether the program terminates.
+    Compiles the boot code into register machine code with a single register, the accumulator.
 
     Args:
         instructions (list[tuple]): A list of instruction tuples.
 
     Returns:
-        tuple: The accumulator value and a boolean indicating if the program terminates normally.
+        Program: The compiled program.
     """
-    acc = 0
-    pointer = 0
-    visited = set()
-
-    while pointer < len(instructions):
-        if pointer in visited:
-            return acc, False
-        visited.add(pointer)
-        op, arg = instructions[pointer]
+    program = Program(["acc"])
+    acc = program.slots["acc"]
+    for pointer, (op, arg) in enumerate(instructions):
+        program.begin()
         if op == "acc":
-            acc += arg
-            pointer += 1
+            program.emit(Op.ADD, acc, acc, program.constant(arg))
         elif op == "jmp":
-            pointer += arg
+            program.jump(Op.JMP, pointer + arg)
         else: # "nop"
-            pointer += 1
+            program.emit(Op.NOP)
+    return program.finish()
 
-    return acc, True
+
+def execute_instructions(instructions: List[Tuple[str, int]]) -> Tuple[int, bool]:
+    """
+    Executes the instructions and returns the accumulator value and whether the program terminates.
+    The run stops just before an instruction would be executed a second time.
+
+    Args:
+        instructions (list[tuple]): A list of instruction tuples.
+
+    Returns:
+        tuple: The accumulator value and a boolean indicating if the program terminates normally.
+    """
+    execution = compile_instructions(instructions).run(detect_loop=True)
+    return execution.registers[0], not execution.looped
 
 
 @profiler
@@ -77,8 +88,8 @@ def part_one(instructions: List[Tuple[str, int]]) -> int:
 @profiler
 def part_two(instructions: List[Tuple[str, int]]) -> int:
     """
-    Attempts to fix the infinite loop by switching one 'jmp' to 'nop' or 'nop' to 'jmp',
-    then executes the modified program. Returns the accumulator value if the program terminates.
+    Fixes the infinite loop by switching one 'jmp' to 'nop' or 'nop' to 'jmp', found by a repair search
+    over the compiled program, and returns the accumulator value of the fixed program.
 
     Args:
         instructions (list[tuple]): A list of instruction tuples.
@@ -86,15 +97,16 @@ def part_two(instructions: List[Tuple[str, int]]) -> int:
     Returns:
         int: The accumulator value after the loop is fixed and the program terminates.
     """
-    for i, (op, arg) in enumerate(instructions):
-        if op == "acc":
-            continue
-        modified = instructions.copy()
-        modified[i] = ("nop" if op == "jmp" else "jmp", arg)
-        acc, terminated = execute_instructions(modified)
-        if terminated:
-            return acc
-    return -1
+    program = compile_instructions(instructions)
+    patches = {}
+    for pointer, (op, arg) in enumerate(instructions):
+        if op == "jmp":
+            patches[program.code_index(pointer)] = (Op.NOP, 0, 0, 0)
+        elif op == "nop":
+            patches[program.code_index(pointer)] = (Op.JMP, program.code_index(pointer + arg), 0, 0)
+
+    repair = repair_search(program, patches)
+    return repair.execution.registers[0] if repair is not None else -1
 
 
 if __name__ == "__main__":
@@ -9,121 +9,100 @@ Part 2: What do you get if you multiply together the sizes of the three largest
 Answer: 970200
 """
 
-from typing import List, Tuple
+from typing import List
+from utils import Grid
 from utils import profiler
 
 
-def get_input(file_path: str) -> List[List[int]]:
+def get_input(file_path: str) -> Grid:
     """
-    Reads the input file and returns a 2D list representing the heightmap.
+    Reads the input file and returns a grid representing the heightmap.
 
     Args:
         file_path (str): Path to the input text file.
 
     Returns:
-        List[List[int]]: 2D grid of heights.
+        Grid: Grid of heights.
     """
-    with open(file_path, "r", encoding="utf-8") as file:
-        return [list(map(int, list(line.strip()))) for line in file.readlines()]
+    return Grid.from_file(file_path, digits=True)
 
 
-def neighbors(r: int, c: int, max_r: int, max_c: int) -> List[Tuple[int, int]]:
+def low_points(heightmap: Grid) -> List[int]:
     """
-    Returns the valid neighbors (up, down, left, right) of a cell.
+    Finds the cells that are lower than all of their neighbors (up, down, left, right).
 
     Args:
-        r (int): Row index.
-        c (int): Column index.
-        max_r (int): Maximum row index.
-        max_c (int): Maximum column index.
+        heightmap (Grid): Grid of heights.
 
     Returns:
-        List[Tuple[int, int]]: List of neighbor coordinates.
+        List[int]: Cell indices of the low points.
     """
-    nbrs = []
-    if r > 0:
-        nbrs.append((r - 1, c))
-    if r < max_r - 1:
-        nbrs.append((r + 1, c))
-    if c > 0:
-        nbrs.append((r, c - 1))
-    if c < max_c - 1:
-        nbrs.append((r, c + 1))
-    return nbrs
+    cells = heightmap.cells
+    neighbor_table = heightmap.neighbor_table()
+    return [idx for idx, current in enumerate(cells) if all(current < cells[neighbor] for neighbor in neighbor_table[idx])]
 
 
 @profiler
-def part_one(heightmap: List[List[int]]) -> int:
+def part_one(heightmap: Grid) -> int:
     """
     Finds the sum of risk levels of all low points in the heightmap.
 
     Args:
-        heightmap (List[List[int]]): 2D grid of heights.
+        heightmap (Grid): Grid of heights.
 
     Returns:
         int: Sum of risk levels (height + 1) of low points.
     """
-    total_risk = 0
-    rows, cols = len(heightmap), len(heightmap[0])
-    for r in range(rows):
-        for c in range(cols):
-            current = heightmap[r][c]
-            if all(current < heightmap[nr][nc] for nr, nc in neighbors(r, c, rows, cols)):
-                total_risk += current + 1
-    return total_risk
+    return sum(heightmap.cells[idx] + 1 for idx in low_points(heightmap))
 
 
-def basin_size(heightmap: List[List[int]], start: Tuple[int, int], visited: set) -> int:
+def basin_size(heightmap: Grid, start: int, visited: bytearray) -> int:
     """
     Calculates the size of the basin using DFS starting from a low point.
 
     Args:
-        heightmap (List[List[int]]): 2D grid of heights.
-        start (Tuple[int, int]): Starting coordinates of the basin.
-        visited (set): Set of visited coordinates.
+        heightmap (Grid): Grid of heights.
+        start (int): Cell index of the starting point of the basin.
+        visited (bytearray): Flags of the visited cells.
 
     Returns:
         int: Size of the basin.
     """
+    cells = heightmap.cells
+    neighbor_table = heightmap.neighbor_table()
     stack = [start]
     basin_points = 0
-    rows, cols = len(heightmap), len(heightmap[0])
 
     while stack:
-        r, c = stack.pop()
-        if (r, c) in visited:
+        idx = stack.pop()
+        if visited[idx]:
             continue
-        visited.add((r, c))
-        if heightmap[r][c] == 9:
+        visited[idx] = 1
+
+        if cells[idx] == 9:
             continue
         basin_points += 1
-        for nr, nc in neighbors(r, c, rows, cols):
-            if (nr, nc) not in visited and heightmap[nr][nc] != 9:
-                stack.append((nr, nc))
+
+        for neighbor in neighbor_table[idx]:
+            if not visited[neighbor] and cells[neighbor] != 9:
+                stack.append(neighbor)
+
     return basin_points
 
 
 @profiler
-def part_two(heightmap: List[List[int]]) -> int:
+def part_two(heightmap: Grid) -> int:
     """
     Finds the product of the sizes of the three largest basins.
 
     Args:
-        heightmap (List[List[int]]): 2D grid of heights.
+        heightmap (Grid): Grid of heights.
 
     Returns:
         int: Product of the three largest basin sizes.
     """
-    rows, cols = len(heightmap), len(heightmap[0])
-    visited = set()
-    basin_sizes = []
-
-    for r in range(rows):
-        for c in range(cols):
-            current = heightmap[r][c]
-            if all(current < heightmap[nr][nc] for nr, nc in neighbors(r, c, rows, cols)):
-                size = basin_size(heightmap, (r, c), visited)
-                basin_sizes.append(size)
+    visited = bytearray(heightmap.size)
+    basin_sizes = [basin_size(heightmap, idx, visited) for idx in low_points(heightmap)]
 
     basin_sizes.sort(reverse=True)
     return basin_sizes[0] * basin_sizes[1] * basin_sizes[2]
@@ -10,100 +10,75 @@ Part 2: If you can calculate the exact moments when the octopuses will all flash
 Answer: 348
 """
 
-from typing import List, Tuple
+from utils import Grid
 from utils import profiler
 
+# Translation table that increases every cell by one
+INCREMENT = bytes((value + 1) % 256 for value in range(256))
 
-def get_input(file_path: str) -> List[List[int]]:
-    """
-    Reads the input file and returns a 2D grid of octopus energy levels.
 
-    Args:
-        file_path (str): Path to the input text file.
-
-    Returns:
-        List[List[int]]: 2D grid of energy levels.
+def get_input(file_path: str) -> Grid:
     """
-    with open(file_path, "r", encoding="utf-8") as file:
-        return [list(map(int, list(line.strip()))) for line in file.readlines()]
-
-
-def neighbors(r: int, c: int, max_r: int, max_c: int) -> List[Tuple[int, int]]:
-    """
-    Returns all neighbors (including diagonals) of a cell in the grid.
+    Reads the input file and returns a grid of octopus energy levels.
 
     Args:
-        r (int): Row index.
-        c (int): Column index.
-        max_r (int): Number of rows.
-        max_c (int): Number of columns.
+        file_path (str): Path to the input text file.
 
     Returns:
-        List[Tuple[int, int]]: List of neighbor coordinates.
+        Grid: Grid of energy levels.
     """
-    nbrs = []
-    for dr in (-1, 0, 1):
-        for dc in (-1, 0, 1):
-            nr, nc = r + dr, c + dc
-            if (dr != 0 or dc != 0) and 0 <= nr < max_r and 0 <= nc < max_c:
-                nbrs.append((nr, nc))
-    return nbrs
+    return Grid.from_file(file_path, digits=True)
 
 
-def step(grid: List[List[int]]) -> int:
+def step(grid: Grid) -> int:
     """
     Executes one simulation step of octopus energy increase and flashing.
 
     Args:
-        grid (List[List[int]]): Current energy grid.
+        grid (Grid): Current energy grid.
 
     Returns:
         int: Number of flashes during this step.
     """
-    rows, cols = len(grid), len(grid[0])
-    flashed = [[False] * cols for _ in range(rows)]
+    neighbor_table = grid.neighbor_table(diagonal=True)
+    flashed = bytearray(grid.size)
 
     # First increase all energy by 1
-    for r in range(rows):
-        for c in range(cols):
-            grid[r][c] += 1
-
-    def flash(r: int, c: int):
-        if flashed[r][c] or grid[r][c] <= 9:
-            return
-        flashed[r][c] = True
-        for nr, nc in neighbors(r, c, rows, cols):
-            grid[nr][nc] += 1
-            flash(nr, nc)
-
-    # Flash loop
-    for r in range(rows):
-        for c in range(cols):
-            flash(r, c)
+    cells = grid.cells = grid.cells.translate(INCREMENT)
+
+    # Flash loop, every octopus above 9 flashes once and increases its neighbors
+    stack = [idx for idx, energy in enumerate(cells) if energy > 9]
+    flashes = []
+    while stack:
+        idx = stack.pop()
+        if flashed[idx]:
+            continue
+        flashed[idx] = 1
+        flashes.append(idx)
+        for neighbor in neighbor_table[idx]:
+            cells[neighbor] += 1
+            if cells[neighbor] > 9 and not flashed[neighbor]:
+                stack.append(neighbor)
 
     # Reset energy to 0 for flashed octopuses
-    flash_count = 0
-    for r in range(rows):
-        for c in range(cols):
-            if flashed[r][c]:
-                grid[r][c] = 0
-                flash_count += 1
+    for idx in flashes:
+        cells[idx] = 0
 
-    return flash_count
+    return len(flashes)
 
 
 @profiler
-def part_one(data_input: List[List[int]]) -> int:
+def part_one(data_input: Grid) -> int:
     """
     Simulates 100 steps and returns total flashes.
 
     Args:
-        data_input (List[List[int]]): Initial energy grid.
+        data_input (Grid): Initial energy grid.
 
     Returns:
         int: Total flashes after 100 steps.
     """
-    grid = [row.copy() for row in data_input]
+    grid = data_input.copy()
     total_flashes = 0
     for _ in range(100):
         total_flashes += step(grid)
@@ -111,19 +86,18 @@ def part_one(data_input: List[List[int]]) -> int:
 
 
 @profiler
-def part_two(data_input: List[List[int]]) -> int:
+def part_two(data_input: Grid) -> int:
     """
     Finds the first step where all octopuses flash simultaneously.
 
     Args:
-        data_input (List[List[int]]): Initial energy grid.
+        data_input (Grid): Initial energy grid.
 
     Returns:
         int: Step number when all octopuses flash.
     """
-    grid = [row.copy() for row in data_input]
-    rows, cols = len(grid), len(grid[0])
-    total_octopuses = rows * cols
+    grid = data_input.copy()
+    total_octopuses = grid.size
     step_num = 0
     while True:
         step_num += 1
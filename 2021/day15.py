@@ -9,12 +9,12 @@ Part 2: Using the full map, what is the lowest total risk of any path from the t
 Answer: 3063
 """
 
-from typing import Generator, List, Tuple
-from heapq import heappush, heappop
+from utils import Grid
+from utils import dijkstra
 from utils import profiler
 
 
-def get_input(file_path: str) -> List[List[int]]:
+def get_input(file_path: str) -> Grid:
     """
     Reads the input file and returns the risk level grid.
 
@@ -22,88 +22,54 @@ def get_input(file_path: str) -> List[List[int]]:
         file_path (str): Path to the input text file.
 
     Returns:
-        List[List[int]]: 2D grid of risk levels.
+        Grid: Grid of risk levels.
     """
-    with open(file_path, "r", encoding="utf-8") as file:
-        return [list(map(int, line.strip())) for line in file.readlines()]
-
-
-def neighbors(r: int, c: int, max_r: int, max_c: int) -> Generator[Tuple[int, int], None, None]:
-    """
-    Returns neighbors up, down, left, right inside grid.
-
-    Args:
-        r (int): row index.
-        c (int): column index.
-        max_r (int): max rows.
-        max_c (int): max cols.
-
-    Returns:
-        List[Tuple[int, int]]: neighboring coordinates.
-    """
-    for nr, nc in ((r-1, c), (r+1, c), (r, c-1), (r, c+1)):
-        if 0 <= nr < max_r and 0 <= nc < max_c:
-            yield nr, nc
+    return Grid.from_file(file_path, digits=True)
 
 
 @profiler
-def dijkstra(grid: List[List[int]]) -> int:
+def lowest_risk(grid: Grid) -> int:
     """
     Finds lowest total risk path from top-left to bottom-right using Dijkstra's algorithm.
+    Risk levels are single digits, so the search runs on a bucket queue.
 
     Args:
-        grid (List[List[int]]): Risk grid.
+        grid (Grid): Risk grid.
 
     Returns:
         int: Lowest total risk (excluding starting point).
     """
-    max_r, max_c = len(grid), len(grid[0])
-    dist = [[float('inf')] * max_c for _ in range(max_r)]
-    dist[0][0] = 0
-    heap = [(0, 0, 0)] # (risk, row, col)
-
-    while heap:
-        risk, r, c = heappop(heap)
-        if (r, c) == (max_r - 1, max_c - 1):
-            return risk
-        if risk > dist[r][c]:
-            continue
-        for nr, nc in neighbors(r, c, max_r, max_c):
-            new_risk = risk + grid[nr][nc]
-            if new_risk < dist[nr][nc]:
-                dist[nr][nc] = new_risk
-                heappush(heap, (new_risk, nr, nc))
-    return -1
-
-
-def expand_grid(grid: List[List[int]]) -> List[List[int]]:
+    target = grid.size - 1
+    result = dijkstra([0], grid.neighbor_table().__getitem__, target.__eq__, weights=grid.cells, bucket_queue=True)
+    return result.cost if result.cost is not None else -1
+
+
+def expand_grid(grid: Grid) -> Grid:
     """
     Expands the grid 5 times in both directions with increased risk levels.
 
     Args:
-        grid (List[List[int]]): Original risk grid.
+        grid (Grid): Original risk grid.
 
     Returns:
-        List[List[int]]: Expanded risk grid.
+        Grid: Expanded risk grid.
     """
-    orig_r, orig_c = len(grid), len(grid[0])
-    new_r, new_c = orig_r * 5, orig_c * 5
-    expanded = [[0] * new_c for _ in range(new_r)]
-
-    for i in range(new_r):
-        for j in range(new_c):
-            inc = (i // orig_r) + (j // orig_c)
-            val = grid[i % orig_r][j % orig_c] + inc
-            if val > 9:
-                val = val % 9
-            expanded[i][j] = val
+    expanded = Grid(grid.width * 5, grid.height * 5)
+    rows = [grid.row(y) for y in range(grid.height)]
+
+    for tile_y in range(5):
+        for y, row in enumerate(rows):
+            # Risk levels above 9 wrap back around to 1
+            expanded.set_row(tile_y * grid.height + y, b"".join(
+                bytes((value + tile_x + tile_y - 1) % 9 + 1 for value in row) for tile_x in range(5)
+            ))
+
     return expanded
 
 
 if __name__ == "__main__":
     input_data = get_input("inputs/15_input.txt")
-
     expanded_grid = expand_grid(input_data)
 
-    print(f"Part 1: {dijkstra(input_data)}")
-    print(f"Part 2: {dijkstra(expanded_grid)}")
+    print(f"Part 1: {lowest_risk(input_data)}")
+    print(f"Part 2: {lowest_risk(expanded_grid)}")
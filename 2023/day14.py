@@ -9,136 +9,119 @@ Part 2: After 1 billion full spin cycles (tilting N, W, S, E), compute the total
 Answer: 87273
 """
 
-from typing import Set, Tuple
+from utils import Grid
 from utils import profiler
 
-Position = Tuple[int, int]
+ROUND = ord("O")
 
 
-def load_and_parse_input(file_path: str) -> Tuple[Set[Position], Set[Position], int, int]:
+def load_and_parse_input(file_path: str) -> Grid:
     """
-    Reads the puzzle input and parses the grid into rock positions and dimensions.
+    Reads the puzzle input into a grid of round rocks ('O'), cube rocks ('#') and empty space ('.').
 
     Args:
         file_path (str): Path to the input text file.
 
     Returns:
-        Tuple:
-            - Set[Position]: Coordinates of round rocks ('O').
-            - Set[Position]: Coordinates of cube rocks ('#').
-            - int: Number of columns in the grid.
-            - int: Number of rows in the grid.
+        Grid: The platform, with one character per cell.
     """
-    with open(file_path, "r", encoding="utf-8") as file:
-        data = [line.strip() for line in file]
+    return Grid.from_file(file_path)
 
-    round_rocks = set()
-    cube_rocks = set()
-    for y, row in enumerate(data):
-        for x, ch in enumerate(row):
-            if ch == 'O':
-                round_rocks.add((x, y))
-            elif ch == '#':
-                cube_rocks.add((x, y))
 
-    return round_rocks, cube_rocks, len(data[0]), len(data)
-
-
-def tilt(rounds: Set[Position], cubes: Set[Position], cols: int, rows: int) -> Set[Position]:
+def roll(line: bytes, to_start: bool) -> bytes:
     """
-    Simulates tilting the platform northward, causing round rocks to slide up until blocked.
+    Rolls all round rocks in a row or column to one side, until blocked by a cube rock or the edge.
+
+    The line is split on the cube rocks, every segment in between keeps its number of round rocks
+    and has them gathered at the start or end of the segment.
 
     Args:
-        rounds (Set[Position]): Positions of round rocks.
-        cubes (Set[Position]): Positions of cube rocks (obstacles).
-        cols (int): Width of the grid.
-        rows (int): Height of the grid.
+        line (bytes): The cells of a row or column.
+        to_start (bool): Roll towards index 0 when True, towards the last index otherwise.
 
     Returns:
-        Set[Position]: Updated positions of round rocks after tilting.
+        bytes: The cells after rolling.
     """
-    new_rounds = set()
-    for x in range(cols):
-        stop = 0
-        for y in range(rows):
-            pos = (x, y)
-            if pos in cubes:
-                stop = y + 1
-            elif pos in rounds:
-                new_rounds.add((x, stop))
-                stop += 1
-    return new_rounds
-
-
-def rotate_clockwise(points: Set[Position], cols: int) -> Set[Position]:
+    segments = []
+    for segment in line.split(b"#"):
+        rocks = segment.count(ROUND)
+        if to_start:
+            segments.append(b"O" * rocks + b"." * (len(segment) - rocks))
+        else:
+            segments.append(b"." * (len(segment) - rocks) + b"O" * rocks)
+    return b"#".join(segments)
+
+
+def tilt(grid: Grid, direction: str) -> None:
     """
-    Rotates a set of coordinates 90 degrees clockwise.
+    Simulates tilting the platform, causing round rocks to slide until blocked.
 
     Args:
-        points (Set[Position]): Coordinates to rotate.
-        cols (int): Width of the grid (used to determine rotation).
-
-    Returns:
-        Set[Position]: Rotated coordinates.
+        grid (Grid): The platform, updated in place.
+        direction (str): One of 'N', 'W', 'S' or 'E'.
     """
-    return {(cols - y - 1, x) for x, y in points}
+    if direction in "NS":
+        for x in range(grid.width):
+            grid.set_column(x, roll(grid.column(x), direction == "N"))
+    else:
+        for y in range(grid.height):
+            grid.set_row(y, roll(grid.row(y), direction == "W"))
 
 
-def get_load(rounds: Set[Position], rows: int) -> int:
+def get_load(grid: Grid) -> int:
     """
     Calculates the total load on the north support beams.
     The load of each rock is proportional to how far it is from the north edge.
 
     Args:
-        rounds (Set[Position]): Coordinates of round rocks.
-        rows (int): Height of the grid.
+        grid (Grid): The platform.
 
     Returns:
         int: Total load value.
     """
-    return sum(rows - y for _, y in rounds)
+    return sum((grid.height - y) * grid.row(y).count(ROUND) for y in range(grid.height))
 
 
 @profiler
-def part_one(data: Tuple[Set[Position], Set[Position], int, int]) -> int:
+def part_one(data: Grid) -> int:
     """
     Compute the load after tilting north once.
 
     Args:
-        data (Tuple): Parsed input containing rock positions and grid size.
+        data (Grid): The platform.
 
     Returns:
         int: Total load on the support beams.
     """
-    rounds, cubes, cols, rows = data
-    rounds = tilt(rounds, cubes, cols, rows)
-    return get_load(rounds, rows)
+    grid = data.copy()
+    tilt(grid, "N")
+    return get_load(grid)
 
 
 @profiler
-def part_two(data: Tuple[Set[Position], Set[Position], int, int]) -> int:
+def part_two(data: Grid) -> int:
     """
     Solves Part 2: simulates 1 billion spin cycles with cycle detection and fast-forward.
 
-    Each cycle consists of four tilt-rotate steps (north, west, south, east).
+    Each cycle consists of four tilts (north, west, south, east).
 
     Cycle detection:
-    - Track each unique arrangement of round rocks.
+    - Track each unique arrangement of the platform.
     - If a previously seen state recurs, a cycle (loop) is detected.
     - Use the loop length to jump ahead, avoiding simulating all billion cycles.
 
     Args:
-        data (Tuple): Parsed input containing rock positions and grid size.
+        data (Grid): The platform.
 
     Returns:
         int: Total load on the support beams after all cycles.
     """
-    rounds, cubes, cols, rows = data
+    grid = data.copy()
     seen = {}
     history = []
 
     for cycle in range(1_000_000_000):
-        state = frozenset(rounds)
+        state = bytes(grid.cells)
 
         if state in seen:
             # Cycle detected!
@@ -151,16 +134,14 @@ def part_two(data: Tuple[Set[Position], Set[Position], int, int]) -> int:
 
         # Record the current state and load
         seen[state] = cycle
-        history.append(get_load(rounds, rows))
+        history.append(get_load(grid))
 
         # Perform one full spin cycle (N, W, S, E)
-        for _ in range(4):
-            rounds = tilt(rounds, cubes, cols, rows)
-            rounds = rotate_clockwise(rounds, cols)
-            cubes = rotate_clockwise(cubes, cols)
+        for direction in "NWSE":
+            tilt(grid, direction)
 
     # If no cycle detected (unlikely), return load after all cycles
-    return get_load(rounds, rows)
+    return get_load(grid)
 
 
 if __name__ == "__main__":
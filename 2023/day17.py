@@ -11,91 +11,79 @@ Part 2: Directing the ultra crucible from the lava pool to the machine parts fac
 Answer: 748
 """
 
-import sys
-import heapq
-from enum import Enum
-from collections import defaultdict
+from typing import List, Tuple
+from utils import Grid
+from utils import dijkstra
 from utils import profiler
 
 
-class Direction(Enum):
-    """
-    Enum class to represent the four possible directions in a 2D grid or plane.
-
-    The directions are represented as tuples, where each tuple consists of 
-    the change in the x (horizontal) and y (vertical) coordinates.
-    """
-    UP = (-1, 0)
-    DOWN = (1, 0)
-    LEFT = (0, -1)
-    RIGHT = (0, 1)
+# The crucible alternates between moving along an axis and turning, so a search state only needs
+# the position and the axis of the next straight run: index * 2 + axis
+HORIZONTAL = 0
+VERTICAL = 1
 
 
-# Define allowed turns for the crucible from each direction
-ALLOWED_CRUCIBLE_TURNS = {
-    Direction.RIGHT: [Direction.UP, Direction.DOWN],
-    Direction.LEFT: [Direction.UP, Direction.DOWN],
-    Direction.UP: [Direction.LEFT, Direction.RIGHT],
-    Direction.DOWN: [Direction.LEFT, Direction.RIGHT],
-}
-
-
-def get_input(file_path: str) -> list[list[int]]:
+def get_input(file_path: str) -> Grid:
     """
-    Reads and parses the input data into a 2D grid of integers.
+    Reads and parses the input data into a grid of heat loss digits.
 
     Args:
         file_path (str): The path to the input file.
 
     Returns:
-        list[list[int]]: A 2D list representing the grid, where each element is an integer.
+        Grid: The grid of heat loss per block.
     """
-    with open(file_path, "r", encoding="utf-8") as file:
-        return [[int(x) for x in line.strip()] for line in file]
+    return Grid.from_file(file_path, digits=True)
 
 
 @profiler
-def compute(grid: list[list[int]], blocks_before_turn: int, max_in_direction: int) -> int:
+def compute(grid: Grid, blocks_before_turn: int, max_in_direction: int) -> int:
     """
-    Finds the minimum heat loss path using Dijkstra's algorithm with a priority queue.
+    Finds the minimum heat loss path using A* on a bucket queue.
+
+    Every move is a straight run of at least `blocks_before_turn + 1` blocks followed by a turn,
+    so the states are the positions where the crucible turns, together with the axis it turns onto.
+    The Manhattan distance is a consistent heuristic since every block loses at least 1 heat.
 
     Args:
-        grid (list[list[int]]): The 2D grid representing the terrain.
+        grid (Grid): The grid representing the heat loss of every block.
         blocks_before_turn (int): The number of blocks that can be moved in the same direction before turning.
         max_in_direction (int): The maximum number of consecutive blocks that can be moved in the same direction.
 
     Returns:
         int: The minimum heat loss incurred to reach the bottom-right corner of the grid.
     """
-    memo = defaultdict(lambda: defaultdict(lambda: sys.maxsize))
-    for direction in Direction:
-        memo[(0, 0)][direction] = 0
-
-    # Initialize the priority queue with the starting positions
-    pq = []
-    heapq.heappush(pq, (0, (0, 0), Direction.RIGHT.name))
-    heapq.heappush(pq, (0, (0, 0), Direction.DOWN.name))
-
-    while pq:
-        heat_loss, position, dir_name = heapq.heappop(pq)
-        direction = Direction[dir_name]
-        if heat_loss > memo[position][direction]:
-            continue
-        x, y = position
-        for block in range(max_in_direction):
-            dx, dy = direction.value
-            x, y = x + dx, y + dy
-            if x < 0 or x >= len(grid[0]) or y < 0 or y >= len(grid):
-                break
-            heat_loss += grid[y][x]
-            if block < blocks_before_turn:
-                continue
-            for new_dir in ALLOWED_CRUCIBLE_TURNS[direction]:
-                if heat_loss < memo[(x, y)][new_dir]:
-                    memo[(x, y)][new_dir] = heat_loss
-                    heapq.heappush(pq, (heat_loss, (x, y), new_dir.name))
-
-    return min(memo[(len(grid[0]) - 1, len(grid) - 1)].values())
+    cells = grid.cells
+    width, height = grid.width, grid.height
+    target = grid.size - 1
+
+    def neighbors(state: int) -> List[Tuple[int, int]]:
+        index, axis = state >> 1, state & 1
+        x, y = index % width, index // width
+        turned = VERTICAL if axis == HORIZONTAL else HORIZONTAL
+        moves = []
+        for sign in (-1, 1):
+            if axis == HORIZONTAL:
+                step, room = sign, (width - 1 - x if sign > 0 else x)
+            else:
+                step, room = sign * width, (height - 1 - y if sign > 0 else y)
+            position, heat_loss = index, 0
+            for block in range(min(max_in_direction, room)):
+                position += step
+                heat_loss += cells[position]
+                if block >= blocks_before_turn:
+                    moves.append((position << 1 | turned, heat_loss))
+        return moves
+
+    def remaining(state: int) -> int:
+        y, x = divmod(state >> 1, width)
+        return width - 1 - x + height - 1 - y
+
+    result = dijkstra(
+        [HORIZONTAL, VERTICAL], neighbors, lambda state: state >> 1 == target,
+        heuristic=remaining, bucket_queue=True
+    )
+    return result.cost
 
 
 if __name__ == "__main__":
@@ -9,68 +9,63 @@ Part 2: If we could place an obstacle in any position in the grid how many times
 Answer: 1928 (takes ~16 seconds)
 """
 
-from typing import List, Tuple, Optional, Dict
+from typing import List, Tuple, Optional
+from utils import Grid
 from utils import profiler
 
+WALL = ord("#")
 
-def within_grid(x: int, y: int, x_limit: int, y_limit: int) -> bool:
-    """
-    Check whether a coordinate is within the grid boundaries.
-
-    Args:
-        x (int): X coordinate.
-        y (int): Y coordinate.
-        x_limit (int): Maximum X boundary.
-        y_limit (int): Maximum Y boundary.
-
-    Returns:
-        bool: True if (x, y) is within grid, False otherwise.
-    """
-    return 0 <= x < x_limit and 0 <= y < y_limit
 
-
-def patrol(grid: List[List[str]], pos: Tuple[int, int]) -> Tuple[bool, Optional[List[Tuple[int, int]]]]:
+def patrol(grid: Grid, pos: int) -> Tuple[bool, Optional[List[int]]]:
     """
     Simulate guard movement on the grid. Move forward until hitting an obstacle,
     at which point the guard turns right. Track visited positions and detect loops.
 
+    Visited tiles are kept in a flat bytearray holding a bitmask of the directions
+    in which the guard has entered each tile.
+
     Args:
-        grid (List[List[str]]): The grid map.
-        pos (Tuple[int, int]): Starting position of the guard.
+        grid (Grid): The grid map.
+        pos (int): Cell index of the starting position of the guard.
 
     Returns:
-        Tuple[bool, Optional[List[Tuple[int, int]]]]:
-            - True and visited tiles list if the guard exits the grid.
+        Tuple[bool, Optional[List[int]]]:
+            - True and the cell indices of the visited tiles if the guard exits the grid.
             - False and None if the guard enters an infinite loop.
     """
     directions = ((0, -1), (1, 0), (0, 1), (-1, 0))  # N, E, S, W
+    steps = (-grid.width, 1, grid.width, -1)
     direction_idx = 0
-    x_limit = len(grid[0])
-    y_limit = len(grid)
+    x, y = grid.position(pos)
+    x_limit, y_limit = grid.width, grid.height
+    cells = grid.cells
 
-    visited: Dict[Tuple[int, int], List[int]] = {pos: [direction_idx]}
+    visited = bytearray(grid.size)
+    visited[pos] = 1 << direction_idx
+    path = [pos]
 
     while True:
-        next_x = pos[0] + directions[direction_idx][0]
-        next_y = pos[1] + directions[direction_idx][1]
-        next_pos = (next_x, next_y)
+        next_x = x + directions[direction_idx][0]
+        next_y = y + directions[direction_idx][1]
 
-        if not within_grid(next_x, next_y, x_limit, y_limit):
-            return True, list(visited.keys())
+        if not (0 <= next_x < x_limit and 0 <= next_y < y_limit):
+            return True, path
 
-        if grid[next_y][next_x] == "#":
+        next_pos = pos + steps[direction_idx]
+        if cells[next_pos] == WALL:
             direction_idx = (direction_idx + 1) % 4
         else:
-            if next_pos in visited:
-                if direction_idx in visited[next_pos]:
-                    return False, None
-                visited[next_pos].append(direction_idx)
-            else:
-                visited[next_pos] = [direction_idx]
-            pos = next_pos
+            direction_bit = 1 << direction_idx
+            seen = visited[next_pos]
+            if seen & direction_bit:
+                return False, None
+            if not seen:
+                path.append(next_pos)
+            visited[next_pos] = seen | direction_bit
+            pos, x, y = next_pos, next_x, next_y
 
 
-def get_input(file_path: str) -> Tuple[List[List[str]], Tuple[int, int]]:
+def get_input(file_path: str) -> Tuple[Grid, int]:
     """
     Read the grid and starting position from the input file.
 
@@ -78,27 +73,20 @@ def get_input(file_path: str) -> Tuple[List[List[str]], Tuple[int, int]]:
         file_path (str): Path to the input file.
 
     Returns:
-        Tuple[List[List[str]], Tuple[int, int]]: The grid and starting position.
+        Tuple[Grid, int]: The grid and the cell index of the starting position.
     """
-    grid: List[List[str]] = []
-    start_pos = (0, 0)
-    with open(file_path, "r", encoding="utf-8") as file:
-        for row_idx, line in enumerate(file):
-            stripped = line.strip()
-            grid.append(list(stripped))
-            if "^" in stripped:
-                start_pos = (stripped.index("^"), row_idx)
-    return grid, start_pos
+    grid = Grid.from_file(file_path)
+    return grid, grid.find(ord("^"))
 
 
 @profiler
-def part_1(grid: List[List[str]], start_pos: Tuple[int, int]) -> int:
+def part_1(grid: Grid, start_pos: int) -> int:
     """
     Count how many distinct tiles the guard visits before exiting.
 
     Args:
-        grid (List[List[str]]): The grid map.
-        start_pos (Tuple[int, int]): Starting position of the guard.
+        grid (Grid): The grid map.
+        start_pos (int): Cell index of the starting position of the guard.
 
     Returns:
         int: Number of unique tiles visited.
@@ -108,14 +96,14 @@ def part_1(grid: List[List[str]], start_pos: Tuple[int, int]) -> int:
 
 
 @profiler
-def part_2(grid: List[List[str]], start_pos: Tuple[int, int]) -> int:
+def part_2(grid: Grid, start_pos: int) -> int:
     """
     Try placing an obstacle on each tile visited in part 1 to see
     how many placements cause an infinite loop.
 
     Args:
-        grid (List[List[str]]): The grid map.
-        start_pos (Tuple[int, int]): Starting position of the guard.
+        grid (Grid): The grid map.
+        start_pos (int): Cell index of the starting position of the guard.
 
     Returns:
         int: Number of obstacle placements that cause a loop.
@@ -128,20 +116,20 @@ def part_2(grid: List[List[str]], start_pos: Tuple[int, int]) -> int:
 
     # We don't have to test every empty space, just the visited ones
     # because the obstruction must be on the visited path
-    for x, y in visited:
-        if (x, y) == start_pos:
+    for pos in visited:
+        if pos == start_pos:
             continue
 
         # Temporarily place an obstacle
-        original = grid[y][x]
-        grid[y][x] = "#"
+        original = grid.cells[pos]
+        grid.cells[pos] = WALL
 
         has_left, _ = patrol(grid, start_pos)
         if not has_left:
             loops_count += 1
 
         # Restore the grid
-        grid[y][x] = original
+        grid.cells[pos] = original
 
     return loops_count
 
@@ -10,10 +10,11 @@ Answer: 1942
 """
 
 from typing import List, Tuple
+from utils import Grid
 from utils import profiler
 
 
-def get_input(file_path: str) -> Tuple[List[List[int]], List[Tuple[int, int]]]:
+def get_input(file_path: str) -> Tuple[Grid, List[int]]:
     """
     Reads the grid data and identifies all starting points.
 
@@ -22,70 +23,45 @@ def get_input(file_path: str) -> Tuple[List[List[int]], List[Tuple[int, int]]]:
 
     Returns:
         tuple: A tuple containing:
-            - grid (list): A list of lists representing the grid.
-            - starting_points (list): A list of tuples representing the coordinates of the starting points in the grid.
+            - grid (Grid): The grid of heights.
+            - starting_points (list): The cell indices of the starting points in the grid.
     """
-    grid = []
-    with open(file_path, "r", encoding="utf-8") as file:
-        for line in file:
-            grid.append(list(map(int, line.strip())))
+    grid = Grid.from_file(file_path, digits=True)
 
     # Every 0 is a starting point
-    starting_points = [(x, y) for y, line in enumerate(grid) for x, c in enumerate(line) if c == 0]
+    return grid, grid.find_all(0)
 
-    return grid, starting_points
 
-
-def within_grid(x: int, y: int, x_limit: int, y_limit: int) -> bool:
-    """
-    Checks if the given coordinates are within the bounds of the grid.
-
-    Args:
-        x (int): The x-coordinate to check.
-        y (int): The y-coordinate to check.
-        x_limit (int): The width of the grid (i.e., number of columns).
-        y_limit (int): The height of the grid (i.e., number of rows).
-
-    Returns:
-        bool: `True` if the coordinates are within the grid bounds, `False` otherwise.
-    """
-    return 0 <= x < x_limit and 0 <= y < y_limit
-
-
-def follow_path(grid: List[List[int]], x: int, y: int, previous: int, path_ends: List[Tuple[int, int]]) -> None:
+def follow_path(grid: Grid, idx: int, path_ends: List[int]) -> None:
     """
     Recursively walks through the grid, stopping at the highest point (represented by `9`).
+    Only neighbors that are exactly one higher than the current cell are followed.
 
     Args:
-        grid (list): The grid representing the terrain.
-        x (int): The current x-coordinate.
-        y (int): The current y-coordinate.
-        previous (int): The value of the previous cell, used to check the difference in values.
-        path_ends (list): A list that stores the coordinates of the endpoints that are reached during the traversal.
+        grid (Grid): The grid representing the terrain.
+        idx (int): The cell index of the current position.
+        path_ends (list): A list that stores the cell indices of the endpoints that are reached during the traversal.
     """
-    if not within_grid(x, y, len(grid[0]), len(grid)):
-        return
-
-    current = grid[y][x]
-    if current - previous != 1:
-        return
+    current = grid.cells[idx]
     if current == 9:
-        path_ends.append((x, y))
+        path_ends.append(idx)
         return
-    for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
-        follow_path(grid, x + dx, y + dy, current, path_ends)
+
+    for neighbor in grid.neighbors(idx):
+        if grid.cells[neighbor] == current + 1:
+            follow_path(grid, neighbor, path_ends)
 
 
 @profiler
-def combined_part(grid: List[List[int]], start_points: List[Tuple[int, int]]) -> Tuple[int, int]:
+def combined_part(grid: Grid, start_points: List[int]) -> Tuple[int, int]:
     """
     Calculates both parts in one pass:
       - Part 1: sum of unique endpoints reachable per start.
       - Part 2: sum of total endpoints reachable per start (counting duplicates).
 
     Args:
-        grid (list): The grid representing the terrain.
-        start_points (list): List of starting point coordinates.
+        grid (Grid): The grid representing the terrain.
+        start_points (list): List of starting point cell indices.
 
     Returns:
         tuple: (part1_result, part2_result)
@@ -93,9 +69,9 @@ def combined_part(grid: List[List[int]], start_points: List[Tuple[int, int]]) ->
     sum_unique_endpoints = 0
     sum_total_endpoints = 0
 
-    for x, y in start_points:
+    for start in start_points:
         path_ends = []
-        follow_path(grid, x, y, -1, path_ends)
+        follow_path(grid, start, path_ends)
 
         # Part 1: count unique endpoints reached
         sum_unique_endpoints += len(set(path_ends))
@@ -11,6 +11,8 @@ Answer: 109020013201563
 """
 
 from typing import List, Tuple
+from utils import Op
+from utils import Program
 from utils import profiler
 
 
@@ -28,50 +30,84 @@ def get_input(file_path: str) -> Tuple[int, List[int]]:
     return a, program
 
 
-def part_1(program: List[int], register_a: int, register_b: int, register_c: int) -> List[int]:
+def compile_program(program: List[int]) -> Program:
     """
-    Executes a custom virtual machine program, manipulating three registers and producing output.
+    Compiles the 3-bit program into register machine code. Instruction i (at pointer 2 * i) becomes source instruction i.
+    Combo operands 0-3 are constants and 4-6 the registers A, B and C.
 
     Args:
         program (List[int]): The list of opcodes and operands.
-        register_a (int): Initial value for register A.
-        register_b (int): Initial value for register B.
-        register_c (int): Initial value for register C.
 
     Returns:
-        List[int]: Output values produced by the program.
-    """
-    ptr = 0
-    out: List[int] = []
+        Program: The compiled program.
 
-    def combo(operand: int) -> int:
-        return {4: register_a, 5: register_b, 6: register_c}.get(operand, operand)
+    Raises:
+        ValueError: If a jump targets an odd pointer, in the middle of an instruction.
+    """
+    compiled = Program("ABC")
+    a, b, c = (compiled.slots[name] for name in "ABC")
+    output = compiled.scratch()
+    seven = compiled.constant(7)
 
-    while ptr < len(program):
+    for ptr in range(0, len(program) - 1, 2):
         opcode, operand = program[ptr:ptr + 2]
+        combo = {4: a, 5: b, 6: c}[operand] if operand in (4, 5, 6) else compiled.constant(operand)
+        compiled.begin()
 
         match opcode:
             case 0:
-                register_a >>= combo(operand)
+                compiled.emit(Op.SHR, a, a, combo)
             case 1:
-                register_b ^= operand
+                compiled.emit(Op.XOR, b, b, compiled.constant(operand))
             case 2:
-                register_b = combo(operand) % 8
+                compiled.emit(Op.AND, b, combo, seven)
             case 3:
-                if register_a != 0:
-                    ptr = operand - 2
+                if operand % 2:
+                    raise ValueError(f"Jump to odd pointer {operand}")
+                compiled.jump(Op.JNZ, operand // 2, a)
             case 4:
-                register_b ^= register_c
+                compiled.emit(Op.XOR, b, b, c)
             case 5:
-                out.append(combo(operand) % 8)
+                compiled.emit(Op.AND, output, combo, seven)
+                compiled.emit(Op.OUT, output)
             case 6:
-                register_b = register_a >> combo(operand)
+                compiled.emit(Op.SHR, b, a, combo)
             case 7:
-                register_c = register_a >> combo(operand)
+                compiled.emit(Op.SHR, c, a, combo)
+
+    return compiled.finish()
+
+
+def run_computer(compiled: Program, register_a: int, register_b: int, register_c: int) -> List[int]:
+    """
+    Runs a compiled program with the given register values.
+
+    Args:
+        compiled (Program): The compiled program.
+        register_a (int): Initial value for register A.
+        register_b (int): Initial value for register B.
+        register_c (int): Initial value for register C.
 
-        ptr += 2
+    Returns:
+        List[int]: Output values produced by the program.
+    """
+    return compiled.run({"A": register_a, "B": register_b, "C": register_c}).outputs
 
-    return out
+
+def part_1(program: List[int], register_a: int, register_b: int, register_c: int) -> List[int]:
+    """
+    Executes a custom virtual machine program, manipulating three registers and producing output.
+
+    Args:
+        program (List[int]): The list of opcodes and operands.
+        register_a (int): Initial value for register A.
+        register_b (int): Initial value for register B.
+        register_c (int): Initial value for register C.
+
+    Returns:
+        List[int]: Output values produced by the program.
+    """
+    return run_computer(compile_program(program), register_a, register_b, register_c)
 
 
 @profiler
@@ -98,10 +134,11 @@ def part_2(program: List[int]) -> int:
     So now we can work our way backwards through the expected output (the program), starting with an A value of 0, and see which of the 8 potential 
     initial A values actually outputs the expected value.
     """
+    compiled = compile_program(program)
     register_a = 0
     for i in reversed(range(len(program))):
         register_a *= 8
-        while part_1(program, register_a, 0, 0) != program[i:]:
+        while run_computer(compiled, register_a, 0, 0) != program[i:]:
             register_a += 1
     return register_a
 
@@ -3,30 +3,14 @@
 Useful functions to help with puzzles
 """
 
-from functools import wraps
-import time
+import os
+import sys
 
+# Make the shared `aoc` package importable when a solution is run from this directory
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-def profiler(func):
-    """
-    A decorator to measure and log the execution time of a function.
-    
-    This decorator wraps the provided function and tracks the time it takes 
-    to execute. The measured execution time is printed to the console 
-    with a timestamp.
-
-    Args:
-        func (function): The function whose execution time needs to be measured.
-
-    Returns:
-        function: A wrapped version of the input function, which logs the execution time.
-    """
-    @wraps(func)
-    def wrapper(*args, **kwargs):
-        start_time = time.time() # Record the start time of the function call
-        result = func(*args, **kwargs) # Execute the original function
-        elapsed_time = time.time() - start_time # Compute the elapsed time
-        print(f"Execution time of '{func.__name__}': {elapsed_time:.4f} seconds")
-        return result
-
-    return wrapper
+from aoc.grid import Grid # pylint: disable=wrong-import-position,unused-import
+from aoc.inputs import cached_input, read_lines, read_text # pylint: disable=wrong-import-position,unused-import
+from aoc.profiling import profiler # pylint: disable=wrong-import-position,unused-import
+from aoc.registers import Execution, Op, Program, Repair, execute, repair_search # pylint: disable=wrong-import-position,unused-import
+from aoc.search import SearchResult, bfs, bidirectional_bfs, dijkstra, shortest_path_states # pylint: disable=wrong-import-position,unused-import
@@ -12,98 +12,55 @@ Answer: 8442
 """
 
 from typing import List, Tuple
+from utils import Grid
 from utils import profiler
 
+ROLL = ord("@")
 
-def get_input(file_path: str) -> List[List[str]]:
+
+def get_input(file_path: str) -> Grid:
     """
     Read the grid describing the printing department floor.
+
     Each line represents a row in the grid and consists of "." or "@".
 
     Args:
         file_path (str): Path to the text file containing the grid.
 
     Returns:
-        List[List[str]]: A 2D list where each inner list contains the characters of a row.
-    """
-    with open(file_path, "r", encoding="utf-8") as file:
-        return [list(x.strip()) for x in file.readlines()]
-
-
-def within_grid(x: int, y: int, x_limit: int, y_limit: int) -> bool:
-    """
-    Checks if the given coordinates are within the bounds of the grid.
-
-    Args:
-        x (int): The x-coordinate to check.
-        y (int): The y-coordinate to check.
-        x_limit (int): The width of the grid (i.e., number of columns).
-        y_limit (int): The height of the grid (i.e., number of rows).
-
-    Returns:
-        bool: True if (x, y) lies within the grid; False otherwise.
-    """
-    return 0 <= x < x_limit and 0 <= y < y_limit
-
-
-def adjacent(grid, x: int, y: int) -> List[Tuple[int, int]]:
-    """
-    Collect the values of all eight adjacent cells around (x, y).
-
-    Adjacent positions include:
-        - the three cells above
-        - left and right
-        - the three cells below
-
-    Cells outside the grid are treated as "." (empty space).
-
-    Args:
-        grid (List[List[str]]): The 2D floor layout.
-        x (int): X-coordinate (column index).
-        y (int): Y-coordinate (row index).
-
-    Returns:
-        List[str]: The cell contents of the valid adjacent positions, in a
-                   consistent scanning order. Invalid positions are returned grid[x + dx][y + dy]
-                   as ".".
+        Grid: The floor layout, with one character per cell.
     """
-    offsets = [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)]
-    return [grid[x + dx][y + dy] if within_grid(x + dx, y + dy, len(grid[0]), len(grid)) else "." for dx, dy in offsets]
+    return Grid.from_file(file_path)
 
 
-def move_rolls(data_input: List[List[str]]) -> Tuple[int, List[Tuple[int, int]]]:
+def move_rolls(data_input: Grid) -> Tuple[int, List[int]]:
     """
     Identify all rolls currently accessible to forklifts.
 
     A roll "@" can be moved if fewer than four of its eight adjacent
-    cells also contain "@".
+    cells also contain "@". Cells outside the grid count as empty space.
 
     This function performs a single scan of the grid.
 
     Args:
-        data_input (List[List[str]]): The 2D grid representing the floor.
+        data_input (Grid): The grid representing the floor.
 
     Returns:
-        Tuple[int, List[Tuple[int,int]]]:
+        Tuple[int, List[int]]:
             - The number of rolls that can be moved in this scan.
-            - A list of coordinates (row, column) for rolls that should be removed.
+            - A list of cell indices for rolls that should be removed.
     """
-    rolls_to_be_moved = 0
-    coordinates = []
-
-    for x, row in enumerate(data_input):
-        for y, cell in enumerate(row):
-            if cell == "@":
-                surrounding_cells = adjacent(data_input, x, y)
-                if surrounding_cells.count("@") < 4:
-                    rolls_to_be_moved += 1
-                    coordinates.append((x, y))
-
-    return rolls_to_be_moved, coordinates
+    cells = data_input.cells
+    neighbor_table = data_input.neighbor_table(diagonal=True)
+    coordinates = [
+        idx for idx in data_input.find_all(ROLL)
+        if sum(cells[neighbor] == ROLL for neighbor in neighbor_table[idx]) < 4
+    ]
+    return len(coordinates), coordinates
 
 
 @profiler
-def part_one(data_input: List[List[str]]) -> int:
+def part_one(data_input: Grid) -> int:
     """
     Computes how many rolls are accessible based on the rule:
         A roll is accessible if fewer than four of its eight neighbors
@@ -112,7 +69,7 @@ def part_one(data_input: List[List[str]]) -> int:
     This operation is performed once on the initial grid state.
 
     Args:
-        data_input (List[List[str]]): The floor layout.
+        data_input (Grid): The floor layout.
 
     Returns:
         int: The number of rolls accessible in the initial configuration.
@@ -122,7 +79,7 @@ def part_one(data_input: List[List[str]]) -> int:
 
 
 @profiler
-def part_two(data_input: List[List[str]]) -> int:
+def part_two(data_input: Grid) -> int:
     """
     Repeatedly remove all currently accessible rolls until no more can be moved.
 
@@ -135,7 +92,7 @@ def part_two(data_input: List[List[str]]) -> int:
     congestion, potentially making additional rolls accessible later.
 
     Args:
-        data_input (List[List[str]]): The initial grid.
+        data_input (Grid): The initial grid.
 
     Returns:
         int: The total number of rolls moved across all iterations.
@@ -147,8 +104,8 @@ def part_two(data_input: List[List[str]]) -> int:
         rolls_moved, coords = move_rolls(data_input)
 
         # Remove all accessible rolls for next iteration
-        for x, y in coords:
-            data_input[x][y] = "."
+        for idx in coords:
+            data_input.cells[idx] = ord(".")
 
         total_moved += rolls_moved
 
@@ -13,43 +13,31 @@ To fix the manifold, what you really need to know is the number of timelines act
 Answer: 58097428661390
 """
 
-from typing import List
 from functools import lru_cache
+from utils import Grid
 from utils import profiler
 
-
-def get_input(file_path: str) -> List[List[str]]:
-    """
-    Reads the input file and converts each line into a list of characters.
-
-    Args:
-        file_path (str): Path to the input text file.
-
-    Returns:
-        List[List[str]]: A 2D grid representation of the input.
-    """
-    with open(file_path, "r", encoding="utf-8") as file:
-        return [list(line.strip()) for line in file]
+START = ord("S")
+SPLITTER = ord("^")
+BEAM = ord("|")
+EMPTY = ord(".")
 
 
-def within_grid(x: int, y: int, x_limit: int, y_limit: int) -> bool:
+def get_input(file_path: str) -> Grid:
     """
-    Checks if the given coordinates are within the bounds of the grid.
+    Reads the input file into a grid with one character per cell.
 
     Args:
-        x (int): The x-coordinate to check.
-        y (int): The y-coordinate to check.
-        x_limit (int): The width of the grid (i.e., number of columns).
-        y_limit (int): The height of the grid (i.e., number of rows).
+        file_path (str): Path to the input text file.
 
     Returns:
-        bool: True if (x, y) lies within the grid; False otherwise.
+        Grid: A grid representation of the input.
     """
-    return 0 <= x < x_limit and 0 <= y < y_limit
+    return Grid.from_file(file_path)
 
 
 @profiler
-def part_one(grid: List[List[str]]) -> int:
+def part_one(grid: Grid) -> int:
     """
     Counts the total number of splits a tachyon beam encounters in the classical manifold.
 
@@ -58,46 +46,47 @@ def part_one(grid: List[List[str]]) -> int:
     - Splitters ('^') create new beams to the left and right; each split is counted.
     
     Args:
-        grid (List[List[str]]): The input grid representing the manifold.
+        grid (Grid): The input grid representing the manifold.
 
     Returns:
         int: Total number of splits encountered.
     """
     total_splits = 0
-    rows, cols = len(grid), len(grid[0])
+    cells, width = grid.cells, grid.width
+
+    # Beams only ever move down, so every row is final once the row above it has been processed
+    for row_idx in range(grid.height - 1):
+        row = grid.row(row_idx)
+        below = (row_idx + 1) * width
 
-    for row_idx, row in enumerate(grid):
-        if "S" in row:
-            start_col = row.index("S")
+        start_col = row.find(START)
+        if start_col != -1:
             # Mark the cell below as a beam
-            if within_grid(row_idx + 1, start_col, rows, cols):
-                grid[row_idx + 1][start_col] = "|"
-
-        for col_idx, cell in enumerate(row):
-            if cell == "|":
-                below_row = row_idx + 1
-                below_col = col_idx
-
-                if within_grid(below_row, below_col, rows, cols):
-                    below_cell = grid[below_row][below_col]
-
-                    if below_cell == "^":
-                        total_splits += 1
-                        # Spread beams to left
-                        if within_grid(below_row, below_col - 1, rows, cols) and grid[below_row][below_col - 1] != "^":
-                            grid[below_row][below_col - 1] = "|"
-                        # Spread beams to right
-                        if within_grid(below_row, below_col + 1, rows, cols) and grid[below_row][below_col + 1] != "^":
-                            grid[below_row][below_col + 1] = "|"
-                    else:
-                        # Continue downward
-                        grid[below_row][below_col] = "|"
+            cells[below + start_col] = BEAM
+
+        col_idx = row.find(BEAM)
+        while col_idx != -1:
+            below_idx = below + col_idx
+
+            if cells[below_idx] == SPLITTER:
+                total_splits += 1
+                # Spread beams to left
+                if col_idx > 0 and cells[below_idx - 1] != SPLITTER:
+                    cells[below_idx - 1] = BEAM
+                # Spread beams to right
+                if col_idx < width - 1 and cells[below_idx + 1] != SPLITTER:
+                    cells[below_idx + 1] = BEAM
+            else:
+                # Continue downward
+                cells[below_idx] = BEAM
+
+            col_idx = row.find(BEAM, col_idx + 1)
 
     return total_splits
 
 
 @profiler
-def part_two(grid: List[str]) -> int:
+def part_two(grid: Grid) -> int:
     # first try was a DFS over all paths. You should use dynamic programming (DP) with memoization.
     """
     First try was using a DFS over all paths. Then realised this was a bad idea as all paths are searched 
@@ -111,14 +100,15 @@ def part_two(grid: List[str]) -> int:
     in the quantum manifold.
 
     Args:
-        grid (List[List[str]]): The input grid representing the quantum manifold.
+        grid (Grid): The input grid representing the quantum manifold.
 
     Returns:
         int: Total number of timelines.
     """
     # The start can always be found in the first row
-    start = (0, grid[0].index("S"))
-    rows, cols = len(grid), len(grid[0])
+    start = (0, grid.row(0).find(START))
+    rows, cols = grid.height, grid.width
+    cells = grid.cells
 
     @lru_cache(None)
     def count_paths(r: int, c: int) -> int:
@@ -139,9 +129,9 @@ def part_two(grid: List[str]) -> int:
         if next_row >= rows:
             return 1
 
-        cell_below = grid[next_row][c]
+        cell_below = cells[next_row * cols + c]
 
-        if cell_below  in ('.', '|'):
+        if cell_below in (EMPTY, BEAM):
             # Continue straight down
             return count_paths(next_row, c)
 
@@ -0,0 +1,6 @@
+"""
+Shared tooling for the Advent of Code solutions
+
+Code in this package is used by the test harness and by the solutions of every year,
+while puzzle specific helpers stay in the `utils.py` of their own year.
+"""
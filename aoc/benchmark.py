@@ -0,0 +1,185 @@
+# pylint: disable=line-too-long
+"""
+Performance baselines for the Advent of Code solutions
+
+Puzzles are run repeatedly, one run at a time so runs don't compete for the CPU, and every run in a fresh worker
+process so caches of one run don't speed up the next. The timings of every part are summarised with median, min and
+standard deviation. A summary can be stored as a baseline file and later runs can be compared against it to separate
+real regressions from noise.
+
+Timings are stored per puzzle under these keys:
+- total, parse, solve: The timings measured by the runner.
+- function#N: The N-th call of a function decorated with `profiler`, e.g. `compute#2` for part two of 2016/day14.
+"""
+
+from collections import defaultdict
+from dataclasses import dataclass
+import json
+import os
+import statistics
+from typing import Dict, List, Optional, Tuple
+from aoc.runner import PuzzleResult, ROOT_DIR, run_parallel
+
+
+DEFAULT_BASELINE: str = os.path.join(ROOT_DIR, "baseline.json")
+
+# year -> day -> part -> statistic -> value
+Baseline = Dict[str, Dict[str, Dict[str, Dict[str, Optional[float]]]]]
+
+
+@dataclass
+class Comparison:
+    """
+    Difference between the baseline and the current timing of one part of a puzzle (in milliseconds).
+    """
+    year: str
+    day: int
+    part: str
+    baseline_median: float
+    current_median: float
+    noise: float
+
+    @property
+    def ratio(self) -> float:
+        """
+        Current median relative to the baseline median.
+        """
+        return self.current_median / self.baseline_median if self.baseline_median else float("inf")
+
+
+def part_timings(result: PuzzleResult) -> Dict[str, Tuple[float, Optional[int]]]:
+    """
+    Splits the result of one run into the wall time (ms) and peak memory (bytes) of every part.
+
+    Args:
+        result (PuzzleResult): The result of a single run.
+
+    Returns:
+        Dict[str, Tuple[float, Optional[int]]]: Wall time and peak memory per part.
+    """
+    timings: Dict[str, Tuple[float, Optional[int]]] = {
+        "total": (result.elapsed_time * 1000, None),
+        "parse": (result.parse_time * 1000, None),
+        "solve": (result.solve_time * 1000, None),
+    }
+    calls: Dict[str, int] = defaultdict(int)
+    for record in result.profiles:
+        calls[record["function"]] += 1
+        timings[f"{record['function']}#{calls[record['function']]}"] = (record["wall_ns"] / 1e6, record["peak_memory"])
+    return timings
+
+
+def summarize(results: List[PuzzleResult]) -> Baseline:
+    """
+    Computes median, min, standard deviation and peak memory of every part over repeated runs.
+    Runs that failed are left out.
+
+    Args:
+        results (List[PuzzleResult]): The results of all runs, in any order.
+
+    Returns:
+        Baseline: The statistics per year, day and part.
+    """
+    samples: Dict[Tuple[str, str, str], List[Tuple[float, Optional[int]]]] = defaultdict(list)
+    for result in results:
+        if result.error:
+            continue
+        for part, timing in part_timings(result).items():
+            samples[(result.year, str(result.day), part)].append(timing)
+
+    summary: Baseline = {}
+    for (year, day, part), timings in sorted(samples.items()):
+        times = [time_ms for time_ms, _ in timings]
+        memory = [peak for _, peak in timings if peak is not None]
+        summary.setdefault(year, {}).setdefault(day, {})[part] = {
+            "runs": len(times),
+            "median": statistics.median(times),
+            "min": min(times),
+            "stdev": statistics.stdev(times) if len(times) > 1 else 0.0,
+            "peak_memory": max(memory) if memory else None
+        }
+    return summary
+
+
+def measure(puzzles: List[Tuple[str, int]], repeats: int = 5, workers: int = 1, timeout: Optional[float] = None) -> Baseline:
+    """
+    Runs every puzzle `repeats` times and summarises the timings.
+
+    Runs are measured one at a time by default: puzzles running side by side compete for cores,
+    memory bandwidth and caches, which inflates the timings and the noise the comparison relies on.
+
+    Args:
+        puzzles (List[Tuple[str, int]]): The (year, day) pairs to measure.
+        repeats (int): Number of runs per puzzle.
+        workers (int): Number of runs at the same time, only raise it for a quick and noisy estimate.
+        timeout (Optional[float]): Maximum number of seconds per run.
+
+    Returns:
+        Baseline: The statistics per year, day and part.
+    """
+    return summarize(run_parallel(puzzles * repeats, workers, timeout))
+
+
+def load_baseline(path: str = DEFAULT_BASELINE) -> Baseline:
+    """
+    Reads a baseline file, returning an empty baseline when it does not exist yet.
+    """
+    if not os.path.isfile(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def save_baseline(summary: Baseline, path: str = DEFAULT_BASELINE) -> None:
+    """
+    Merges the measured puzzles into the baseline file. Puzzles that were not measured keep their old baseline.
+    """
+    baseline = load_baseline(path)
+    for year, days in summary.items():
+        baseline.setdefault(year, {}).update(days)
+
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(baseline, file, indent=2, sort_keys=True)
+        file.write("\n")
+
+
+def compare(baseline: Baseline, current: Baseline) -> List[Comparison]:
+    """
+    Compares the current timings with the baseline for every part present in both.
+
+    The noise of a part is twice the larger of both standard deviations, changes smaller than that
+    can't be told apart from run-to-run variation.
+
+    Args:
+        baseline (Baseline): The stored statistics.
+        current (Baseline): The statistics of the current runs.
+
+    Returns:
+        List[Comparison]: One comparison per part, ordered by year, day and part.
+    """
+    comparisons: List[Comparison] = []
+    for year, days in sorted(current.items()):
+        for day, parts in sorted(days.items(), key=lambda item: int(item[0])):
+            for part, stats in sorted(parts.items()):
+                base = baseline.get(year, {}).get(day, {}).get(part)
+                if base is None:
+                    continue
+                noise = 2 * max(base["stdev"], stats["stdev"])
+                comparisons.append(Comparison(year, int(day), part, base["median"], stats["median"], noise))
+    return comparisons
+
+
+def is_regression(comparison: Comparison, threshold: float) -> bool:
+    """
+    Checks whether a part got slower than the threshold (a fraction, e.g. 0.1 for 10%) beyond the noise.
+    """
+    difference = comparison.current_median - comparison.baseline_median
+    return comparison.ratio > 1 + threshold and difference > comparison.noise
+
+
+def is_improvement(comparison: Comparison, threshold: float) -> bool:
+    """
+    Checks whether a part got faster than the threshold (a fraction, e.g. 0.1 for 10%) beyond the noise.
+    """
+    difference = comparison.baseline_median - comparison.current_median
+    return comparison.ratio < 1 - threshold and difference > comparison.noise
@@ -0,0 +1,207 @@
+# pylint: disable=line-too-long
+"""
+Shared grid toolkit for the grid puzzles
+
+A `Grid` stores its cells row-major in a flat `bytearray`, one byte per cell. Cells are addressed by
+a single integer index (`y * width + x`), so hot loops work on plain ints instead of hashing (x, y) tuples.
+Character grids keep the byte value of every character (compare with e.g. `ord("#")`), digit grids
+parsed with `digits=True` keep the digit values themselves.
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+# Offsets as (dx, dy), ordered clockwise starting north
+OFFSETS_4: Tuple[Tuple[int, int], ...] = ((0, -1), (1, 0), (0, 1), (-1, 0))
+OFFSETS_8: Tuple[Tuple[int, int], ...] = ((0, -1), (1, -1), (1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1))
+
+
+class Grid:
+    """
+    A rectangular grid backed by a flat bytearray.
+
+    The neighbor tables are computed once per grid (and connectivity) and map every cell index
+    to the indices of its in-bounds neighbors, in the order of `OFFSETS_4` or `OFFSETS_8`.
+    """
+    def __init__(self, width: int, height: int, cells: Optional[bytearray] = None, fill: int = 0):
+        """
+        Initializes a grid of the given size, either from existing cells or filled with a single value.
+
+        Args:
+            width (int): Number of columns.
+            height (int): Number of rows.
+            cells (Optional[bytearray]): Row-major cell values, must hold width * height bytes.
+            fill (int): Value of every cell when no cells are given.
+        """
+        self.width = width
+        self.height = height
+        self.size = width * height
+        self.cells = bytearray(cells) if cells is not None else bytearray([fill]) * self.size
+        if len(self.cells) != self.size:
+            raise ValueError(f"Expected {self.size} cells, got {len(self.cells)}")
+        self._neighbor_tables: Dict[bool, List[Tuple[int, ...]]] = {}
+
+    @classmethod
+    def from_lines(cls, lines: Iterable[str], digits: bool = False) -> "Grid":
+        """
+        Builds a grid from lines of text, ignoring trailing whitespace and empty lines.
+
+        Args:
+            lines (Iterable[str]): The rows of the grid.
+            digits (bool): Store the value of every digit instead of its character.
+
+        Returns:
+            Grid: The parsed grid.
+        """
+        rows = [line.rstrip() for line in lines]
+        rows = [row for row in rows if row]
+        cells = bytearray("".join(rows), "ascii")
+        if digits:
+            cells = cells.translate(_DIGIT_TABLE)
+        return cls(len(rows[0]), len(rows), cells)
+
+    @classmethod
+    def from_file(cls, file_path: str, digits: bool = False) -> "Grid":
+        """
+        Reads a grid from a text file, one row per line.
+
+        Args:
+            file_path (str): Path to the input file.
+            digits (bool): Store the value of every digit instead of its character.
+
+        Returns:
+            Grid: The parsed grid.
+        """
+        with open(file_path, "r", encoding="utf-8") as file:
+            return cls.from_lines(file, digits)
+
+    def copy(self) -> "Grid":
+        """
+        Returns a grid with a copy of the cells, sharing the (immutable) neighbor tables.
+        """
+        new_grid = Grid(self.width, self.height, self.cells)
+        new_grid._neighbor_tables = self._neighbor_tables # pylint: disable=protected-access
+        return new_grid
+
+    def index(self, x: int, y: int) -> int:
+        """
+        Converts a coordinate into a cell index.
+        """
+        return y * self.width + x
+
+    def position(self, index: int) -> Tuple[int, int]:
+        """
+        Converts a cell index into an (x, y) coordinate.
+        """
+        y, x = divmod(index, self.width)
+        return x, y
+
+    def in_bounds(self, x: int, y: int) -> bool:
+        """
+        Checks whether a coordinate is within the grid boundaries.
+        """
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def get(self, x: int, y: int, default: Optional[int] = None) -> Optional[int]:
+        """
+        Returns the value at (x, y), or `default` when the coordinate is outside the grid.
+        """
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self.cells[y * self.width + x]
+        return default
+
+    def set(self, x: int, y: int, value: int) -> None:
+        """
+        Sets the value at (x, y).
+        """
+        self.cells[y * self.width + x] = value
+
+    def row(self, y: int) -> bytearray:
+        """
+        Returns a copy of row y.
+        """
+        return self.cells[y * self.width:(y + 1) * self.width]
+
+    def set_row(self, y: int, values: bytes) -> None:
+        """
+        Overwrites row y with the given values.
+        """
+        self.cells[y * self.width:(y + 1) * self.width] = values
+
+    def column(self, x: int) -> bytearray:
+        """
+        Returns a copy of column x.
+        """
+        return self.cells[x::self.width]
+
+    def set_column(self, x: int, values: bytes) -> None:
+        """
+        Overwrites column x with the given values.
+        """
+        self.cells[x::self.width] = values
+
+    def find(self, value: int) -> int:
+        """
+        Returns the index of the first cell holding value, or -1 if there is none.
+        """
+        return self.cells.find(value)
+
+    def find_all(self, value: int) -> List[int]:
+        """
+        Returns the indices of all cells holding value, in reading order.
+        """
+        indices = []
+        index = self.cells.find(value)
+        while index != -1:
+            indices.append(index)
+            index = self.cells.find(value, index + 1)
+        return indices
+
+    def count(self, value: int) -> int:
+        """
+        Counts the cells holding value.
+        """
+        return self.cells.count(value)
+
+    def neighbor_table(self, diagonal: bool = False) -> List[Tuple[int, ...]]:
+        """
+        Returns for every cell index the indices of its in-bounds neighbors.
+
+        Args:
+            diagonal (bool): Use 8-connectivity instead of 4-connectivity.
+
+        Returns:
+            List[Tuple[int, ...]]: The neighbor indices per cell.
+        """
+        if diagonal not in self._neighbor_tables:
+            self._neighbor_tables[diagonal] = _build_neighbor_table(self.width, self.height, OFFSETS_8 if diagonal else OFFSETS_4)
+        return self._neighbor_tables[diagonal]
+
+    def neighbors(self, index: int, diagonal: bool = False) -> Tuple[int, ...]:
+        """
+        Returns the indices of the in-bounds neighbors of a cell.
+        """
+        return self.neighbor_table(diagonal)[index]
+
+    def __str__(self) -> str:
+        return "\n".join(self.row(y).decode("ascii") for y in range(self.height))
+
+
+def _build_neighbor_table(width: int, height: int, offsets: Tuple[Tuple[int, int], ...]) -> List[Tuple[int, ...]]:
+    """
+    Builds the neighbor indices of every cell. The cells between the first and last column of a row
+    share the same index deltas, so their tuples are created by zipping shifted ranges.
+    """
+    table: List[Tuple[int, ...]] = []
+    for y in range(height):
+        base = y * width
+        row_offsets = [(dx, dy * width + dx) for dx, dy in offsets if 0 <= y + dy < height]
+
+        table.append(tuple(base + delta for dx, delta in row_offsets if 0 <= dx < width))
+        if width > 1:
+            table.extend(zip(*(range(base + 1 + delta, base + width - 1 + delta) for _, delta in row_offsets)))
+            table.append(tuple(base + width - 1 + delta for dx, delta in row_offsets if dx <= 0))
+    return table
+
+
+_DIGIT_TABLE: bytes = bytes(value - 48 if 48 <= value <= 57 else value for value in range(256))
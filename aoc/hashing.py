@@ -0,0 +1,261 @@
+# pylint: disable=line-too-long
+"""
+MD5 mining engine for the hash-search puzzles
+
+Puzzles like "find the lowest number whose MD5 starts with five zeroes" hash millions of candidates
+that all share the same prefix. This module speeds them up in three ways:
+
+- The fixed prefix is fed into an `md5` object once, every candidate continues from a `.copy()` of it.
+- Leading zero nibbles are checked on the raw `digest()` bytes with a single bytes comparison, only matches are
+  converted to hexadecimal.
+- Candidate ranges are split into chunks that a process pool hashes in parallel. Results are merged back in
+  index order, with a bounded number of chunks in flight, so infinite searches stop as soon as the caller does.
+
+`digest_stream` produces the (optionally key-stretched) digest of every index in order, and can persist
+what it computed in a store file, so a re-run with the same salt only reads them back.
+
+Processes that can't have children (the daemonic workers of the test harness) hash their chunks in-process.
+"""
+
+from collections import deque
+import hashlib
+import multiprocessing
+import os
+from typing import Any, Callable, Iterator, List, Optional, Tuple
+
+DEFAULT_CHUNK_SIZE: int = 50_000
+
+
+def md5_prefix(prefix: str) -> "hashlib._Hash":
+    """
+    Returns an md5 object that already consumed the prefix, to be `.copy()`-ed for every candidate.
+
+    Args:
+        prefix (str): The shared start of every hashed string.
+
+    Returns:
+        hashlib._Hash: The pre-fed md5 object.
+    """
+    return hashlib.md5(prefix.encode())
+
+
+def zero_threshold(zeros: int) -> bytes:
+    """
+    Returns the smallest digest prefix without the required leading zero nibbles.
+    A digest starts with `zeros` zero nibbles exactly when it compares less than this value.
+
+    Args:
+        zeros (int): Number of leading zeros in the hexadecimal digest, at least 1.
+
+    Returns:
+        bytes: The threshold to compare digests against.
+    """
+    if zeros % 2:
+        return bytes(zeros // 2) + b"\x10"
+    return bytes(zeros // 2 - 1) + b"\x01"
+
+
+def hex_digests(prefix: str, start: int, stop: int) -> List[str]:
+    """
+    Computes the hexadecimal MD5 of `prefix + str(index)` for every index in [start, stop).
+
+    Args:
+        prefix (str): The shared prefix.
+        start (int): First index.
+        stop (int): Index after the last one.
+
+    Returns:
+        List[str]: The hexadecimal digests, in index order.
+    """
+    copy = md5_prefix(prefix).copy
+    digests = []
+    for index in range(start, stop):
+        md5 = copy()
+        md5.update(b"%d" % index)
+        digests.append(md5.hexdigest())
+    return digests
+
+
+def _mine_chunk(prefix: str, threshold: bytes, start: int, stop: int) -> List[Tuple[int, str]]:
+    """
+    Hashes every index of one chunk and returns the (index, hexadecimal digest) of the matches.
+    """
+    copy = md5_prefix(prefix).copy
+    matches = []
+    for index in range(start, stop):
+        md5 = copy()
+        md5.update(b"%d" % index)
+        if md5.digest() < threshold:
+            matches.append((index, md5.hexdigest()))
+    return matches
+
+
+def _can_fork() -> bool:
+    """
+    Checks whether the current process may start a pool, daemonic processes can't have children.
+    """
+    return not multiprocessing.current_process().daemon
+
+
+def ordered_chunks(func: Callable[..., Any], args: Tuple, start: int = 0, stop: Optional[int] = None,
+                   chunk_size: int = DEFAULT_CHUNK_SIZE, workers: Optional[int] = None) -> Iterator[Any]:
+    """
+    Calls `func(*args, chunk_start, chunk_stop)` for consecutive chunks of an index range and yields the results in order.
+
+    With more than one worker the chunks run on a process pool that stays a few chunks ahead of the consumer.
+    The pool is shut down when the generator is exhausted or closed.
+
+    Args:
+        func (Callable[..., Any]): A module level (picklable) function handling one chunk.
+        args (Tuple): The leading arguments of every call.
+        start (int): First index.
+        stop (Optional[int]): Index after the last one, None for an endless range.
+        chunk_size (int): Number of indices per chunk.
+        workers (Optional[int]): Number of processes, defaults to the core count.
+
+    Yields:
+        Any: The result of every chunk, in index order.
+    """
+    def chunk_bounds() -> Iterator[Tuple[int, int]]:
+        chunk_start = start
+        while stop is None or chunk_start < stop:
+            chunk_stop = chunk_start + chunk_size if stop is None else min(chunk_start + chunk_size, stop)
+            yield chunk_start, chunk_stop
+            chunk_start = chunk_stop
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or not _can_fork():
+        for chunk_start, chunk_stop in chunk_bounds():
+            yield func(*args, chunk_start, chunk_stop)
+        return
+
+    bounds = chunk_bounds()
+    with multiprocessing.Pool(workers) as pool:
+        pending = deque()
+        for chunk_start, chunk_stop in bounds:
+            pending.append(pool.apply_async(func, (*args, chunk_start, chunk_stop)))
+            if len(pending) == 2 * workers:
+                break
+
+        while pending:
+            result = pending.popleft().get()
+            # Refill before yielding, so the workers keep going while the consumer handles this chunk
+            next_bounds = next(bounds, None)
+            if next_bounds is not None:
+                pending.append(pool.apply_async(func, (*args, *next_bounds)))
+            yield result
+
+
+def mine(prefix: str, zeros: int, start: int = 0, stop: Optional[int] = None,
+         chunk_size: int = DEFAULT_CHUNK_SIZE, workers: Optional[int] = None) -> Iterator[Tuple[int, str]]:
+    """
+    Yields every index whose MD5 of `prefix + str(index)` starts with `zeros` zeros in hexadecimal, in increasing order.
+
+    Args:
+        prefix (str): The shared prefix, e.g. the secret key or door ID.
+        zeros (int): Number of leading zeros in the hexadecimal digest.
+        start (int): First index to try.
+        stop (Optional[int]): Index to stop before, None to search endlessly.
+        chunk_size (int): Number of indices per chunk handed to a worker.
+        workers (Optional[int]): Number of processes, defaults to the core count.
+
+    Yields:
+        Tuple[int, str]: The index and hexadecimal digest of every match.
+    """
+    for matches in ordered_chunks(_mine_chunk, (prefix, zero_threshold(zeros)), start, stop, chunk_size, workers):
+        yield from matches
+
+
+def _stretched_chunk(salt: str, rounds: int, start: int, stop: int) -> bytes:
+    """
+    Computes the raw stretched digest of every index of one chunk: the MD5 of `salt + str(index)`,
+    re-hashed `rounds` more times as hexadecimal text.
+    """
+    md5 = hashlib.md5
+    copy = md5_prefix(salt).copy
+    digests = bytearray()
+    for index in range(start, stop):
+        first = copy()
+        first.update(b"%d" % index)
+        digest = first.hexdigest()
+        for _ in range(rounds):
+            digest = md5(digest.encode()).hexdigest()
+        digests += bytes.fromhex(digest)
+    return bytes(digests)
+
+
+def store_path(store_dir: str, salt: str, rounds: int) -> str:
+    """
+    Returns the file that persists the digests of a salt and number of stretching rounds.
+
+    Args:
+        store_dir (str): Directory of the store files.
+        salt (str): The hashed prefix.
+        rounds (int): Number of extra stretching rounds.
+
+    Returns:
+        str: Path of the store file.
+    """
+    key = hashlib.sha256(f"{salt}:{rounds}".encode()).hexdigest()[:16]
+    return os.path.join(store_dir, f"md5-{key}.bin")
+
+
+def _load_digests(path: str) -> bytes:
+    """
+    Reads the raw 16-byte digests of a store file, ignoring a truncated last digest.
+    """
+    try:
+        with open(path, "rb") as file:
+            data = file.read()
+    except OSError:
+        return b""
+    return data[:len(data) - len(data) % 16]
+
+
+def _save_digests(path: str, digests: bytes) -> None:
+    """
+    Replaces a store file atomically, unless another run already stored more digests.
+    The temporary file is created with `open`, so the store gets the usual permissions of the umask.
+    """
+    if len(_load_digests(path)) >= len(digests):
+        return
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "wb") as file:
+        file.write(digests)
+    os.replace(temp_path, path)
+
+
+def digest_stream(salt: str, rounds: int = 0, store_dir: Optional[str] = None,
+                  chunk_size: int = 500, workers: Optional[int] = None) -> Iterator[str]:
+    """
+    Yields the hexadecimal MD5 of `salt + str(index)` for index 0, 1, 2, ..., stretched by `rounds` extra rounds.
+
+    Digests are computed in chunks on a process pool ahead of the consumer. With a store directory,
+    the digests of earlier runs are read back first and everything computed is written back when the
+    stream is closed, so repeated runs with the same salt skip the hashing.
+
+    Args:
+        salt (str): The hashed prefix.
+        rounds (int): Number of extra MD5 rounds over the hexadecimal digest (key stretching).
+        store_dir (Optional[str]): Directory to persist the digests in, None to not persist them.
+        chunk_size (int): Number of indices per chunk handed to a worker.
+        workers (Optional[int]): Number of processes, defaults to the core count.
+
+    Yields:
+        str: The hexadecimal digest of every index, in order.
+    """
+    path = store_path(store_dir, salt, rounds) if store_dir else None
+    stored = _load_digests(path) if path else b""
+    computed = bytearray()
+    try:
+        for offset in range(0, len(stored), 16):
+            yield stored[offset:offset + 16].hex()
+
+        for chunk in ordered_chunks(_stretched_chunk, (salt, rounds), len(stored) // 16, None, chunk_size, workers):
+            computed += chunk
+            for offset in range(0, len(chunk), 16):
+                yield chunk[offset:offset + 16].hex()
+    finally:
+        if path and computed:
+            _save_digests(path, stored + computed)
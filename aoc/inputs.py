@@ -0,0 +1,202 @@
+# pylint: disable=line-too-long
+"""
+Input loading service for the Advent of Code solutions
+
+Raw puzzle inputs are read through a memory map, and the parsed result of a `get_input` function can be cached
+on disk with the `cached_input` decorator. A snapshot is a pickle stored next to the input in `inputs/.cache/`,
+and is only used when it matches:
+
+- The SHA-256 hash of the raw input file.
+- The parser version passed to the decorator, bump it when the output format of the parser changes.
+- The code of the parser itself (bytecode, names and constants like regex strings), so editing a parser
+  invalidates its snapshots as well. Helper functions and tables the parser calls are not part of it.
+
+Repeated (benchmark) runs then skip parsing and only pay for unpickling. Set AOC_INPUT_CACHE=0 to always parse.
+"""
+
+from functools import wraps
+import hashlib
+import mmap
+import os
+import pickle
+from types import CodeType
+from typing import Any, Callable, List, Optional, TypeVar
+
+CACHE_ENV: str = "AOC_INPUT_CACHE"
+CACHE_DIR: str = ".cache"
+
+Parsed = TypeVar("Parsed")
+
+
+def read_bytes(file_path: str) -> bytes:
+    """
+    Reads a whole file through a memory map.
+
+    Args:
+        file_path (str): Path to the input file.
+
+    Returns:
+        bytes: The raw file contents.
+    """
+    with open(file_path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return b"" # Empty files can't be mapped
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return mapped[:]
+
+
+def read_text(file_path: str) -> str:
+    """
+    Reads a whole file as text through a memory map.
+
+    Args:
+        file_path (str): Path to the input file.
+
+    Returns:
+        str: The decoded file contents.
+    """
+    return read_bytes(file_path).decode("utf-8")
+
+
+def read_lines(file_path: str) -> List[str]:
+    """
+    Reads a file as a list of lines with leading/trailing whitespace removed.
+
+    Args:
+        file_path (str): Path to the input file.
+
+    Returns:
+        List[str]: The stripped lines, without a trailing empty line.
+    """
+    return [line.strip() for line in read_text(file_path).splitlines()]
+
+
+def file_hash(file_path: str) -> str:
+    """
+    Computes the SHA-256 hash of a file through a memory map.
+
+    Args:
+        file_path (str): Path to the file.
+
+    Returns:
+        str: The hexadecimal digest.
+    """
+    with open(file_path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return hashlib.sha256().hexdigest()
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return hashlib.sha256(mapped).hexdigest()
+
+
+def snapshot_path(file_path: str, parser: Callable) -> str:
+    """
+    Returns where the parsed snapshot of an input file is stored for a parser,
+    e.g. `inputs/.cache/06_input.day06.get_input.pickle`.
+
+    Args:
+        file_path (str): Path to the input file.
+        parser (Callable): The parsing function.
+
+    Returns:
+        str: Path of the snapshot file.
+    """
+    directory, name = os.path.split(os.path.abspath(file_path))
+    # The source file name is stable, unlike the module name which depends on how the solution was started
+    source = os.path.splitext(os.path.basename(parser.__code__.co_filename))[0]
+    return os.path.join(directory, CACHE_DIR, f"{os.path.splitext(name)[0]}.{source}.{parser.__qualname__}.pickle")
+
+
+def _hash_code(code: CodeType, digest: "hashlib._Hash") -> None:
+    """
+    Feeds a code object into a hash: its bytecode, the names it uses and its constants,
+    walking into nested code objects (comprehensions, lambdas and inner functions).
+    """
+    digest.update(code.co_code)
+    digest.update(repr(code.co_names).encode())
+    for constant in code.co_consts:
+        if isinstance(constant, CodeType):
+            _hash_code(constant, digest)
+        else:
+            digest.update(repr(constant).encode())
+
+
+def _parser_fingerprint(parser: Callable, version: int) -> str:
+    """
+    Identifies a parser by its explicit version, its code including every constant, and its default arguments.
+    """
+    digest = hashlib.sha256()
+    _hash_code(parser.__code__, digest)
+    digest.update(repr(parser.__defaults__).encode())
+    return f"{version}:{digest.hexdigest()}"
+
+
+def _load_snapshot(path: str, input_hash: str, fingerprint: str) -> Optional[Any]:
+    """
+    Loads a snapshot if it exists and matches both the input and the parser, returns None otherwise.
+    """
+    try:
+        with open(path, "rb") as file:
+            snapshot = pickle.load(file)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError, IndexError):
+        # Missing, truncated, or referring to a class that no longer exists
+        return None
+
+    if not isinstance(snapshot, dict) or snapshot.get("hash") != input_hash or snapshot.get("parser") != fingerprint:
+        return None
+    return snapshot
+
+
+def _save_snapshot(path: str, input_hash: str, fingerprint: str, data: Any) -> None:
+    """
+    Writes a snapshot atomically, so parallel runs never read a partially written file.
+    Data that can't be pickled is silently not cached.
+    """
+    try:
+        payload = pickle.dumps({"hash": input_hash, "parser": fingerprint, "data": data}, protocol=pickle.HIGHEST_PROTOCOL)
+    except (pickle.PicklingError, TypeError, AttributeError):
+        return
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "wb") as file:
+        file.write(payload)
+    os.replace(temp_path, path)
+
+
+def cached_input(version: int = 1) -> Callable[[Callable[..., Parsed]], Callable[..., Parsed]]:
+    """
+    A decorator that caches the parsed result of a `get_input(file_path, ...)` function on disk.
+
+    Every call returns a freshly unpickled object, so solutions that modify their input don't affect later runs.
+    Parsers that take arguments besides the file path are not cached.
+
+    Snapshots are invalidated when the parser's own code changes, including its string and number literals,
+    but not when a helper function or module-level table it calls changes: bump `version` after editing those.
+
+    Args:
+        version (int): Version of the parser output, bump it to invalidate existing snapshots.
+
+    Returns:
+        function: A decorator for the parsing function.
+    """
+    def decorator(parser: Callable[..., Parsed]) -> Callable[..., Parsed]:
+        fingerprint = _parser_fingerprint(parser, version)
+
+        @wraps(parser)
+        def wrapper(file_path: str, *args, **kwargs) -> Parsed:
+            if args or kwargs or os.environ.get(CACHE_ENV) == "0":
+                return parser(file_path, *args, **kwargs)
+
+            input_hash = file_hash(file_path)
+            path = snapshot_path(file_path, parser)
+            snapshot = _load_snapshot(path, input_hash, fingerprint)
+            if snapshot is not None:
+                return snapshot["data"]
+
+            data = parser(file_path)
+            _save_snapshot(path, input_hash, fingerprint, data)
+            return data
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,107 @@
+# pylint: disable=line-too-long
+"""
+Shared profiler for the Advent of Code solutions
+
+The `profiler` decorator measures wall time and CPU time with the nanosecond counters of `time`,
+and optionally the peak allocated memory through `tracemalloc`. Its behaviour is controlled with
+environment variables:
+
+- AOC_PROFILE_SINK: Where to write the measurements. When unset, a human readable line is printed.
+  Set it to `stdout`, `stderr` or a file path to emit one JSON object per call instead (file paths are appended to).
+- AOC_PROFILE_MEMORY: Set to `1` to also record the peak allocated memory, which slows down the decorated function.
+
+The test harness uses `collect_profiles` to gather the measurements of every decorated call in-process.
+"""
+
+from contextlib import contextmanager
+from functools import wraps
+import json
+import os
+import sys
+import time
+import tracemalloc
+from typing import Any, Dict, Iterator, List, Optional
+
+
+SINK_ENV: str = "AOC_PROFILE_SINK"
+MEMORY_ENV: str = "AOC_PROFILE_MEMORY"
+
+_collectors: List[List[Dict[str, Any]]] = []
+
+
+@contextmanager
+def collect_profiles() -> Iterator[List[Dict[str, Any]]]:
+    """
+    Collects the records of all decorated calls made inside the `with` block.
+
+    Yields:
+        List[Dict[str, Any]]: The list that receives one record per call.
+    """
+    records: List[Dict[str, Any]] = []
+    _collectors.append(records)
+    try:
+        yield records
+    finally:
+        _collectors.remove(records)
+
+
+def _emit(record: Dict[str, Any]) -> None:
+    """
+    Passes a record to the active collectors and writes it to the configured sink.
+    """
+    for records in _collectors:
+        records.append(record)
+
+    sink = os.environ.get(SINK_ENV, "")
+    if not sink:
+        print(f"Execution time of '{record['function']}': {record['wall_ns'] / 1e9:.4f} seconds")
+    elif sink in ("stdout", "stderr"):
+        print(json.dumps(record), file=getattr(sys, sink), flush=True)
+    else:
+        with open(sink, "a", encoding="utf-8") as file:
+            file.write(json.dumps(record) + "\n")
+
+
+def profiler(func):
+    """
+    A decorator to measure and log the execution time of a function.
+
+    This decorator wraps the provided function and records its wall time and CPU time
+    in nanoseconds, and its peak allocated memory in bytes when memory tracing is enabled.
+    The record is printed to the console or emitted as a JSON line, see the module documentation.
+
+    Args:
+        func (function): The function whose execution time needs to be measured.
+
+    Returns:
+        function: A wrapped version of the input function, which logs the execution time.
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        # Only the outermost traced call measures memory, nested calls would reset its peak
+        trace_memory = os.environ.get(MEMORY_ENV) == "1" and not tracemalloc.is_tracing()
+        if trace_memory:
+            tracemalloc.start()
+
+        start_cpu = time.process_time_ns()
+        start_time = time.perf_counter_ns() # Record the start time of the function call
+        try:
+            result = func(*args, **kwargs) # Execute the original function
+        finally:
+            wall_ns = time.perf_counter_ns() - start_time
+            cpu_ns = time.process_time_ns() - start_cpu
+            peak_memory: Optional[int] = None
+            if trace_memory:
+                peak_memory = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+
+        _emit({
+            "module": func.__module__,
+            "function": func.__name__,
+            "wall_ns": wall_ns,
+            "cpu_ns": cpu_ns,
+            "peak_memory": peak_memory
+        })
+        return result
+
+    return wrapper
@@ -0,0 +1,395 @@
+# pylint: disable=line-too-long
+"""
+Register machine toolkit for the assembly-style puzzles
+
+Puzzles like assembunny (2016 day 12), the handheld boot code (2020 day 8) or the chronospatial computer
+(2024 day 17) all run a small instruction set over a handful of registers. Instead of interpreting the
+instruction text on every step, each puzzle compiles its parsed instructions once into a `Program`:
+
+- Instructions become tuples of ints `(op, a, b, c)` from one shared set of operations (`Op`).
+- Operands are pre-resolved to slots of a flat register file. Immediate values get a slot of their own
+  holding the constant, so every operand is a plain list index and no instruction checks operand kinds.
+- Jump targets are resolved to code indices. One source instruction may compile to several operations,
+  `Program.starts` maps source instructions to their first operation.
+
+`execute` runs compiled code in a single dispatch loop, optionally counting the executions per instruction
+and stopping before an instruction would run a second time (loop detection). `repair_search`
+finds the single patched operation that makes a looping program without conditional jumps terminate.
+"""
+
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+Instruction = Tuple[int, int, int, int]
+
+
+class Op(IntEnum):
+    """
+    The operations of compiled code. Register operands are slots of the register file, r[slot],
+    jump targets are code indices.
+    """
+    NOP = 0     # nothing
+    SET = 1     # r[a] = r[b]
+    ADD = 2     # r[a] = r[b] + r[c]
+    MUL = 3     # r[a] = r[b] * r[c]
+    MOD = 4     # r[a] = r[b] % r[c]
+    AND = 5     # r[a] = r[b] & r[c]
+    OR = 6      # r[a] = r[b] | r[c]
+    XOR = 7     # r[a] = r[b] ^ r[c]
+    SHR = 8     # r[a] = r[b] >> r[c]
+    MAX = 9     # r[a] = max(r[b], r[c])
+    GT = 10     # r[a] = 1 if r[b] > r[c] else 0
+    GE = 11     # r[a] = 1 if r[b] >= r[c] else 0
+    LT = 12     # r[a] = 1 if r[b] < r[c] else 0
+    LE = 13     # r[a] = 1 if r[b] <= r[c] else 0
+    EQ = 14     # r[a] = 1 if r[b] == r[c] else 0
+    NE = 15     # r[a] = 1 if r[b] != r[c] else 0
+    JMP = 16    # jump to a
+    JNZ = 17    # jump to a if r[b] != 0
+    JZ = 18     # jump to a if r[b] == 0
+    JNZ_REL = 19 # if r[b] != 0, jump to source instruction a + r[c] (an offset only known at run time)
+    OUT = 20    # output r[a]
+
+
+# Plain int copies of the operations for the dispatch loop
+NOP, SET, ADD, MUL, MOD, AND, OR, XOR, SHR, MAX, GT, GE, LT, LE, EQ, NE, JMP, JNZ, JZ, JNZ_REL, OUT = range(len(Op))
+
+
+@dataclass
+class Execution:
+    """
+    Outcome of running compiled code.
+
+    Attributes:
+        registers (List[int]): The register file after the run.
+        outputs (List[int]): The values of every OUT operation, in order.
+        pc (int): The code index the run stopped at, outside the code when the program terminated.
+        looped (bool): The run stopped because an instruction was about to run a second time.
+        counts (Optional[List[int]]): Executions per code index, when counting.
+    """
+    registers: List[int]
+    outputs: List[int] = field(default_factory=list)
+    pc: int = 0
+    looped: bool = False
+    counts: Optional[List[int]] = None
+
+
+def execute(code: Sequence[Instruction], registers: List[int], starts: Sequence[int] = (),
+            count: bool = False, detect_loop: bool = False, pc: int = 0) -> Execution:
+    """
+    Runs compiled code on a register file until the program counter leaves the code.
+
+    Args:
+        code (Sequence[Instruction]): The compiled operations.
+        registers (List[int]): The register file, updated in place.
+        starts (Sequence[int]): Code index of every source instruction, only needed for JNZ_REL.
+        count (bool): Count the executions of every operation.
+        detect_loop (bool): Stop before an operation runs a second time.
+        pc (int): Code index to start at.
+
+    Returns:
+        Execution: The registers, outputs and where the run stopped.
+    """
+    r = registers
+    size = len(code)
+    outputs = []
+    counts = [0] * size if count or detect_loop else None
+    looped = False
+
+    while 0 <= pc < size:
+        if counts is not None:
+            if detect_loop and counts[pc]:
+                looped = True
+                break
+            counts[pc] += 1
+
+        op, a, b, c = code[pc]
+        pc += 1
+        if op == ADD:
+            r[a] = r[b] + r[c]
+        elif op == JNZ:
+            if r[b] != 0:
+                pc = a
+        elif op == SET:
+            r[a] = r[b]
+        elif op == JMP:
+            pc = a
+        elif op == JZ:
+            if r[b] == 0:
+                pc = a
+        elif op == XOR:
+            r[a] = r[b] ^ r[c]
+        elif op == SHR:
+            r[a] = r[b] >> r[c]
+        elif op == AND:
+            r[a] = r[b] & r[c]
+        elif op == MUL:
+            r[a] = r[b] * r[c]
+        elif op == OUT:
+            outputs.append(r[a])
+        elif op == MOD:
+            r[a] = r[b] % r[c]
+        elif op == OR:
+            r[a] = r[b] | r[c]
+        elif op == MAX:
+            r[a] = max(r[b], r[c])
+        elif op == GT:
+            r[a] = 1 if r[b] > r[c] else 0
+        elif op == GE:
+            r[a] = 1 if r[b] >= r[c] else 0
+        elif op == LT:
+            r[a] = 1 if r[b] < r[c] else 0
+        elif op == LE:
+            r[a] = 1 if r[b] <= r[c] else 0
+        elif op == EQ:
+            r[a] = 1 if r[b] == r[c] else 0
+        elif op == NE:
+            r[a] = 1 if r[b] != r[c] else 0
+        elif op == JNZ_REL:
+            if r[b] != 0:
+                target = a + r[c]
+                pc = starts[target] if 0 <= target < len(starts) else (size if target > 0 else -1)
+        elif op != NOP:
+            raise ValueError(f"Unknown operation: {op}")
+
+    return Execution(registers, outputs, pc, looped, counts)
+
+
+class Program:
+    """
+    A compiled register machine program.
+
+    The register file holds the named registers, scratch registers and constants, in the order they were added.
+    Compile source instructions by calling `begin` before the operations of every source instruction,
+    emitting them with `emit` and `jump` (whose targets are source instruction indices), and `finish` at the end.
+    """
+    def __init__(self, registers: Iterable[str] = ()):
+        """
+        Args:
+            registers (Iterable[str]): The names of the registers, in register file order.
+        """
+        self.names: List[str] = []
+        self.slots: Dict[Union[str, Tuple[str, int]], int] = {} # slot per register name, and per ("const", value)
+        self.initial: List[int] = [] # register file before a run
+        self.code: List[Instruction] = []
+        self.starts: List[int] = []
+        self._jumps: List[Tuple[int, int]] = [] # code index and source target of every jump to patch
+        for name in registers:
+            self.register(name)
+
+    def register(self, name: str) -> int:
+        """
+        Returns the slot of a named register, adding it when it is new.
+        """
+        slot = self.slots.get(name)
+        if slot is None:
+            slot = self.slots[name] = len(self.initial)
+            self.names.append(name)
+            self.initial.append(0)
+        return slot
+
+    def constant(self, value: int) -> int:
+        """
+        Returns the slot holding a constant value.
+        """
+        slot = self.slots.get(("const", value))
+        if slot is None:
+            slot = self.slots[("const", value)] = len(self.initial)
+            self.initial.append(value)
+        return slot
+
+    def scratch(self) -> int:
+        """
+        Returns a new unnamed register for intermediate values.
+        """
+        self.initial.append(0)
+        return len(self.initial) - 1
+
+    def operand(self, token: Union[str, int]) -> int:
+        """
+        Returns the slot of an operand: an int or numeric string is a constant, anything else a named register.
+        """
+        if isinstance(token, int):
+            return self.constant(token)
+        if token.lstrip("-").isdigit():
+            return self.constant(int(token))
+        return self.register(token)
+
+    def begin(self) -> None:
+        """
+        Marks the start of the operations of the next source instruction.
+        """
+        self.starts.append(len(self.code))
+
+    def emit(self, op: Op, a: int = 0, b: int = 0, c: int = 0) -> None:
+        """
+        Appends an operation, see `Op` for the meaning of the operands.
+        """
+        self.code.append((int(op), a, b, c))
+
+    def jump(self, op: Op, target: int, condition: int = 0) -> None:
+        """
+        Appends a jump to a source instruction, resolved to its code index by `finish`.
+
+        Args:
+            op (Op): JMP, JNZ or JZ.
+            target (int): Index of the source instruction to jump to.
+            condition (int): Slot of the register tested by JNZ and JZ.
+        """
+        self._jumps.append((len(self.code), target))
+        self.code.append((int(op), target, condition, 0))
+
+    def finish(self) -> 'Program':
+        """
+        Resolves the jump targets. Targets before the first instruction or after the last one stop the program.
+
+        Returns:
+            Program: The program itself.
+        """
+        for index, target in self._jumps:
+            op, _, b, c = self.code[index]
+            self.code[index] = (op, self.code_index(target), b, c)
+        self._jumps = []
+        return self
+
+    def code_index(self, source: int) -> int:
+        """
+        Returns the code index of a source instruction, indices outside the program map outside the code.
+        """
+        if source < 0:
+            return -1
+        if source >= len(self.starts):
+            return len(self.code) + source - len(self.starts)
+        return self.starts[source]
+
+    def run(self, values: Optional[Dict[str, int]] = None, count: bool = False, detect_loop: bool = False) -> Execution:
+        """
+        Runs the program on a fresh register file.
+
+        Args:
+            values (Optional[Dict[str, int]]): Initial values of named registers, the others start at 0.
+            count (bool): Count the executions of every operation.
+            detect_loop (bool): Stop before an operation runs a second time.
+
+        Returns:
+            Execution: The outcome of the run.
+        """
+        registers = self.initial.copy()
+        for name, value in (values or {}).items():
+            registers[self.slots[name]] = value
+        return execute(self.code, registers, self.starts, count, detect_loop)
+
+    def named(self, registers: List[int]) -> Dict[str, int]:
+        """
+        Returns the values of the named registers in a register file.
+        """
+        return {name: registers[self.slots[name]] for name in self.names}
+
+    def source_counts(self, counts: List[int]) -> List[int]:
+        """
+        Converts execution counts per code index into counts per source instruction.
+        """
+        return [counts[start] if start < len(counts) else 0 for start in self.starts]
+
+
+@dataclass
+class Repair:
+    """
+    A single-instruction patch that makes a looping program terminate.
+
+    Attributes:
+        index (int): Code index of the patched operation.
+        instruction (Instruction): The operation it was replaced with.
+        execution (Execution): The run of the patched program.
+    """
+    index: int
+    instruction: Instruction
+    execution: Execution
+
+
+def static_successor(instruction: Instruction, index: int) -> int:
+    """
+    Returns the code index that runs after an operation, for operations whose successor doesn't depend on the registers.
+
+    Raises:
+        ValueError: For conditional jumps.
+    """
+    op, target, _, _ = instruction
+    if op == JMP:
+        return target
+    if op in (JNZ, JZ, JNZ_REL):
+        raise ValueError(f"Operation {Op(op).name} at {index} has no static successor")
+    return index + 1
+
+
+def terminating(code: Sequence[Instruction]) -> List[bool]:
+    """
+    Finds the operations from which the code runs off its end, by walking the control flow backwards from the exits.
+
+    Args:
+        code (Sequence[Instruction]): Compiled code without conditional jumps.
+
+    Returns:
+        List[bool]: Per code index whether a run starting there terminates.
+    """
+    size = len(code)
+    predecessors: List[List[int]] = [[] for _ in range(size)]
+    stack = []
+    for index, instruction in enumerate(code):
+        successor = static_successor(instruction, index)
+        if 0 <= successor < size:
+            predecessors[successor].append(index)
+        else:
+            stack.append(index)
+
+    result = [False] * size
+    for index in stack:
+        result[index] = True
+    while stack:
+        for predecessor in predecessors[stack.pop()]:
+            if not result[predecessor]:
+                result[predecessor] = True
+                stack.append(predecessor)
+    return result
+
+
+def repair_search(program: Program, patches: Dict[int, Instruction], values: Optional[Dict[str, int]] = None) -> Optional[Repair]:
+    """
+    Finds the patch that makes a looping program terminate, in time linear in the size of the code.
+
+    Only the operations on the path of the original run can matter, and a patched operation leads to termination
+    exactly when its new successor is an operation that terminates in the original code (the path back to the
+    patched operation would otherwise have terminated already). So the terminating operations are computed once,
+    and the original path is walked once to find the first patch that jumps into them.
+
+    Args:
+        program (Program): A finished program without conditional jumps.
+        patches (Dict[int, Instruction]): The allowed replacement per code index.
+        values (Optional[Dict[str, int]]): Initial values of named registers, the others start at 0.
+
+    Returns:
+        Optional[Repair]: The first patch on the original path that works, with the run of the patched program.
+            None if no patch works, or the program already terminates.
+    """
+    code = program.code
+    size = len(code)
+    exits = terminating(code)
+    if not size or exits[0]:
+        return None
+    visited = bytearray(size)
+    pc = 0
+    while 0 <= pc < size and not visited[pc]:
+        visited[pc] = 1
+        patch = patches.get(pc)
+        if patch is not None:
+            successor = static_successor(patch, pc)
+            if not 0 <= successor < size or exits[successor]:
+                patched = list(code)
+                patched[pc] = patch
+                registers = program.initial.copy()
+                for name, value in (values or {}).items():
+                    registers[program.slots[name]] = value
+                return Repair(pc, patch, execute(patched, registers, program.starts))
+        pc = static_successor(code[pc], pc)
+    return None
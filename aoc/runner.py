@@ -0,0 +1,311 @@
+# pylint: disable=line-too-long
+"""
+In-process runner for Advent of Code solutions
+
+Every solution module has a standard entry point `if __name__ == "__main__"` that reads the input file
+and prints the answers in the form `Part X: XXXXX`. Instead of spawning a fresh interpreter per puzzle,
+this module imports each `dayNN.py` once and builds a small adapter from its entry point:
+
+- The statements up to the first one that reads from `inputs/` form the parse step.
+- The remaining statements form the solve step, whose printed answers are captured.
+
+Paths to `inputs/` are rewritten to absolute paths, so no solution depends on the current working directory.
+This also allows `run_parallel` to spread puzzles of several years over a pool of worker processes.
+"""
+
+import ast
+import contextlib
+import importlib.util
+import io
+import multiprocessing
+from multiprocessing.connection import Connection, wait
+import os
+import re
+import sys
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from types import CodeType, ModuleType
+from typing import Any, Dict, List, Optional, Tuple
+from aoc.profiling import collect_profiles
+
+
+ROOT_DIR: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_UTILS_MODULES: Dict[str, ModuleType] = {}
+_ADAPTERS: Dict[Tuple[str, int], "SolutionAdapter"] = {}
+
+
+@dataclass
+class PuzzleResult:
+    """
+    Outcome of running a single puzzle, with parse and solve time measured separately (in seconds).
+    The records of every call decorated with `profiler` are kept in `profiles`.
+    """
+    year: str
+    day: int
+    answers: List[str] = field(default_factory=list)
+    parse_time: float = 0.0
+    solve_time: float = 0.0
+    error: Optional[str] = None
+    profiles: List[Dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def elapsed_time(self) -> float:
+        """
+        Total time spent on the puzzle, in seconds.
+        """
+        return self.parse_time + self.solve_time
+
+
+class _InputPathRewriter(ast.NodeTransformer):
+    """
+    Rewrites string constants starting with `inputs/` into absolute paths inside the year directory.
+    """
+    def __init__(self, year_dir: str):
+        self.year_dir = year_dir
+        self.found = False
+
+    def visit_Constant(self, node: ast.Constant) -> ast.Constant: # pylint: disable=invalid-name
+        """
+        Replaces relative input paths and remembers that the input file was referenced.
+        """
+        if isinstance(node.value, str) and node.value.startswith("inputs/"):
+            self.found = True
+            return ast.copy_location(ast.Constant(os.path.join(self.year_dir, node.value)), node)
+        return node
+
+
+def _find_main_block(tree: ast.Module) -> List[ast.stmt]:
+    """
+    Returns the body of the `if __name__ == "__main__":` block of a module, or an empty list.
+    """
+    for node in tree.body:
+        if isinstance(node, ast.If) and isinstance(node.test, ast.Compare):
+            left = node.test.left
+            if isinstance(left, ast.Name) and left.id == "__name__":
+                return node.body
+    return []
+
+
+def _split_main_block(source: str, year_dir: str) -> Tuple[List[ast.stmt], List[ast.stmt]]:
+    """
+    Splits the entry point of a solution into its parse and solve statements.
+
+    The parse step runs up to and including the first statement that references the input file,
+    unless that statement already prints an answer (e.g. `print(f"Part 1: {part_one('inputs/..')}")`),
+    in which case the whole entry point counts as solve time.
+
+    Args:
+        source (str): Source code of the solution module.
+        year_dir (str): Absolute path of the directory holding the solution.
+
+    Returns:
+        Tuple[List[ast.stmt], List[ast.stmt]]: The parse and the solve statements.
+    """
+    body = _find_main_block(ast.parse(source))
+
+    for idx, stmt in enumerate(body):
+        rewriter = _InputPathRewriter(year_dir)
+        body[idx] = rewriter.visit(stmt)
+        if rewriter.found:
+            prints = any(isinstance(node, ast.Name) and node.id == "print" for node in ast.walk(stmt))
+            split = idx if prints else idx + 1
+            # Rewrite the input paths of the remaining statements as well
+            for rest in range(idx + 1, len(body)):
+                body[rest] = _InputPathRewriter(year_dir).visit(body[rest])
+            return body[:split], body[split:]
+
+    return [], body
+
+
+def load_year_utils(year: str) -> ModuleType:
+    """
+    Imports the `utils.py` of a year once and installs it as the `utils` module,
+    so that `from utils import ...` inside solutions resolves to the right year.
+
+    Args:
+        year (str): The year, e.g. "2019".
+
+    Returns:
+        ModuleType: The utils module of that year.
+    """
+    if year not in _UTILS_MODULES:
+        path = os.path.join(ROOT_DIR, year, "utils.py")
+        spec = importlib.util.spec_from_file_location(f"aoc{year}_utils", path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[spec.name] = module
+        spec.loader.exec_module(module)
+        _UTILS_MODULES[year] = module
+
+    sys.modules["utils"] = _UTILS_MODULES[year]
+    return _UTILS_MODULES[year]
+
+
+class SolutionAdapter:
+    """
+    Imports one `dayNN.py` module and runs its entry point in-process.
+    """
+    def __init__(self, year: str, day: int):
+        """
+        Imports the solution module and compiles the parse and solve steps of its entry point.
+
+        Args:
+            year (str): The year of the puzzle, e.g. "2015".
+            day (int): The day of the puzzle.
+        """
+        self.year = year
+        self.day = day
+        self.year_dir = os.path.join(ROOT_DIR, year)
+        self.path = os.path.join(self.year_dir, f"day{day:02}.py")
+
+        with open(self.path, "r", encoding="utf-8") as file:
+            source = file.read()
+
+        parse_body, solve_body = _split_main_block(source, self.year_dir)
+        self.parse_code: CodeType = compile(ast.fix_missing_locations(ast.Module(body=parse_body, type_ignores=[])), self.path, "exec")
+        self.solve_code: CodeType = compile(ast.fix_missing_locations(ast.Module(body=solve_body, type_ignores=[])), self.path, "exec")
+        self.module = self._import()
+
+    def _import(self) -> ModuleType:
+        """
+        Imports the solution under a name that is unique across years.
+        """
+        load_year_utils(self.year)
+        spec = importlib.util.spec_from_file_location(f"aoc{self.year}_day{self.day:02}", self.path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[spec.name] = module
+        with contextlib.redirect_stdout(io.StringIO()):
+            spec.loader.exec_module(module)
+        return module
+
+    def run(self) -> PuzzleResult:
+        """
+        Executes the parse and solve steps and collects the printed answers.
+
+        Returns:
+            PuzzleResult: The answers and timings of this puzzle.
+        """
+        result = PuzzleResult(self.year, self.day)
+        load_year_utils(self.year)
+        namespace = vars(self.module)
+        stdout = io.StringIO()
+
+        with contextlib.redirect_stdout(stdout), collect_profiles() as profiles:
+            start_time = time.perf_counter()
+            try:
+                exec(self.parse_code, namespace) # pylint: disable=exec-used
+                parsed_time = time.perf_counter()
+                result.parse_time = parsed_time - start_time
+                exec(self.solve_code, namespace) # pylint: disable=exec-used
+                result.solve_time = time.perf_counter() - parsed_time
+            except Exception as exc: # pylint: disable=broad-exception-caught
+                result.error = f"{type(exc).__name__}: {exc}"
+                result.solve_time = time.perf_counter() - start_time - result.parse_time
+
+        result.profiles = profiles
+        # Answers are always in the form: Part X: XXXXX
+        result.answers = [line.split(":")[1].strip() for line in re.findall(r'Part .:.+\n', stdout.getvalue())]
+        return result
+
+
+def has_solution(year: str, day: int) -> bool:
+    """
+    Checks whether a solution file exists for the given puzzle.
+    """
+    return os.path.isfile(os.path.join(ROOT_DIR, year, f"day{day:02}.py"))
+
+
+def get_adapter(year: str, day: int) -> SolutionAdapter:
+    """
+    Returns the adapter of a puzzle, importing its module on first use only.
+
+    Args:
+        year (str): The year of the puzzle.
+        day (int): The day of the puzzle.
+
+    Returns:
+        SolutionAdapter: The cached adapter.
+    """
+    key = (year, day)
+    if key not in _ADAPTERS:
+        _ADAPTERS[key] = SolutionAdapter(year, day)
+    return _ADAPTERS[key]
+
+
+def run_puzzle(year: str, day: int) -> PuzzleResult:
+    """
+    Runs a single puzzle in-process. Import errors are reported in the result instead of raised.
+
+    Args:
+        year (str): The year of the puzzle.
+        day (int): The day of the puzzle.
+
+    Returns:
+        PuzzleResult: The answers and timings of this puzzle.
+    """
+    try:
+        adapter = get_adapter(year, day)
+    except Exception as exc: # pylint: disable=broad-exception-caught
+        return PuzzleResult(year, day, error=f"{type(exc).__name__}: {exc}")
+    return adapter.run()
+
+
+def _puzzle_worker(year: str, day: int, conn: Connection) -> None:
+    """
+    Entry point of a worker process: runs one puzzle and sends the result back to the parent.
+    """
+    conn.send(run_puzzle(year, day))
+    conn.close()
+
+
+def run_parallel(puzzles: List[Tuple[str, int]], workers: Optional[int] = None, timeout: Optional[float] = None) -> List[PuzzleResult]:
+    """
+    Runs puzzles in a pool of worker processes, one process per puzzle.
+
+    A dedicated process per puzzle allows a puzzle that exceeds the timeout to be killed
+    without stalling the rest of the batch. Results are returned in order of completion.
+
+    Args:
+        puzzles (List[Tuple[str, int]]): The (year, day) pairs to run.
+        workers (Optional[int]): Number of puzzles running at the same time, defaults to the core count.
+        timeout (Optional[float]): Maximum number of seconds per puzzle, or None for no limit.
+
+    Returns:
+        List[PuzzleResult]: The result of every puzzle.
+    """
+    workers = workers or os.cpu_count() or 1
+    pending = deque(puzzles)
+    running: Dict[Connection, Tuple[str, int, multiprocessing.Process, float]] = {}
+    results: List[PuzzleResult] = []
+
+    while pending or running:
+        # Keep every worker slot busy
+        while pending and len(running) < workers:
+            year, day = pending.popleft()
+            recv_conn, send_conn = multiprocessing.Pipe(duplex=False)
+            process = multiprocessing.Process(target=_puzzle_worker, args=(year, day, send_conn), daemon=True)
+            process.start()
+            send_conn.close()
+            running[recv_conn] = (year, day, process, time.perf_counter())
+
+        for conn in wait(list(running), timeout=0.05):
+            year, day, process, start_time = running.pop(conn)
+            try:
+                results.append(conn.recv())
+            except EOFError:
+                results.append(PuzzleResult(year, day, solve_time=time.perf_counter() - start_time, error=f"Worker exited with code {process.exitcode}"))
+            conn.close()
+            process.join()
+
+        if timeout is not None:
+            now = time.perf_counter()
+            for conn, (year, day, process, start_time) in list(running.items()):
+                if now - start_time > timeout:
+                    process.kill()
+                    process.join()
+                    conn.close()
+                    del running[conn]
+                    results.append(PuzzleResult(year, day, solve_time=now - start_time, error=f"Timed out after {timeout:g} s"))
+
+    return results
@@ -0,0 +1,299 @@
+# pylint: disable=line-too-long
+"""
+Generic graph search engine
+
+Breadth-first search, Dijkstra and A* over any state type. Searches are fastest when states are
+packed into plain ints (e.g. `index * 4 + direction` on a `Grid`), which hash trivially. States that
+need more context (like a running Intcode computer) can pass a `key` function that maps a state to
+the hashable value used in the visited map.
+
+- `bfs` expands the search level by level and can stop at a maximum depth.
+- `bidirectional_bfs` searches from both ends of a graph with reversible moves and meets in the middle.
+- `dijkstra` uses a binary heap, or a bucket queue for small integer weights (Dial's algorithm),
+  and turns into A* when a heuristic is given. Grids can pass their neighbor table and cells
+  directly, as neighbors and node weights.
+- Both can record all predecessors on shortest paths, `shortest_path_states` collects every state
+  that lies on at least one optimal path to a goal.
+"""
+
+from dataclasses import dataclass, field
+from heapq import heappop, heappush
+from itertools import count
+from typing import Callable, Dict, Generic, Hashable, Iterable, List, Optional, Sequence, Set, Tuple, TypeVar
+
+State = TypeVar("State")
+
+
+@dataclass
+class SearchResult(Generic[State]):
+    """
+    Outcome of a search.
+
+    Attributes:
+        cost (Optional[int]): Cost (or depth) of the cheapest goal, None when no goal was reached.
+        goals (List[State]): The goal states reached at that cost. All of them when `all_paths` was set, otherwise the first.
+        goal_keys (List[Hashable]): The keys of the goal states.
+        distances (Dict[Hashable, int]): Best known cost per state key.
+        predecessors (Optional[Dict[Hashable, List[Hashable]]]): Per state key, the keys of all predecessors on a
+            shortest path, only recorded when `all_paths` was set.
+    """
+    cost: Optional[int] = None
+    goals: List[State] = field(default_factory=list)
+    goal_keys: List[Hashable] = field(default_factory=list)
+    distances: Dict[Hashable, int] = field(default_factory=dict)
+    predecessors: Optional[Dict[Hashable, List[Hashable]]] = None
+
+    @property
+    def goal(self) -> Optional[State]:
+        """
+        The first goal state reached, or None.
+        """
+        return self.goals[0] if self.goals else None
+
+
+def bfs(starts: Iterable[State],
+        neighbors: Callable[[State], Iterable[State]],
+        is_goal: Optional[Callable[[State], bool]] = None,
+        key: Optional[Callable[[State], Hashable]] = None,
+        max_depth: Optional[int] = None,
+        all_paths: bool = False) -> SearchResult[State]:
+    """
+    Breadth-first search from one or more start states, one level at a time.
+
+    The search stops at the first level containing a goal (returning every goal on that level),
+    after `max_depth` levels, or when all reachable states are visited.
+
+    Args:
+        starts (Iterable[State]): The start states, all at depth 0.
+        neighbors (Callable[[State], Iterable[State]]): Returns the states reachable in one step.
+        is_goal (Optional[Callable[[State], bool]]): Returns whether a state is a goal, None to explore everything.
+        key (Optional[Callable[[State], Hashable]]): Maps a state to its key in the visited map, defaults to the state itself.
+        max_depth (Optional[int]): Maximum depth to explore.
+        all_paths (bool): Record all predecessors on shortest paths.
+
+    Returns:
+        SearchResult[State]: The goals, their depth and the depth of every visited state.
+    """
+    result: SearchResult[State] = SearchResult(predecessors={} if all_paths else None)
+    distances = result.distances
+    predecessors = result.predecessors
+
+    frontier = []
+    for state in starts:
+        state_key = key(state) if key else state
+        if state_key not in distances:
+            distances[state_key] = 0
+            frontier.append(state)
+            if predecessors is not None:
+                predecessors[state_key] = []
+
+    depth = 0
+    while frontier:
+        if is_goal is not None:
+            for state in frontier:
+                if is_goal(state):
+                    result.goals.append(state)
+                    result.goal_keys.append(key(state) if key else state)
+            if result.goals:
+                result.cost = depth
+                return result
+
+        if max_depth is not None and depth >= max_depth:
+            break
+
+        depth += 1
+        next_frontier = []
+        for state in frontier:
+            state_key = key(state) if key and predecessors is not None else state
+            for next_state in neighbors(state):
+                next_key = key(next_state) if key else next_state
+                if next_key not in distances:
+                    distances[next_key] = depth
+                    next_frontier.append(next_state)
+                    if predecessors is not None:
+                        predecessors[next_key] = [state_key]
+                elif predecessors is not None and distances[next_key] == depth:
+                    predecessors[next_key].append(state_key)
+        frontier = next_frontier
+
+    return result
+
+
+def bidirectional_bfs(start: Hashable, goal: Hashable,
+                      neighbors: Callable[[Hashable], Iterable[Hashable]],
+                      predecessors: Optional[Callable[[Hashable], Iterable[Hashable]]] = None) -> Optional[int]:
+    """
+    Breadth-first search from the start and the goal at the same time, always growing the smaller frontier by
+    a full level. This visits far fewer states than a one-sided search when the branching factor is large.
+
+    The goal side follows the moves backwards, through `predecessors`. Without it every move must be reversible.
+
+    Args:
+        start (Hashable): The start state.
+        goal (Hashable): The goal state.
+        neighbors (Callable[[Hashable], Iterable[Hashable]]): Returns the states reachable in one step.
+        predecessors (Optional[Callable[[Hashable], Iterable[Hashable]]]): Returns the states one step before a state,
+            defaults to `neighbors`.
+
+    Returns:
+        Optional[int]: The length of the shortest path, or None when the goal can't be reached.
+    """
+    if start == goal:
+        return 0
+
+    depths: Tuple[Dict[Hashable, int], Dict[Hashable, int]] = ({start: 0}, {goal: 0})
+    frontiers: List[List[Hashable]] = [[start], [goal]]
+    expand = (neighbors, predecessors or neighbors)
+
+    while frontiers[0] and frontiers[1]:
+        side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        seen, other = depths[side], depths[1 - side]
+        best: Optional[int] = None
+        next_frontier = []
+
+        for state in frontiers[side]:
+            depth = seen[state] + 1
+            for next_state in expand[side](state):
+                if next_state in other:
+                    # Finish the level, a later state on it may meet the other side closer to its start
+                    if best is None or depth + other[next_state] < best:
+                        best = depth + other[next_state]
+                if next_state not in seen:
+                    seen[next_state] = depth
+                    next_frontier.append(next_state)
+
+        if best is not None:
+            return best
+        frontiers[side] = next_frontier
+
+    return None
+
+
+def dijkstra(starts: Iterable[State],
+             neighbors: Callable[[State], Iterable],
+             is_goal: Optional[Callable[[State], bool]] = None,
+             weights: Optional[Sequence[int]] = None,
+             key: Optional[Callable[[State], Hashable]] = None,
+             heuristic: Optional[Callable[[State], int]] = None,
+             bucket_queue: bool = False,
+             all_paths: bool = False) -> SearchResult[State]:
+    """
+    Dijkstra's algorithm from one or more start states, or A* when a heuristic is given.
+
+    Edge weights come either from the neighbors themselves, as (state, weight) pairs, or from the
+    `weights` lookup, where entering a state costs `weights[state]` (e.g. the cells of a `Grid`
+    with the neighbor table as neighbors).
+
+    The bucket queue keeps one list per integer priority and only ever moves forward (Dial's algorithm),
+    which beats a heap when weights are small integers.
+
+    Args:
+        starts (Iterable[State]): The start states, all at cost 0.
+        neighbors (Callable[[State], Iterable]): Returns the (state, weight) pairs reachable in one step,
+            or only the states when `weights` is given.
+        is_goal (Optional[Callable[[State], bool]]): Returns whether a state is a goal, None to explore everything.
+        weights (Optional[Sequence[int]]): Cost of entering a state, indexed by state.
+        key (Optional[Callable[[State], Hashable]]): Maps a state to its key in the visited map, defaults to the state itself.
+        heuristic (Optional[Callable[[State], int]]): Admissible and consistent estimate of the remaining cost (A*).
+        bucket_queue (bool): Use a bucket queue instead of a heap, only for small non-negative integer weights.
+        all_paths (bool): Record all predecessors on shortest paths and return all goals at the lowest cost.
+
+    Returns:
+        SearchResult[State]: The goals, their cost and the best known cost of every visited state.
+    """
+    result: SearchResult[State] = SearchResult(predecessors={} if all_paths else None)
+    distances = result.distances
+    predecessors = result.predecessors
+    get_distance = distances.get
+
+    buckets: List[List[Tuple[int, State]]] = [[]]
+    heap: List[Tuple[int, int, int, State]] = []
+    counter = count() # Breaks ties on the heap, so states never need to be comparable
+
+    for state in starts:
+        state_key = key(state) if key else state
+        if state_key not in distances:
+            distances[state_key] = 0
+            priority = heuristic(state) if heuristic else 0
+            if bucket_queue:
+                buckets.extend([] for _ in range(priority + 1 - len(buckets)))
+                buckets[priority].append((0, state))
+            else:
+                heappush(heap, (priority, next(counter), 0, state))
+            if predecessors is not None:
+                predecessors[state_key] = []
+
+    cursor = 0
+    while True:
+        if bucket_queue:
+            while cursor < len(buckets) and not buckets[cursor]:
+                cursor += 1
+            if cursor == len(buckets):
+                break
+            priority = cursor
+            cost, state = buckets[cursor].pop()
+        else:
+            if not heap:
+                break
+            priority, _, cost, state = heappop(heap)
+
+        state_key = key(state) if key else state
+        if cost > distances[state_key]:
+            continue # Stale entry, the state was reached cheaper later on
+        if result.cost is not None and priority > result.cost:
+            break
+
+        if is_goal is not None and is_goal(state):
+            result.cost = cost
+            result.goals.append(state)
+            result.goal_keys.append(state_key)
+            if not all_paths:
+                break
+            continue
+
+        for item in neighbors(state):
+            if weights is None:
+                next_state, weight = item
+            else:
+                next_state, weight = item, weights[item]
+            next_key = key(next_state) if key else next_state
+            next_cost = cost + weight
+            known_cost = get_distance(next_key)
+            if known_cost is None or next_cost < known_cost:
+                distances[next_key] = next_cost
+                priority = next_cost + heuristic(next_state) if heuristic else next_cost
+                if bucket_queue:
+                    if priority >= len(buckets):
+                        buckets.extend([] for _ in range(priority + 1 - len(buckets)))
+                    buckets[priority].append((next_cost, next_state))
+                else:
+                    heappush(heap, (priority, next(counter), next_cost, next_state))
+                if predecessors is not None:
+                    predecessors[next_key] = [state_key]
+            elif predecessors is not None and next_cost == known_cost:
+                predecessors[next_key].append(state_key)
+
+    return result
+
+
+def shortest_path_states(result: SearchResult) -> Set[Hashable]:
+    """
+    Collects the keys of all states that lie on at least one shortest path to one of the goals.
+
+    Args:
+        result (SearchResult): A result of `bfs` or `dijkstra` searched with `all_paths=True`.
+
+    Returns:
+        Set[Hashable]: The state keys, including the starts and goals.
+    """
+    if result.predecessors is None:
+        raise ValueError("The search did not record predecessors, use all_paths=True")
+
+    on_path = set(result.goal_keys)
+    stack = list(on_path)
+    while stack:
+        for previous in result.predecessors.get(stack.pop(), ()):
+            if previous not in on_path:
+                on_path.add(previous)
+                stack.append(previous)
+    return on_path
@@ -0,0 +1,66 @@
+# pylint: disable=line-too-long
+"""
+Optimal tours over a weight matrix (Held-Karp)
+
+Puzzles like the shortest route through every location (2015 day 9) or the happiest seating around a table
+(2015 day 13) ask for the best order to visit n nodes. Trying every permutation takes n! steps, the bitmask
+dynamic program of Held and Karp takes n^2 * 2^n:
+
+- `best[subset][j]` is the best weight of a path that visits exactly the nodes in the bitmask `subset` and ends in j.
+- Subsets are processed in layers of equal size, so only two layers are kept in memory at a time.
+- A layer is built in one comprehension, and for a subset and end node the best predecessor is a single `min`
+  over the previous row plus the column of weights into j, mapped in C instead of looping in Python.
+
+`optimal_tour` finds open paths (any start and end) or closed cycles, minimising or maximising the weight.
+Maximising runs the same minimisation on negated weights.
+"""
+
+from itertools import combinations
+from operator import add
+from typing import Dict, List, Sequence
+
+# Weight of a path that doesn't exist, larger than any real path so `min` never picks it
+UNREACHED = 1 << 62
+
+
+def optimal_tour(weights: Sequence[Sequence[int]], cycle: bool = False, maximize: bool = False) -> int:
+    """
+    Finds the best weight of a path that visits every node exactly once.
+
+    Args:
+        weights (Sequence[Sequence[int]]): weights[i][j] is the weight of going from node i to node j.
+        cycle (bool): Return to the first node at the end. Since every rotation of a cycle is the same, the cycle
+            starts at node 0, open paths start anywhere.
+        maximize (bool): Find the largest weight instead of the smallest.
+
+    Returns:
+        int: The weight of the best path, 0 for fewer than two nodes.
+    """
+    n = len(weights)
+    if n < 2:
+        return 0
+    sign = -1 if maximize else 1
+    if cycle:
+        # Every rotation is the same cycle, so it starts and ends in node 0 and the paths cover the other nodes
+        nodes = list(range(1, n))
+        first = [sign * weights[0][j] for j in nodes]
+        last = [sign * weights[j][0] for j in nodes]
+    else:
+        nodes = list(range(n))
+        first = last = [0] * n
+    size = len(nodes)
+    bits = [1 << k for k in range(size)]
+    # columns[j][i] is the weight into j from i, a node never follows itself
+    columns = [[sign * weights[i][j] if i != j else UNREACHED for i in nodes] for j in nodes]
+
+    layer: Dict[int, List[int]] = {
+        bit: [first[k] if k == j else UNREACHED for k in range(size)] for j, bit in enumerate(bits)
+    }
+    for count in range(2, size + 1):
+        layer = {
+            subset: [min(map(add, layer[subset ^ bit], column)) if subset & bit else UNREACHED for bit, column in zip(bits, columns)]
+            for subset in (sum(map(bits.__getitem__, members)) for members in combinations(range(size), count))
+        }
+
+    (row,) = layer.values()
+    return sign * min(map(add, row, last))
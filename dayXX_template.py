@@ -10,12 +10,16 @@ Answer:
 """
 
 from typing import List
+from utils import cached_input
 from utils import profiler
+from utils import read_lines
 
 
+@cached_input(version=1)
 def get_input(file_path: str) -> List[str]:
     """
     Reads the input file and returns a list of stripped lines.
+    The parsed result is cached on disk, bump the version when the returned structure changes.
 
     Args:
         file_path (str): Path to the input text file.
@@ -23,11 +27,7 @@ def get_input(file_path: str) -> List[str]:
     Returns:
         list[str]: A list of lines with leading/trailing whitespace removed.
     """
-    with open(file_path, "r", encoding="utf-8") as file:
-        for line in file:
-            line = line.strip()
-
-    return file
+    return read_lines(file_path)
 
 
 @profiler
@@ -3,51 +3,69 @@
 Test Suite for Advent of Code Solutions
 
 This script runs tests for the Advent of Code solutions, comparing their outputs against the expected results.
-Since each solution module has a standard entry point `if __name__ == "__main__"`, we can't simply run the modules directly or call the functions 
-due to their need for variable arguments. Instead, this script uses `subprocess.run()` to execute each module and capture its output, 
-which is then compared to the expected output for each problem.
+Since each solution module has a standard entry point `if __name__ == "__main__"`, we can't simply call the functions
+due to their need for variable arguments. Instead, the in-process runner in `aoc.runner` imports every module once,
+executes its entry point without spawning a new interpreter and captures its output, which is then compared to
+the expected output for each problem. Parse time and solve time are reported separately.
 """
 
+import argparse
 import os
-import fnmatch
-import re
-import subprocess
 import time
-from typing import Dict, List
+from typing import Dict, List, Tuple
+from aoc import benchmark
+from aoc.runner import ROOT_DIR, PuzzleResult, has_solution, run_parallel, run_puzzle
 
 
-def find_file(pattern: str, path: str) -> str:
-	"""
-	Searches for a file in the given directory that matches the provided pattern.
+def check_result(result: PuzzleResult, expect_answers: List[str]) -> Tuple[bool, str]:
+    """
+    Compares the answers of a puzzle with the expected answers.
 
-	This function walks through the specified directory recursively and returns 
-	the first file whose name matches the given pattern.
+    Returns:
+        Tuple[bool, str]: Whether the puzzle passed, and the failure marker to print behind it.
+    """
+    if not result.error and result.answers[:2] == expect_answers:
+        return True, ""
+    if result.error:
+        return False, f"    *** FAIL *** ({result.error})"
+    return False, "    *** FAIL ***"
 
-	Args:
-		pattern (str): The pattern to match the filenames.
-		path (str): The directory path to search for files.
 
-	Returns:
-		str: The filename that matches the pattern, or an empty string if no match is found.
-	"""
-	for _, _, files in os.walk(path):
-		for name in files:
-			if fnmatch.fnmatch(name, pattern):
-				return name
-	return ""
+def format_timing(result: PuzzleResult) -> str:
+    """
+    Formats the total, parse and solve time of a puzzle in milliseconds.
+    """
+    return (f"{int(round(result.elapsed_time * 1000)):7} ms "
+            f"(parse {int(round(result.parse_time * 1000)):5} ms, solve {int(round(result.solve_time * 1000)):7} ms)")
 
 
-def run_tests(year: str, answers: Dict[int, List[str]]) -> None:
+def format_profiles(result: PuzzleResult) -> str:
+    """
+    Formats the profiler records of a puzzle, one line per decorated call.
+    """
+    lines = []
+    for record in result.profiles:
+        line = f"    {record['function']:>24}: {record['wall_ns'] / 1e6:10.2f} ms wall, {record['cpu_ns'] / 1e6:10.2f} ms cpu"
+        if record["peak_memory"] is not None:
+            line += f", {record['peak_memory'] / 1024:10.1f} KiB peak"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def run_tests(year: str, answers: Dict[int, List[str]], show_profiles: bool = False) -> None:
     """
     Executes the test suite for all Advent of Code solutions per year and compares the results 
-    to the expected answers. The function uses `subprocess.run()` to run each solution 
-    and compares the output with pre-defined expected answers.
+    to the expected answers. Each solution is run in-process through `aoc.runner.run_puzzle`
+    and its output is compared with the pre-defined expected answers.
 
     The results are displayed in the format:
     - Problem number
-    - Execution time in milliseconds
+    - Execution time in milliseconds, split in parse and solve time
     - Pass/Fail status for each problem
 
+    With `show_profiles`, the wall time, CPU time and peak memory of every call decorated with
+    `profiler` is listed below its problem, so regressions show up per part.
+
     Finally, it displays the total time taken and the number of tests that passed/failed.
     """
     total_time: float = 0.0 # In seconds
@@ -55,41 +73,143 @@ def run_tests(year: str, answers: Dict[int, List[str]]) -> None:
     num_fail: int = 0
 
     print(f"\nTesting problem for year {year}")
-    os.chdir(year)
 
     for prob, expect_answers in sorted(answers.items()):
-        start_time: float = time.time()
+        if not has_solution(year, prob):
+            continue
+
+        result = run_puzzle(year, prob)
+        total_time += result.elapsed_time
+
+        passed, failstr = check_result(result, expect_answers)
+        num_pass += passed
+        num_fail += not passed
+
+        # Print the results for the current problem
+        print(f"\r{' '*70}\r", end="") # Clear the line to print on the same line
+        print(f"Problem {prob:03}: {format_timing(result)}{failstr}")
+        if show_profiles and result.profiles:
+            print(format_profiles(result))
+
+    print(f"Elapsed = {int(total_time)} s, Passed = {num_pass}, Failed = {num_fail}", flush=True)
 
-        # Find file in the current directory that has the following format: dayXX.py
-        module = find_file(f'day{prob:02}.py', os.getcwd())
 
-        # Run the solution file as a subprocess and capture the output
-        output = subprocess.run(
-            f'python3 {module}', check=False, capture_output=True, text=True
-        ).stdout
+def run_tests_parallel(answers_per_year: Dict[str, Dict[int, List[str]]], workers: int = None, timeout: float = None, show_profiles: bool = False) -> None:
+    """
+    Executes the test suite for several years at once, spreading the puzzles over a pool of
+    worker processes. A puzzle that runs longer than `timeout` seconds is killed and marked as failed.
+
+    All results are merged into a single report sorted by elapsed time, followed by the
+    wall time of the whole run and the number of tests that passed/failed.
+    """
+    puzzles = [(year, prob) for year, answers in sorted(answers_per_year.items()) for prob in sorted(answers) if has_solution(year, prob)]
+
+    print(f"\nTesting {len(puzzles)} problems for years {', '.join(sorted(answers_per_year))}")
+    start_time = time.perf_counter()
+    results = run_parallel(puzzles, workers, timeout)
+    wall_time = time.perf_counter() - start_time
+
+    num_pass: int = 0
+    num_fail: int = 0
+    for result in sorted(results, key=lambda r: r.elapsed_time):
+        passed, failstr = check_result(result, answers_per_year[result.year][result.day])
+        num_pass += passed
+        num_fail += not passed
+        print(f"{result.year} Problem {result.day:03}: {format_timing(result)}{failstr}")
+        if show_profiles and result.profiles:
+            print(format_profiles(result))
 
-        # Answers are always in the form: Part X: XXXXX
-        output = re.findall(r'Part .:.+\n', output)
+    total_time = sum(result.elapsed_time for result in results)
+    print(f"Elapsed = {int(wall_time)} s (sum of problems = {int(total_time)} s), Passed = {num_pass}, Failed = {num_fail}", flush=True)
 
-        answer_part_1 = output[0].split(":")[1].strip()
-        answer_part_2 = output[1].split(":")[1].strip()
 
-        elapsed_time: float = time.time() - start_time
-        total_time += elapsed_time
+def run_benchmark(years: List[str], repeats: int, workers: int = 1, timeout: float = None,
+                  compare: bool = False, threshold: float = 0.1, baseline_path: str = benchmark.DEFAULT_BASELINE) -> None:
+    """
+    Runs every puzzle of the given years `repeats` times and either stores the timings as the new
+    baseline or compares them against the stored baseline. The runs are measured one at a time unless
+    `workers` says otherwise, so puzzles don't slow each other down.
 
-        if answer_part_1 == expect_answers[0] and answer_part_2 == expect_answers[1]:
-            failstr: str = ""
-            num_pass += 1
+    When comparing, every part whose median got slower than `threshold` (a fraction) beyond the
+    run-to-run noise is flagged as a regression, and parts that got as much faster are reported too.
+    """
+    puzzles = [(year, prob) for year in sorted(years) for prob in sorted(ANSWERS[year]) if has_solution(year, prob)]
+    print(f"\nMeasuring {len(puzzles)} problems for years {', '.join(sorted(years))}, {repeats} runs each")
+    current = benchmark.measure(puzzles, repeats, workers, timeout)
+
+    if not compare:
+        benchmark.save_baseline(current, baseline_path)
+        print(f"Baseline saved to {baseline_path}")
+        return
+
+    num_slower: int = 0
+    num_faster: int = 0
+    for comparison in benchmark.compare(benchmark.load_baseline(baseline_path), current):
+        if benchmark.is_regression(comparison, threshold):
+            marker = "    *** SLOWER ***"
+            num_slower += 1
+        elif benchmark.is_improvement(comparison, threshold):
+            marker = "    faster"
+            num_faster += 1
         else:
-            failstr = "    *** FAIL ***"
-            num_fail += 1
+            continue
+        print(f"{comparison.year} Problem {comparison.day:03} {comparison.part:>20}: "
+              f"{comparison.baseline_median:10.2f} ms -> {comparison.current_median:10.2f} ms ({comparison.ratio:5.2f}x){marker}")
 
-        # Print the results for the current problem
-        print(f"\r{' '*70}\r", end="") # Clear the line to print on the same line
-        print(f"Problem {prob:03}: {int(round(elapsed_time * 1000)):7} ms{failstr}")
+    print(f"Slower = {num_slower}, Faster = {num_faster} (threshold = {threshold:.0%})", flush=True)
 
-    print(f"Elapsed = {int(total_time)} s, Passed = {num_pass}, Failed = {num_fail}", flush=True)
-    os.chdir("..")
+
+def intcode_days() -> List[int]:
+    """
+    Returns the 2019 days whose solution runs on one of the Intcode engines.
+    """
+    days = []
+    for prob in sorted(ANSWERS_2019):
+        if has_solution("2019", prob):
+            with open(os.path.join(ROOT_DIR, "2019", f"day{prob:02}.py"), "r", encoding="utf-8") as file:
+                if "IntcodeComputer" in file.read():
+                    days.append(prob)
+    return days
+
+
+def run_engine_comparison(workers: int = None, timeout: float = None) -> None:
+    """
+    Runs every 2019 Intcode day once on the reference engine (AOC_INTCODE_ENGINE=reference) and once on the
+    engines the solutions pick by default, and compares the answers of both runs.
+
+    Every puzzle runs in a fresh worker process that imports the 2019 utils with the environment of its run,
+    so the engine is selected per run. A day fails when either run fails or the answers differ.
+    """
+    puzzles = [("2019", prob) for prob in intcode_days()]
+    print(f"\nComparing the Intcode engines on {len(puzzles)} problems of 2019")
+
+    previous = os.environ.pop("AOC_INTCODE_ENGINE", None)
+    try:
+        os.environ["AOC_INTCODE_ENGINE"] = "reference"
+        reference_results = {result.day: result for result in run_parallel(puzzles, workers, timeout)}
+        del os.environ["AOC_INTCODE_ENGINE"]
+        default_results = {result.day: result for result in run_parallel(puzzles, workers, timeout)}
+    finally:
+        os.environ.pop("AOC_INTCODE_ENGINE", None)
+        if previous is not None:
+            os.environ["AOC_INTCODE_ENGINE"] = previous
+
+    num_pass: int = 0
+    num_fail: int = 0
+    for _, prob in puzzles:
+        reference, default = reference_results[prob], default_results[prob]
+        if reference.error or default.error:
+            failstr = f"    *** FAIL *** ({reference.error or default.error})"
+        elif reference.answers != default.answers:
+            failstr = f"    *** DIFFERENT *** (reference {reference.answers}, default {default.answers})"
+        else:
+            failstr = ""
+        num_pass += not failstr
+        num_fail += bool(failstr)
+        print(f"Problem {prob:03}: reference {int(round(reference.elapsed_time * 1000)):7} ms, "
+              f"default {int(round(default.elapsed_time * 1000)):7} ms{failstr}")
+
+    print(f"Same = {num_pass}, Different or failed = {num_fail}", flush=True)
 
 
 ANSWERS_2015: Dict[int, List[str]] = {
@@ -388,15 +508,48 @@ ANSWERS_2025: Dict[int, List[str]] = {
 }
 
 
+ANSWERS: Dict[str, Dict[int, List[str]]] = {
+    "2015": ANSWERS_2015,
+    "2016": ANSWERS_2016,
+    "2017": ANSWERS_2017,
+    "2018": ANSWERS_2018,
+    "2019": ANSWERS_2019,
+    "2020": ANSWERS_2020,
+    "2021": ANSWERS_2021,
+    "2022": ANSWERS_2022,
+    "2023": ANSWERS_2023,
+    "2024": ANSWERS_2024,
+    "2025": ANSWERS_2025
+}
+
+
 if __name__ == "__main__":
-    # run_tests("2015", ANSWERS_2015)
-    # run_tests("2016", ANSWERS_2016)
-    # run_tests("2017", ANSWERS_2017)
-    # run_tests("2018", ANSWERS_2018)
-    # run_tests("2019", ANSWERS_2019)
-    # run_tests("2020", ANSWERS_2020)
-    # run_tests("2021", ANSWERS_2021)
-    # run_tests("2022", ANSWERS_2022)
-    # run_tests("2023", ANSWERS_2023)
-    # run_tests("2024", ANSWERS_2024)
-    run_tests("2025", ANSWERS_2025)
+    parser = argparse.ArgumentParser(description="Run the Advent of Code solutions and compare them to the expected answers.")
+    parser.add_argument("years", nargs="*", default=["2025"], help="Years to test (default: 2025)")
+    parser.add_argument("--all", action="store_true", help="Test every year")
+    parser.add_argument("--parallel", action="store_true", help="Run all puzzles in a process pool and print one merged report")
+    parser.add_argument("--workers", type=int, default=None, help="Number of worker processes (default: core count, 1 when measuring)")
+    parser.add_argument("--timeout", type=float, default=None, help="Maximum number of seconds per puzzle in parallel mode")
+    parser.add_argument("--profile", action="store_true", help="Show the profiler records of every part (set AOC_PROFILE_MEMORY=1 for peak memory)")
+    parser.add_argument("--save-baseline", action="store_true", help="Measure the selected years and store the timings in the baseline file")
+    parser.add_argument("--compare", action="store_true", help="Measure the selected years and compare the timings with the baseline file")
+    parser.add_argument("--repeats", type=int, default=5, help="Number of runs per puzzle when measuring (default: 5)")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Fraction a part may get slower before it is flagged (default: 0.1)")
+    parser.add_argument("--baseline", default=benchmark.DEFAULT_BASELINE, help="Path of the baseline file")
+    parser.add_argument("--compare-engines", action="store_true", help="Run every 2019 Intcode day on the reference and the default engines and compare the answers")
+    parser.add_argument("--verify", action="store_true", help="Enable the self-checks of the solutions (AOC_VERIFY=1), e.g. 2016 day 12 also runs its program without fused loops")
+    args = parser.parse_args()
+
+    if args.verify:
+        os.environ["AOC_VERIFY"] = "1"
+
+    selected_years = sorted(ANSWERS) if args.all else args.years
+    if args.compare_engines:
+        run_engine_comparison(args.workers, args.timeout)
+    elif args.save_baseline or args.compare:
+        run_benchmark(selected_years, args.repeats, args.workers or 1, args.timeout, args.compare, args.threshold, args.baseline)
+    elif args.parallel:
+        run_tests_parallel({year: ANSWERS[year] for year in selected_years}, args.workers, args.timeout, args.profile)
+    else:
+        for selected_year in selected_years:
+            run_tests(selected_year, ANSWERS[selected_year], args.profile)
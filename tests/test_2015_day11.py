@@ -0,0 +1,38 @@
+# pylint: disable=line-too-long
+"""
+Tests for 2015 day 11, the password search wraps around from 'zz...z' to 'aa...a' like incrementing does.
+"""
+
+import os
+import sys
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aoc.runner import get_adapter # pylint: disable=wrong-import-position
+
+day11 = get_adapter("2015", 11).module
+
+
+def test_next_passwords():
+    """
+    The examples of the puzzle.
+    """
+    assert day11.next_valid_password("abcdefgh") == "abcdffaa"
+    assert day11.next_valid_password("ghijklmn") == "ghjaabcc"
+
+
+def test_wraps_around():
+    """
+    After the last password of a length the search continues at 'aa...a'.
+    """
+    assert day11.next_passwords("zzzzzzzz", 2) == ["aaaaabcc", "aaaabbcd"]
+    assert day11.next_passwords("xxyzz", 2) == ["aabcc", "bbcdd"]
+
+
+def test_no_valid_password():
+    """
+    A length without any valid password is an error instead of an endless search.
+    """
+    with pytest.raises(ValueError):
+        day11.next_valid_password("zzz")